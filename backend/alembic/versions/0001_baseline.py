@@ -0,0 +1,103 @@
+"""baseline
+
+Schema as created by create_tables.py before migrations were introduced:
+users, test_attempts and sequence_analyses. Existing databases are stamped
+at this revision instead of running it.
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-18 13:04:56.872229
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('email', sa.String(), nullable=False),
+    sa.Column('username', sa.String(), nullable=False),
+    sa.Column('full_name', sa.String(), nullable=True),
+    sa.Column('hashed_password', sa.String(), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_users_email'), ['email'], unique=True)
+        batch_op.create_index(batch_op.f('ix_users_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_users_username'), ['username'], unique=True)
+
+    op.create_table('test_attempts',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('category', sa.Enum('SCHOOL', 'PROFESSIONAL', 'TECHNICAL', 'COMPANY', 'GENERAL', name='testcategory'), nullable=False),
+    sa.Column('level', sa.Enum('LEVEL_1', 'LEVEL_2', 'LEVEL_3', 'LEVEL_4', 'LEVEL_5', name='testlevel'), nullable=False),
+    sa.Column('test_name', sa.String(), nullable=False),
+    sa.Column('questions', sa.JSON(), nullable=False),
+    sa.Column('answers', sa.JSON(), nullable=False),
+    sa.Column('score', sa.Float(), nullable=True),
+    sa.Column('analysis', sa.Text(), nullable=True),
+    sa.Column('remarks', sa.Text(), nullable=True),
+    sa.Column('feedback', sa.Text(), nullable=True),
+    sa.Column('completed', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('email_sent', sa.Boolean(), nullable=True),
+    sa.Column('email_sent_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('test_attempts', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_test_attempts_id'), ['id'], unique=False)
+
+    op.create_table('sequence_analyses',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('test_id', sa.Integer(), nullable=False),
+    sa.Column('model_name', sa.String(length=50), nullable=False),
+    sa.Column('sequence_number', sa.Integer(), nullable=False),
+    sa.Column('field_1', sa.String(length=200), nullable=True),
+    sa.Column('field_2', sa.String(length=200), nullable=True),
+    sa.Column('field_3', sa.String(length=200), nullable=True),
+    sa.Column('field_4', sa.String(length=200), nullable=True),
+    sa.Column('field_5', sa.String(length=200), nullable=True),
+    sa.Column('field_6', sa.String(length=200), nullable=True),
+    sa.Column('detailed_analysis', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['test_id'], ['test_attempts.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('test_id', 'model_name', 'sequence_number', name='uix_test_model_seq')
+    )
+    with op.batch_alter_table('sequence_analyses', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_sequence_analyses_id'), ['id'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('sequence_analyses', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_sequence_analyses_id'))
+
+    op.drop_table('sequence_analyses')
+    with op.batch_alter_table('test_attempts', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_test_attempts_id'))
+
+    op.drop_table('test_attempts')
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_users_username'))
+        batch_op.drop_index(batch_op.f('ix_users_id'))
+        batch_op.drop_index(batch_op.f('ix_users_email'))
+
+    op.drop_table('users')
+    # PostgreSQL keeps enum types after their tables are dropped
+    for enum_name in ('testcategory', 'testlevel'):
+        sa.Enum(name=enum_name).drop(op.get_bind(), checkfirst=True)
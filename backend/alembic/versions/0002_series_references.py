@@ -0,0 +1,66 @@
+"""series references
+
+Versioned demo series, and the series version a test attempt references
+instead of a copy of its questions. migrate_series_refs.py moves existing
+attempts over once this has run.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 13:04:57.104418
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('series',
+    sa.Column('id', sa.String(length=50), nullable=False),
+    sa.Column('current_version', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+    op.create_table('series_versions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('series_id', sa.String(length=50), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('questions', sa.JSON(), nullable=False),
+    sa.Column('content_hash', sa.String(length=64), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['series_id'], ['series.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('series_id', 'version', name='uq_series_versions_series_version')
+    )
+    with op.batch_alter_table('series_versions', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_series_versions_id'), ['id'], unique=False)
+
+    with op.batch_alter_table('test_attempts', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('series_id', sa.String(length=50), nullable=True))
+        batch_op.add_column(sa.Column('series_version', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key('fk_test_attempts_series_id', 'series', ['series_id'], ['id'])
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('test_attempts', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_test_attempts_series_id', type_='foreignkey')
+        batch_op.drop_column('series_version')
+        batch_op.drop_column('series_id')
+
+    with op.batch_alter_table('series_versions', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_series_versions_id'))
+
+    op.drop_table('series_versions')
+    op.drop_table('series')
@@ -0,0 +1,53 @@
+"""analysis jobs
+
+Persistent background analysis jobs, claimed by the in-process workers or
+by analysis_worker.py.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 13:04:57.311052
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('analysis_jobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('test_id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(length=20), nullable=False),
+    sa.Column('status', sa.Enum('QUEUED', 'RUNNING', 'COMPLETED', 'FAILED', name='jobstatus'), nullable=False),
+    sa.Column('progress', sa.JSON(), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('attempts', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['test_id'], ['test_attempts.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('analysis_jobs', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_analysis_jobs_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_analysis_jobs_status'), ['status'], unique=False)
+        batch_op.create_index(batch_op.f('ix_analysis_jobs_test_id'), ['test_id'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('analysis_jobs', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_analysis_jobs_test_id'))
+        batch_op.drop_index(batch_op.f('ix_analysis_jobs_status'))
+        batch_op.drop_index(batch_op.f('ix_analysis_jobs_id'))
+
+    op.drop_table('analysis_jobs')
+    sa.Enum(name='jobstatus').drop(op.get_bind(), checkfirst=True)
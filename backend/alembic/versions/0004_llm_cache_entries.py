@@ -0,0 +1,41 @@
+"""llm cache entries
+
+Shared LLM response cache (LLM_CACHE_BACKEND=database).
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 13:04:57.508713
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('llm_cache_entries',
+    sa.Column('key', sa.String(length=64), nullable=False),
+    sa.Column('model', sa.String(length=100), nullable=False),
+    sa.Column('value', sa.Text(), nullable=False),
+    sa.Column('hits', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('expires_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('key')
+    )
+    with op.batch_alter_table('llm_cache_entries', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_llm_cache_entries_expires_at'), ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('llm_cache_entries', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_llm_cache_entries_expires_at'))
+
+    op.drop_table('llm_cache_entries')
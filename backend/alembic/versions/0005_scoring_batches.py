@@ -0,0 +1,56 @@
+"""scoring batches
+
+Offline Batch API scoring runs and the tests each one covers.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 13:04:57.702385
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('scoring_batches',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('parent_id', sa.Integer(), nullable=True),
+    sa.Column('stage', sa.String(length=20), nullable=False),
+    sa.Column('status', sa.Enum('SUBMITTED', 'COMPLETED', 'FAILED', name='batchstatus'), nullable=False),
+    sa.Column('provider_batch_id', sa.String(length=100), nullable=True),
+    sa.Column('provider_status', sa.String(length=30), nullable=True),
+    sa.Column('input_file_id', sa.String(length=100), nullable=True),
+    sa.Column('output_file_id', sa.String(length=100), nullable=True),
+    sa.Column('test_ids', sa.JSON(), nullable=False),
+    sa.Column('question_feedback', sa.JSON(), nullable=True),
+    sa.Column('request_count', sa.Integer(), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['parent_id'], ['scoring_batches.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('scoring_batches', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_scoring_batches_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_scoring_batches_provider_batch_id'), ['provider_batch_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_scoring_batches_status'), ['status'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('scoring_batches', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_scoring_batches_status'))
+        batch_op.drop_index(batch_op.f('ix_scoring_batches_provider_batch_id'))
+        batch_op.drop_index(batch_op.f('ix_scoring_batches_id'))
+
+    op.drop_table('scoring_batches')
+    sa.Enum(name='batchstatus').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,81 @@
+"""engine results
+
+Analysis results stored per engine and per question instead of in
+test_attempts.analysis.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 13:04:57.893120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('engine_results',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('test_id', sa.Integer(), nullable=False),
+    sa.Column('engine', sa.String(length=20), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('overall_score', sa.Float(), nullable=True),
+    sa.Column('index', sa.JSON(), nullable=True),
+    sa.Column('analysis', sa.Text(), nullable=True),
+    sa.Column('operational_projection', sa.Text(), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('total_questions', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['test_id'], ['test_attempts.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('test_id', 'engine', name='uq_engine_results_test_engine')
+    )
+    with op.batch_alter_table('engine_results', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_engine_results_engine'), ['engine'], unique=False)
+        batch_op.create_index(batch_op.f('ix_engine_results_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_engine_results_test_id'), ['test_id'], unique=False)
+
+    op.create_table('question_scores',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('test_id', sa.Integer(), nullable=False),
+    sa.Column('engine', sa.String(length=20), nullable=False),
+    sa.Column('question_id', sa.Integer(), nullable=False),
+    sa.Column('score', sa.Float(), nullable=True),
+    sa.Column('feedback', sa.Text(), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['test_id'], ['test_attempts.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('test_id', 'engine', 'question_id', name='uq_question_scores_test_engine_question')
+    )
+    with op.batch_alter_table('question_scores', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_question_scores_engine'), ['engine'], unique=False)
+        batch_op.create_index(batch_op.f('ix_question_scores_id'), ['id'], unique=False)
+        batch_op.create_index('ix_question_scores_test_engine', ['test_id', 'engine'], unique=False)
+        batch_op.create_index(batch_op.f('ix_question_scores_test_id'), ['test_id'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('question_scores', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_question_scores_test_id'))
+        batch_op.drop_index('ix_question_scores_test_engine')
+        batch_op.drop_index(batch_op.f('ix_question_scores_id'))
+        batch_op.drop_index(batch_op.f('ix_question_scores_engine'))
+
+    op.drop_table('question_scores')
+    with op.batch_alter_table('engine_results', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_engine_results_test_id'))
+        batch_op.drop_index(batch_op.f('ix_engine_results_id'))
+        batch_op.drop_index(batch_op.f('ix_engine_results_engine'))
+
+    op.drop_table('engine_results')
@@ -0,0 +1,66 @@
+"""test summaries
+
+Read-optimized summary row per test attempt for the admin dashboards;
+rebuild_test_summaries.py fills it for existing attempts. The category and
+level enum types already exist (created with test_attempts).
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 13:04:58.087634
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('test_summaries',
+    sa.Column('test_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('user_email', sa.String(), nullable=True),
+    sa.Column('user_full_name', sa.String(), nullable=True),
+    sa.Column('test_name', sa.String(), nullable=False),
+    sa.Column('category', postgresql.ENUM('SCHOOL', 'PROFESSIONAL', 'TECHNICAL', 'COMPANY', 'GENERAL', name='testcategory', create_type=False), nullable=False),
+    sa.Column('level', postgresql.ENUM('LEVEL_1', 'LEVEL_2', 'LEVEL_3', 'LEVEL_4', 'LEVEL_5', name='testlevel', create_type=False), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('score', sa.Float(), nullable=True),
+    sa.Column('engine_scores', sa.JSON(), nullable=True),
+    sa.Column('question_count', sa.Integer(), nullable=True),
+    sa.Column('answer_count', sa.Integer(), nullable=True),
+    sa.Column('answer_chars_total', sa.Integer(), nullable=True),
+    sa.Column('answer_chars_avg', sa.Float(), nullable=True),
+    sa.Column('answer_chars_max', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('completed_at', sa.DateTime(), nullable=True),
+    sa.Column('completion_seconds', sa.Float(), nullable=True),
+    sa.Column('email_sent', sa.Boolean(), nullable=True),
+    sa.Column('email_sent_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['test_id'], ['test_attempts.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('test_id')
+    )
+    with op.batch_alter_table('test_summaries', schema=None) as batch_op:
+        batch_op.create_index('ix_test_summaries_category_level', ['category', 'level'], unique=False)
+        batch_op.create_index('ix_test_summaries_created_at', ['created_at'], unique=False)
+        batch_op.create_index('ix_test_summaries_updated_at', ['updated_at'], unique=False)
+        batch_op.create_index('ix_test_summaries_user_created', ['user_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('test_summaries', schema=None) as batch_op:
+        batch_op.drop_index('ix_test_summaries_user_created')
+        batch_op.drop_index('ix_test_summaries_updated_at')
+        batch_op.drop_index('ix_test_summaries_created_at')
+        batch_op.drop_index('ix_test_summaries_category_level')
+
+    op.drop_table('test_summaries')
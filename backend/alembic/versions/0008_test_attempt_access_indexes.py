@@ -0,0 +1,59 @@
+"""test attempt access indexes
+
+Composite indexes for the dashboard keyset pagination (created_at, id), the
+per-user dashboard, the unsent-email filter and the latest-job lookup. On
+PostgreSQL they are built CONCURRENTLY so test_attempts stays writable.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 13:06:14.374335
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TEST_ATTEMPT_INDEXES = {
+    "ix_test_attempts_created_at_id": ["created_at", "id"],
+    "ix_test_attempts_user_created_at_id": ["user_id", "created_at", "id"],
+    "ix_test_attempts_email_sent_created_at": ["email_sent", "created_at"],
+}
+ANALYSIS_JOB_INDEXES = {
+    "ix_analysis_jobs_test_id_id": ["test_id", "id"],
+    "ix_analysis_jobs_status_created_at": ["status", "created_at"],
+}
+# Single-column indexes made redundant by the composite ones
+REPLACED_INDEXES = {
+    "ix_analysis_jobs_test_id": ["test_id"],
+    "ix_analysis_jobs_status": ["status"],
+}
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, columns in TEST_ATTEMPT_INDEXES.items():
+            op.create_index(name, "test_attempts", columns, if_not_exists=True, postgresql_concurrently=True)
+        for name, columns in ANALYSIS_JOB_INDEXES.items():
+            op.create_index(name, "analysis_jobs", columns, if_not_exists=True, postgresql_concurrently=True)
+        for name in REPLACED_INDEXES:
+            op.drop_index(name, table_name="analysis_jobs", if_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, columns in REPLACED_INDEXES.items():
+            op.create_index(name, "analysis_jobs", columns, if_not_exists=True, postgresql_concurrently=True)
+        for name in ANALYSIS_JOB_INDEXES:
+            op.drop_index(name, table_name="analysis_jobs", if_exists=True, postgresql_concurrently=True)
+        for name in TEST_ATTEMPT_INDEXES:
+            op.drop_index(name, table_name="test_attempts", if_exists=True, postgresql_concurrently=True)
@@ -0,0 +1,46 @@
+"""analysis claims and request keys
+
+test_attempts.analysis_claimed_at marks a test whose analysis job is queued
+or running (compare-and-set claim); analysis_jobs.request_key stores the
+client Idempotency-Key. Tests with a live job are marked claimed.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 13:10:51.080953
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009'
+down_revision: Union[str, None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('analysis_jobs', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('request_key', sa.String(length=100), nullable=True))
+        batch_op.create_unique_constraint('uq_analysis_jobs_test_request_key', ['test_id', 'request_key'])
+
+    with op.batch_alter_table('test_attempts', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('analysis_claimed_at', sa.DateTime(), nullable=True))
+
+    op.execute("""
+        UPDATE test_attempts SET analysis_claimed_at = CURRENT_TIMESTAMP
+        WHERE id IN (SELECT test_id FROM analysis_jobs WHERE status IN ('QUEUED', 'RUNNING'))
+    """)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('test_attempts', schema=None) as batch_op:
+        batch_op.drop_column('analysis_claimed_at')
+
+    with op.batch_alter_table('analysis_jobs', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_analysis_jobs_test_request_key', type_='unique')
+        batch_op.drop_column('request_key')
+
@@ -0,0 +1,51 @@
+"""email dispatches
+
+Admin bulk sends of result emails; outbox rows point back to their dispatch.
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-18 13:19:02.983668
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0011'
+down_revision: Union[str, None] = '0010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('email_dispatches',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_by', sa.Integer(), nullable=True),
+    sa.Column('filters', sa.JSON(), nullable=True),
+    sa.Column('total', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('email_dispatches', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_email_dispatches_id'), ['id'], unique=False)
+
+    with op.batch_alter_table('email_outbox', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('dispatch_id', sa.Integer(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_email_outbox_dispatch_id'), ['dispatch_id'], unique=False)
+        batch_op.create_foreign_key('fk_email_outbox_dispatch_id', 'email_dispatches', ['dispatch_id'], ['id'], ondelete='SET NULL')
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('email_outbox', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_email_outbox_dispatch_id', type_='foreignkey')
+        batch_op.drop_index(batch_op.f('ix_email_outbox_dispatch_id'))
+        batch_op.drop_column('dispatch_id')
+
+    with op.batch_alter_table('email_dispatches', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_email_dispatches_id'))
+
+    op.drop_table('email_dispatches')
@@ -0,0 +1,30 @@
+"""email text body
+
+Plain-text alternative part of outbox emails.
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-18 13:21:39.777045
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0012'
+down_revision: Union[str, None] = '0011'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('email_outbox', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('text_body', sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('email_outbox', schema=None) as batch_op:
+        batch_op.drop_column('text_body')
@@ -0,0 +1,52 @@
+"""test summary engine scores
+
+One row per (test summary, engine) with the engine's overall score, so the
+dashboard averages engines in SQL; filled from test_summaries.engine_scores.
+Attempts started but never submitted only get a summary row from
+rebuild_test_summaries.py.
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-18 15:02:17.412908
+
+"""
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0013'
+down_revision: Union[str, None] = '0012'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    engine_scores = op.create_table('test_summary_engine_scores',
+    sa.Column('test_id', sa.Integer(), nullable=False),
+    sa.Column('engine', sa.String(length=20), nullable=False),
+    sa.Column('score', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['test_id'], ['test_summaries.test_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('test_id', 'engine')
+    )
+
+    rows = []
+    for test_id, scores in op.get_bind().execute(sa.text(
+        "SELECT test_id, engine_scores FROM test_summaries WHERE engine_scores IS NOT NULL"
+    )):
+        if isinstance(scores, str):
+            scores = json.loads(scores)
+        rows.extend(
+            {"test_id": test_id, "engine": engine, "score": score}
+            for engine, score in (scores or {}).items()
+            if score is not None
+        )
+    if rows:
+        op.bulk_insert(engine_scores, rows)
+
+
+def downgrade() -> None:
+    op.drop_table('test_summary_engine_scores')
@@ -0,0 +1,18 @@
+# backend/analysis_worker.py
+# Dedicated analysis worker process. Run alongside the API (or instead of
+# the in-process workers by setting ANALYSIS_WORKERS=0 on the web process).
+import asyncio
+import os
+import app.models.user  # noqa: F401 - registers User for TestAttempt's relationship
+from app.utils.analysis_queue import run_workers
+from app.utils.llm_clients import close_clients
+
+async def main():
+    try:
+        await run_workers(int(os.getenv("ANALYSIS_WORKER_CONCURRENCY", "4")))
+    finally:
+        await close_clients()
+
+if __name__ == "__main__":
+    print("Starting analysis worker...")
+    asyncio.run(main())
@@ -1,28 +1,123 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Optional, Dict
 
 class Settings(BaseSettings):
     DATABASE_URL: str
+    # Async driver URL for the API routes; derived from DATABASE_URL when unset
+    # (postgresql -> postgresql+asyncpg, sqlite -> sqlite+aiosqlite)
+    DATABASE_ASYNC_URL: Optional[str] = None
+    # Connection pool sizing, per engine (async API engine and sync worker engine)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30.0  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 3600
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 10080
+    # Per-process cache of authenticated users (0 = query on every request)
+    AUTH_USER_CACHE_TTL_SECONDS: float = 60.0
+    AUTH_USER_CACHE_MAX_ENTRIES: int = 10000
+    # Password hashing: bcrypt work factor (existing hashes are upgraded on
+    # login) and threads hashing concurrently
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4
     OPENAI_API_KEY: str
     ANTHROPIC_API_KEY: str  
-    # GEMINI_API_KEY: str  
+    GEMINI_API_KEY: str = ""
     GROQ_API_KEY: str
     XAI_API_KEY: str  
     MISTRAL_API_KEY: str
 
+    # Per-provider LLM concurrency budgets (override with a JSON object)
+    LLM_PROVIDER_LIMITS: Dict[str, Dict[str, int]] = {
+        "openai": {"max_in_flight": 8, "requests_per_minute": 500, "tokens_per_minute": 30000},
+        "groq": {"max_in_flight": 8, "requests_per_minute": 500, "tokens_per_minute": 200000},
+        "xai": {"max_in_flight": 8, "requests_per_minute": 480, "tokens_per_minute": 100000},
+        "anthropic": {"max_in_flight": 4, "requests_per_minute": 50, "tokens_per_minute": 40000},
+        "mistral": {"max_in_flight": 4, "requests_per_minute": 60, "tokens_per_minute": 0},
+        "gemini": {"max_in_flight": 1, "requests_per_minute": 15, "tokens_per_minute": 0},
+    }
+
+    # Retry / circuit breaker policy shared by every provider (see utils/llm_retry.py)
+    LLM_RETRY_MAX_ATTEMPTS: int = 4
+    LLM_RETRY_BASE_DELAY: float = 1.0
+    LLM_RETRY_MAX_DELAY: float = 30.0
+    LLM_RETRY_AFTER_CAP: float = 60.0  # never wait longer than this on a Retry-After header
+    LLM_BREAKER_FAILURE_THRESHOLD: int = 5
+    LLM_BREAKER_RESET_SECONDS: float = 30.0
+    # Hedged requests: per provider, seconds before a duplicate request is raced (0 = off)
+    LLM_HEDGE_AFTER_SECONDS: Dict[str, float] = {}
+
+    # Batched scoring: questions per request for each engine (1 = one call per question)
+    LLM_BATCH_SIZES: Dict[str, int] = {}
+
+    # LLM response cache: "memory" (per-process LRU), "database" (shared table) or "none"
+    LLM_CACHE_BACKEND: str = "memory"
+    LLM_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    LLM_CACHE_MAX_ENTRIES: int = 20000
+
+    # Analysis deadlines in seconds (0 = wait indefinitely). Engines that miss
+    # theirs are stored as "incomplete" and fill in when they finish.
+    ANALYSIS_TOTAL_DEADLINE_SECONDS: float = 300.0
+    ANALYSIS_ENGINE_DEADLINES: Dict[str, float] = {}
+
+    # Background analysis jobs
+    ANALYSIS_WORKERS: int = 2  # in-process workers (0 = rely on analysis_worker.py)
+    ANALYSIS_POLL_SECONDS: float = 2.0
+    ANALYSIS_JOB_STALE_SECONDS: int = 900  # reclaim running jobs with no heartbeat
+
+    # Offline scoring through the OpenAI Batch API (point the base URL at
+    # batch_stub_server.py to run the pipeline locally)
+    OPENAI_BATCH_BASE_URL: Optional[str] = None
+    BATCH_COMPLETION_WINDOW: str = "24h"
+    BATCH_MAX_TESTS: int = 500  # tests per submitted batch
+
+    # /api/analytics: cached cohorts per process and histogram resolution
+    ANALYTICS_CACHE_MAX_ENTRIES: int = 32
+    ANALYTICS_HISTOGRAM_BINS: int = 20
+
+    # Demo series catalog responses (Cache-Control max-age)
+    SERIES_CACHE_MAX_AGE_SECONDS: int = 300
+
     # RESEND_API_KEY: str  
     # ADMIN_EMAIL: str 
     
     # Email Settings
     SMTP_HOST: str = "smtp.gmail.com"
     SMTP_PORT: int = 465
+    SMTP_SECURITY: str = "ssl"  # "ssl", "starttls" or "none" (smtp_stub_server.py)
     SMTP_USERNAME: str
     SMTP_PASSWORD: str
     ADMIN_EMAIL: str
+
+    # Background email sender (utils/email_queue.py): pooled SMTP connections,
+    # provider quota and retries with exponential backoff
+    EMAIL_SENDER_ENABLED: bool = True
+    EMAIL_SMTP_CONNECTIONS: int = 4
+    EMAIL_SMTP_TIMEOUT_SECONDS: float = 30.0
+    EMAIL_MESSAGES_PER_CONNECTION: int = 100  # reconnect after this many (provider limit)
+    EMAIL_CONNECTION_IDLE_SECONDS: float = 60.0
+    EMAIL_RATE_PER_MINUTE: int = 300
+    EMAIL_MAX_ATTEMPTS: int = 5
+    EMAIL_RETRY_BASE_DELAY: float = 30.0
+    EMAIL_RETRY_MAX_DELAY: float = 1800.0
+    EMAIL_POLL_SECONDS: float = 5.0
+    EMAIL_SENDING_STALE_SECONDS: int = 300  # reclaim emails whose sender stopped
+    EMAIL_BULK_MAX_TESTS: int = 2000  # result emails queued by one bulk dispatch
+    EMAIL_TEMPLATE_CACHE_DIR: str = ""  # Jinja bytecode cache, defaults to a temp directory
     FRONTEND_URL: str = "http://localhost:3000"
+
+    # Rendered result PDFs (utils/result_pdfs.py), stored per test under a
+    # hash of their inputs and served from there on later downloads
+    ARTIFACT_BACKEND: str = "local"
+    ARTIFACT_DIR: str = "artifacts"
+    ARTIFACT_PRERENDER: bool = True  # render a test's PDFs as soon as its analysis completes
+
+    # PDF rendering process pool (utils/pdf_renderer.py)
+    PDF_RENDER_PROCESSES: int = 0  # 0 = one per CPU core
+    PDF_RENDER_MAX_QUEUE: int = 32  # renders waiting or running before downloads get a 503
+    PDF_RENDER_TIMEOUT_SECONDS: float = 30.0
+
     class Config:
         env_file = ".env"
 
@@ -1,21 +1,55 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from .config import settings
 
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+def async_database_url() -> str:
+    if settings.DATABASE_ASYNC_URL:
+        return settings.DATABASE_ASYNC_URL
+    url = make_url(settings.DATABASE_URL)
+    return url.set(drivername=ASYNC_DRIVERS.get(url.drivername, url.drivername)).render_as_string(hide_password=False)
+
+def pool_options(url: str) -> dict:
+    # SQLite (local development) keeps SQLAlchemy's default pooling
+    if url.startswith("sqlite"):
+        return {}
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+
+# Sync engine: analysis workers and maintenance scripts
 engine = create_engine(
     settings.DATABASE_URL,
     pool_pre_ping=True,  
-    pool_recycle=3600, 
+    **pool_options(settings.DATABASE_URL),
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine: API routes, so queries don't block the event loop
+ASYNC_DATABASE_URL = async_database_url()
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    pool_pre_ping=True,
+    **pool_options(ASYNC_DATABASE_URL),
+)
+
+# expire_on_commit=False: attribute access after commit must not trigger lazy IO
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
\ No newline at end of file
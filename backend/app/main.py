@@ -1,7 +1,18 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from .database import engine, Base
-from .routes import auth, user, test, result, demo, sequence_analysis, email
+from .database import engine, async_engine, Base, SessionLocal
+from .routes import auth, user, test, result, demo, sequence_analysis, email, job, batch, analytics
+from .utils.llm_clients import close_clients
+from .utils.analysis_queue import start_workers, stop_workers
+from .utils.email_queue import start_sender, stop_sender, get_sender_stats
+from .utils.llm_cache import llm_cache
+from .utils.llm_scheduler import get_scheduler_stats
+from .utils.llm_retry import get_breaker_stats
+from .utils.analytics import analytics_cache
+from .utils.auth import user_cache
+from .utils.series_catalog import sync_series_catalog
+from .utils.artifact_store import artifact_store
+from .utils.pdf_renderer import pdf_renderer
 
 # Create database tables
 # Base.metadata.create_all(bind=engine)
@@ -19,6 +30,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # dashboard pagination
 )
 
 # Include routers
@@ -29,6 +41,36 @@ app.include_router(result.router)
 app.include_router(demo.router)
 app.include_router(sequence_analysis.router)
 app.include_router(email.router)
+app.include_router(job.router)
+app.include_router(batch.router)
+app.include_router(analytics.router)
+
+@app.on_event("startup")
+async def load_series_catalog():
+    """Store new series versions and warm the question cache"""
+    db = SessionLocal()
+    try:
+        sync_series_catalog(db)
+    except Exception as e:
+        # Demo attempts fall back to copying their questions
+        print(f"Series catalog sync failed: {e}")
+    finally:
+        db.close()
+
+@app.on_event("startup")
+async def startup_workers():
+    """Start in-process analysis job workers and the email sender"""
+    start_workers()
+    start_sender()
+
+@app.on_event("shutdown")
+async def shutdown_clients():
+    """Stop background workers and the PDF render pool, release pooled LLM provider, SMTP and database connections"""
+    await stop_workers()
+    await stop_sender()
+    pdf_renderer.shutdown()
+    await close_clients()
+    await async_engine.dispose()
 
 @app.get("/")
 async def root():
@@ -40,4 +82,18 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+@app.get("/metrics")
+async def metrics():
+    """LLM cache hit/miss counters, provider scheduler load, circuit breaker states, analytics and auth caches, email outbox, PDF artifacts and render pool"""
+    return {
+        "llm_cache": llm_cache.stats(),
+        "llm_scheduler": get_scheduler_stats(),
+        "llm_circuit_breakers": get_breaker_stats(),
+        "analytics_cache": analytics_cache.stats(),
+        "auth_user_cache": user_cache.stats(),
+        "email": await get_sender_stats(),
+        "pdf_artifacts": artifact_store.stats(),
+        "pdf_renderer": pdf_renderer.stats()
+    }
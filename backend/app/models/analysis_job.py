@@ -0,0 +1,38 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, Text, Enum, Index, UniqueConstraint
+from sqlalchemy.orm import relationship
+from datetime import datetime
+import enum
+from ..database import Base
+
+class JobStatus(str, enum.Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+class AnalysisJob(Base):
+    __tablename__ = "analysis_jobs"
+    __table_args__ = (
+        # Latest / active job of a test: WHERE test_id = ? ORDER BY id DESC
+        Index("ix_analysis_jobs_test_id_id", "test_id", "id"),
+        # Worker queue poll: WHERE status = ? ORDER BY created_at
+        Index("ix_analysis_jobs_status_created_at", "status", "created_at"),
+        # A retried request (same Idempotency-Key) gets its original job back
+        UniqueConstraint("test_id", "request_key", name="uq_analysis_jobs_test_request_key"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    test_id = Column(Integer, ForeignKey("test_attempts.id", ondelete="CASCADE"), nullable=False)
+    kind = Column(String(20), nullable=False, default="demo")  # "demo" = 5 engines, "test" = GPT-4o only
+    request_key = Column(String(100), nullable=True)  # client Idempotency-Key of the request that queued it
+    status = Column(Enum(JobStatus), nullable=False, default=JobStatus.QUEUED)
+    progress = Column(JSON, nullable=True)  # {engine: {"status", "completed", "total"}}
+    error = Column(Text, nullable=True)
+    attempts = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)  # worker heartbeat
+
+    # Relationships
+    test = relationship("TestAttempt")
@@ -0,0 +1,48 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, Text, Enum, Index
+from datetime import datetime
+import enum
+from ..database import Base
+
+class EmailStatus(str, enum.Enum):
+    QUEUED = "queued"    # waiting for the sender (or for its next retry)
+    SENDING = "sending"  # claimed by a sender
+    SENT = "sent"
+    FAILED = "failed"    # permanent SMTP error or out of attempts
+
+class EmailDispatch(Base):
+    """An admin bulk send of result emails to a cohort; its emails point back to it"""
+    __tablename__ = "email_dispatches"
+
+    id = Column(Integer, primary_key=True, index=True)
+    created_by = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    filters = Column(JSON, nullable=True)  # cohort selection as requested
+    total = Column(Integer, default=0)  # emails queued
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+class EmailOutbox(Base):
+    """
+    A rendered email waiting to be delivered by the background sender
+    (utils/email_queue.py). Rows are written in the same transaction as the
+    request that queues them and kept after delivery as a send log.
+    """
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        # Sender poll: WHERE status = 'queued' AND next_attempt_at <= now
+        Index("ix_email_outbox_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    test_id = Column(Integer, ForeignKey("test_attempts.id", ondelete="SET NULL"), nullable=True, index=True)
+    dispatch_id = Column(Integer, ForeignKey("email_dispatches.id", ondelete="SET NULL"), nullable=True, index=True)
+    kind = Column(String(20), nullable=False, default="result")
+    to_address = Column(String, nullable=False)
+    subject = Column(String, nullable=False)
+    html_body = Column(Text, nullable=False)
+    text_body = Column(Text, nullable=True)  # plain-text alternative
+    status = Column(Enum(EmailStatus), nullable=False, default=EmailStatus.QUEUED)
+    attempts = Column(Integer, default=0)
+    error = Column(Text, nullable=True)
+    next_attempt_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)  # sender heartbeat
+    sent_at = Column(DateTime, nullable=True)
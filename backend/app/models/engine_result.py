@@ -0,0 +1,41 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, Float, Text, Index, UniqueConstraint
+from datetime import datetime
+from ..database import Base
+
+class EngineResult(Base):
+    """Session-level result of one analysis engine for a test"""
+    __tablename__ = "engine_results"
+    __table_args__ = (
+        UniqueConstraint("test_id", "engine", name="uq_engine_results_test_engine"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    test_id = Column(Integer, ForeignKey("test_attempts.id", ondelete="CASCADE"), nullable=False, index=True)
+    engine = Column(String(20), nullable=False, index=True)  # gpt4o, claude, grok, groq, mistral
+    status = Column(String(20), nullable=False, default="running")  # running, completed, incomplete, failed
+    overall_score = Column(Float, nullable=True)
+    index = Column(JSON, nullable=True)
+    analysis = Column(Text, nullable=True)
+    operational_projection = Column(Text, nullable=True)
+    error = Column(Text, nullable=True)
+    total_questions = Column(Integer, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class QuestionScore(Base):
+    """One engine's score for one question of a test, written as each call completes"""
+    __tablename__ = "question_scores"
+    __table_args__ = (
+        UniqueConstraint("test_id", "engine", "question_id", name="uq_question_scores_test_engine_question"),
+        Index("ix_question_scores_test_engine", "test_id", "engine"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    test_id = Column(Integer, ForeignKey("test_attempts.id", ondelete="CASCADE"), nullable=False, index=True)
+    engine = Column(String(20), nullable=False, index=True)
+    question_id = Column(Integer, nullable=False)
+    score = Column(Float, nullable=True)
+    feedback = Column(Text, nullable=True)
+    error = Column(Text, nullable=True)  # set when the engine fell back to a placeholder score
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
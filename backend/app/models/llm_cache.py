@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime
+from datetime import datetime
+from ..database import Base
+
+class LLMCacheEntry(Base):
+    __tablename__ = "llm_cache_entries"
+    
+    key = Column(String(64), primary_key=True)  # sha256 of model + prompt + parameters
+    model = Column(String(100), nullable=False)
+    value = Column(Text, nullable=False)
+    hits = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=True, index=True)
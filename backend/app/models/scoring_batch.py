@@ -0,0 +1,33 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, Text, Enum
+from datetime import datetime
+import enum
+from ..database import Base
+
+class BatchStatus(str, enum.Enum):
+    SUBMITTED = "submitted"  # waiting on the provider
+    COMPLETED = "completed"  # results written back (or handed to the next stage)
+    FAILED = "failed"
+
+class ScoringBatch(Base):
+    """
+    One provider Batch API job of the offline scoring pipeline. A run has two
+    stages: "questions" (one request per question) and "aggregate" (one
+    session-level request per test, built from the question scores).
+    """
+    __tablename__ = "scoring_batches"
+
+    id = Column(Integer, primary_key=True, index=True)
+    parent_id = Column(Integer, ForeignKey("scoring_batches.id", ondelete="SET NULL"), nullable=True)
+    stage = Column(String(20), nullable=False, default="questions")  # "questions" or "aggregate"
+    status = Column(Enum(BatchStatus), nullable=False, default=BatchStatus.SUBMITTED, index=True)
+    provider_batch_id = Column(String(100), nullable=True, index=True)
+    provider_status = Column(String(30), nullable=True)  # validating, in_progress, completed, expired...
+    input_file_id = Column(String(100), nullable=True)
+    output_file_id = Column(String(100), nullable=True)
+    test_ids = Column(JSON, nullable=False)
+    question_feedback = Column(JSON, nullable=True)  # aggregate stage: {test_id: [question feedback]}
+    request_count = Column(Integer, default=0)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
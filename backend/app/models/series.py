@@ -0,0 +1,50 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, Text, UniqueConstraint
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from ..database import Base
+
+class Series(Base):
+    """A question series (demo catalog entry); its content lives in versions"""
+    __tablename__ = "series"
+
+    id = Column(String(50), primary_key=True)  # catalog id, e.g. "series_25_a"
+    current_version = Column(Integer, nullable=False, default=1)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class SeriesVersion(Base):
+    """Immutable snapshot of a series' questions; attempts reference one by (series_id, version)"""
+    __tablename__ = "series_versions"
+    __table_args__ = (
+        UniqueConstraint("series_id", "version", name="uq_series_versions_series_version"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    series_id = Column(String(50), ForeignKey("series.id", ondelete="CASCADE"), nullable=False)
+    version = Column(Integer, nullable=False)
+    title = Column(String, nullable=False)
+    description = Column(Text, nullable=True)
+    questions = Column(JSON, nullable=False)
+    content_hash = Column(String(64), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+# Versions never change once written, so materialized question lists are
+# cached for the life of the process (filled at startup, see series_catalog)
+_version_questions: Dict[Tuple[str, int], List[Dict]] = {}
+
+
+class SeriesVersionMissing(LookupError):
+    """An attempt references a series version that is not stored"""
+
+    def __init__(self, series_id: str, version: Optional[int]):
+        super().__init__(f"Series {series_id} has no version {version}")
+        self.series_id = series_id
+        self.version = version
+
+def cache_version(version: SeriesVersion):
+    _version_questions[(version.series_id, version.version)] = version.questions
+
+def cached_version_questions(series_id: str, version: int) -> Optional[List[Dict]]:
+    """Questions of a series version if this process has them cached"""
+    return _version_questions.get((series_id, version))
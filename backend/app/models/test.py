@@ -1,8 +1,10 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, Float, Text, Enum, Boolean
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, Float, Text, Enum, Boolean, Index
+from sqlalchemy.orm import Session, relationship
 from datetime import datetime
+from typing import Dict, List
 import enum
 from ..database import Base
+from .series import SeriesVersion, SeriesVersionMissing, cache_version, cached_version_questions
 
 class TestCategory(str, enum.Enum):
     SCHOOL = "school"
@@ -20,13 +22,25 @@ class TestLevel(str, enum.Enum):
 
 class TestAttempt(Base):
     __tablename__ = "test_attempts"
+    __table_args__ = (
+        # Dashboard keyset pagination: ORDER BY created_at DESC, id DESC
+        Index("ix_test_attempts_created_at_id", "created_at", "id"),
+        # Per-user dashboard and ownership checks
+        Index("ix_test_attempts_user_created_at_id", "user_id", "created_at", "id"),
+        # Unsent result emails, newest first
+        Index("ix_test_attempts_email_sent_created_at", "email_sent", "created_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     category = Column(Enum(TestCategory), nullable=False)
     level = Column(Enum(TestLevel), nullable=False)
     test_name = Column(String, nullable=False)
-    questions = Column(JSON, nullable=False)  # Store questions as JSON
+    # Series attempts reference an immutable series version instead of copying
+    # its questions; stored_questions then stays empty
+    series_id = Column(String(50), ForeignKey("series.id"), nullable=True)
+    series_version = Column(Integer, nullable=True)
+    stored_questions = Column("questions", JSON, nullable=False)  # generated tests store their own questions
     answers = Column(JSON, nullable=False)    # Store user answers as JSON
     score = Column(Float)
     analysis = Column(Text)
@@ -37,6 +51,44 @@ class TestAttempt(Base):
 
     email_sent = Column(Boolean, default=False)  
     email_sent_at = Column(DateTime, nullable=True)
+
+    # Set while an analysis job for the test is queued or running (see
+    # analysis_queue.claim_analysis); claimed with a compare-and-set
+    analysis_claimed_at = Column(DateTime, nullable=True)
     
     # Relationships
-    user = relationship("User", back_populates="test_attempts")
\ No newline at end of file
+    user = relationship("User", back_populates="test_attempts")
+    version_snapshot = relationship(
+        SeriesVersion,
+        primaryjoin="and_(foreign(TestAttempt.series_id) == SeriesVersion.series_id, "
+                    "foreign(TestAttempt.series_version) == SeriesVersion.version)",
+        viewonly=True
+    )
+
+    @property
+    def questions(self):
+        """
+        The attempt's questions, materialized from its series version when it
+        has one. A version missing from the process cache is loaded through
+        the attempt's session: async code calls load_questions via run_sync
+        (or eager loads version_snapshot) before reading this.
+        """
+        if self.series_id is None:
+            return self.stored_questions
+        questions = cached_version_questions(self.series_id, self.series_version)
+        if questions is None:
+            version = self.version_snapshot
+            if version is None:
+                raise SeriesVersionMissing(self.series_id, self.series_version)
+            cache_version(version)
+            questions = version.questions
+        return questions
+
+    @questions.setter
+    def questions(self, value):
+        self.stored_questions = value
+
+def load_questions(db: Session, tests: List["TestAttempt"]) -> List[List[Dict]]:
+    """The questions of each test, loaded with the session's connection
+    (AsyncSession callers: await db.run_sync(load_questions, tests))"""
+    return [test.questions for test in tests]
@@ -0,0 +1,54 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, Float, Boolean, Enum, Index
+from datetime import datetime
+from ..database import Base
+from .test import TestCategory, TestLevel
+
+class TestSummary(Base):
+    """
+    Read-optimized, one-row-per-test summary for admin dashboards and
+    analytics. Kept up to date on start, submit, analysis completion and email
+    (see utils/test_summary.py) so readers never touch the JSON blobs.
+    """
+    __tablename__ = "test_summaries"
+    __table_args__ = (
+        Index("ix_test_summaries_created_at", "created_at"),
+        Index("ix_test_summaries_category_level", "category", "level"),
+        Index("ix_test_summaries_user_created", "user_id", "created_at"),
+        Index("ix_test_summaries_updated_at", "updated_at"),  # analytics cache version
+    )
+
+    test_id = Column(Integer, ForeignKey("test_attempts.id", ondelete="CASCADE"), primary_key=True)
+    user_id = Column(Integer, nullable=True)
+    user_email = Column(String, nullable=True)
+    user_full_name = Column(String, nullable=True)
+    test_name = Column(String, nullable=False)
+    category = Column(Enum(TestCategory), nullable=False)
+    level = Column(Enum(TestLevel), nullable=False)
+    status = Column(String(20), nullable=False, default="started")  # started, submitted, completed
+
+    score = Column(Float, nullable=True)
+    engine_scores = Column(JSON, nullable=True)  # {engine: overall_score}, also in test_summary_engine_scores
+
+    question_count = Column(Integer, default=0)
+    answer_count = Column(Integer, default=0)
+    answer_chars_total = Column(Integer, default=0)
+    answer_chars_avg = Column(Float, default=0)
+    answer_chars_max = Column(Integer, default=0)
+
+    created_at = Column(DateTime, nullable=True)
+    completed_at = Column(DateTime, nullable=True)
+    completion_seconds = Column(Float, nullable=True)  # created -> analysis completed
+
+    email_sent = Column(Boolean, default=False)
+    email_sent_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class TestSummaryEngineScore(Base):
+    """One engine's overall score of a summarized test, so per-engine
+    aggregates are computed by the database"""
+    __tablename__ = "test_summary_engine_scores"
+
+    test_id = Column(Integer, ForeignKey("test_summaries.test_id", ondelete="CASCADE"), primary_key=True)
+    engine = Column(String(20), primary_key=True)
+    score = Column(Float, nullable=False)
@@ -0,0 +1,82 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from datetime import datetime
+from ..database import get_db
+from ..models.user import User
+from ..models.test import TestCategory, TestLevel
+from ..models.test_summary import TestSummary
+from ..utils.auth import get_current_user, is_admin_user
+from ..utils.analytics import (
+    analytics_cache, cohort_filters, cohort_stats, question_difficulty, percentile_rank
+)
+
+router = APIRouter(prefix="/api/analytics", tags=["Analytics"])
+
+@router.get("")
+async def get_analytics(
+    series: Optional[str] = None,
+    category: Optional[TestCategory] = None,
+    level: Optional[TestLevel] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    include_questions: bool = False,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Cross-engine statistics for the completed attempts of a series (test
+    name) or cohort: INDX and per-engine score distributions, inter-engine
+    correlation and Krippendorff's alpha. Per-question difficulty needs a
+    series, since question numbers are only comparable within one (admin only).
+    """
+    if not is_admin_user(current_user):
+        raise HTTPException(status_code=403, detail="Admin access required")
+    if include_questions and not series:
+        raise HTTPException(status_code=400, detail="include_questions requires a series")
+
+    key = (series, category, level, date_from, date_to)
+    filters = cohort_filters(series, category, level, date_from, date_to)
+    cohort = await db.run_sync(analytics_cache.cohort, key, filters)
+
+    result = {
+        "filters": {
+            "series": series,
+            "category": category.value if category else None,
+            "level": level.value if level else None,
+            "date_from": date_from,
+            "date_to": date_to
+        },
+        **cohort_stats(cohort)
+    }
+    if include_questions:
+        if cohort.questions is None:
+            cohort.questions = await db.run_sync(question_difficulty, filters)
+        result["questions"] = cohort.questions
+    return result
+
+@router.get("/percentile/{test_id}")
+async def get_percentile(
+    test_id: int,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Percentile rank of a test's INDX score among completed attempts of the same series"""
+    summary = await db.scalar(select(TestSummary).where(TestSummary.test_id == test_id))
+    if not summary:
+        raise HTTPException(status_code=404, detail="Test not found")
+    if summary.user_id != current_user.id and not is_admin_user(current_user):
+        raise HTTPException(status_code=403, detail="Not authorized to view this test")
+    if summary.status != "completed" or summary.score is None:
+        raise HTTPException(status_code=400, detail="Test not scored yet")
+
+    key = (summary.test_name, None, None, None, None)
+    cohort = await db.run_sync(analytics_cache.cohort, key, cohort_filters(summary.test_name))
+    return {
+        "test_id": test_id,
+        "series": summary.test_name,
+        "score": summary.score,
+        "percentile": percentile_rank(cohort, summary.score),
+        "cohort_size": int(len(cohort.sorted_indx))
+    }
@@ -1,27 +1,28 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
 from ..database import get_db
 from ..models.user import User
 from ..schemas.user import UserCreate, UserLogin, UserResponse, Token
-from ..utils.auth import verify_password, get_password_hash, create_access_token
+from ..utils.auth import hash_password, check_password, make_unusable_password, create_access_token
 from ..config import settings
 
 router = APIRouter(prefix="/api/auth", tags=["Authentication"])
 
 @router.post("/signup", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def signup(user: UserCreate, db: Session = Depends(get_db)):
+async def signup(user: UserCreate, db: AsyncSession = Depends(get_db)):
     # Check if user exists
-    db_user = db.query(User).filter(User.email == user.email).first()
+    db_user = await db.scalar(select(User).where(User.email == user.email))
     if db_user:
         raise HTTPException(status_code=400, detail="Email already registered")
     
-    db_user = db.query(User).filter(User.username == user.username).first()
+    db_user = await db.scalar(select(User).where(User.username == user.username))
     if db_user:
         raise HTTPException(status_code=400, detail="Username already taken")
     
-    # Create new user
-    hashed_password = get_password_hash(user.password)
+    # Create new user (bcrypt runs on the hashing pool, off the event loop)
+    hashed_password = await hash_password(user.password)
     new_user = User(
         email=user.email,
         username=user.username,
@@ -30,22 +31,28 @@ def signup(user: UserCreate, db: Session = Depends(get_db)):
     )
     
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
     
     return new_user
 
 @router.post("/login", response_model=Token)
-def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == user_credentials.email).first()
+async def login(user_credentials: UserLogin, db: AsyncSession = Depends(get_db)):
+    user = await db.scalar(select(User).where(User.email == user_credentials.email))
     
-    if not user or not verify_password(user_credentials.password, user.hashed_password):
+    valid, new_hash = await check_password(user_credentials.password, user.hashed_password) if user else (False, None)
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    # Work factor changed since this hash was made - store the rehash
+    if new_hash:
+        user.hashed_password = new_hash
+        await db.commit()
+    
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
         data={"sub": user.email}, expires_delta=access_token_expires
@@ -55,29 +62,29 @@ def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
 
 
 @router.post("/guest-login")
-def guest_login(email: str, full_name: str, db: Session = Depends(get_db)):
+async def guest_login(email: str, full_name: str, db: AsyncSession = Depends(get_db)):
     """Quick login/register for guest users"""
     # Check if user exists
-    existing_user = db.query(User).filter(User.email == email).first()
+    existing_user = await db.scalar(select(User).where(User.email == email))
     if existing_user:
         access_token = create_access_token(data={"sub": existing_user.email})
         return {"access_token": access_token, "token_type": "bearer"}
     
-    # Create new user with auto-generated credentials
+    # Create new user with an auto-generated username. Guests never log in
+    # with a password, so they get the unusable marker instead of a bcrypt hash
     import secrets
     auto_username = email.split('@')[0] + '_' + secrets.token_hex(4)
-    auto_password = secrets.token_urlsafe(16)
     
     new_user = User(
         email=email,
         username=auto_username,
         full_name=full_name,
-        hashed_password=get_password_hash(auto_password)
+        hashed_password=make_unusable_password()
     )
     
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
     
     access_token = create_access_token(data={"sub": new_user.email})
     return {"access_token": access_token, "token_type": "bearer"}
\ No newline at end of file
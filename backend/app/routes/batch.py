@@ -0,0 +1,72 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..database import get_db
+from ..models.user import User
+from ..models.scoring_batch import ScoringBatch
+from ..schemas.batch import BatchSubmitRequest
+from ..utils.auth import get_current_user, is_admin_user
+from ..utils.batch_scoring import submit_pending, poll_batches
+
+router = APIRouter(prefix="/api/batch", tags=["Batch Scoring"])
+
+def require_admin(current_user: User):
+    if not is_admin_user(current_user):
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+def batch_to_dict(batch: ScoringBatch) -> dict:
+    return {
+        "id": batch.id,
+        "parent_id": batch.parent_id,
+        "stage": batch.stage,
+        "status": batch.status.value,
+        "provider_batch_id": batch.provider_batch_id,
+        "provider_status": batch.provider_status,
+        "test_ids": batch.test_ids,
+        "request_count": batch.request_count,
+        "error": batch.error,
+        "created_at": batch.created_at.isoformat() if batch.created_at else None,
+        "finished_at": batch.finished_at.isoformat() if batch.finished_at else None
+    }
+
+@router.post("/submit")
+async def submit_batch(
+    request: BatchSubmitRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Grade pending tests offline through the provider Batch API (admin only)"""
+    require_admin(current_user)
+
+    try:
+        batch = await submit_pending(db, request.test_ids, request.limit)
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"Batch submission failed: {str(e)}")
+
+    if not batch:
+        return {"message": "No pending tests to score", "batch": None}
+
+    return {"message": f"Submitted {len(batch.test_ids)} tests", "batch": batch_to_dict(batch)}
+
+@router.post("/poll")
+async def poll_submitted_batches(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Check submitted batches and write finished results back (admin only)"""
+    require_admin(current_user)
+
+    batches = await poll_batches(db)
+    return {"batches": [batch_to_dict(batch) for batch in batches]}
+
+@router.get("")
+async def list_batches(
+    limit: int = 50,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Recent scoring batches (admin only)"""
+    require_admin(current_user)
+
+    batches = (await db.scalars(select(ScoringBatch).order_by(ScoringBatch.id.desc()).limit(limit))).all()
+    return {"batches": [batch_to_dict(batch) for batch in batches]}
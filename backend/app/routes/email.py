@@ -1,25 +1,53 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
 from datetime import datetime
-import json
+from typing import Dict, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select, exists, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+from ..config import settings
 from ..database import get_db
 from ..models.user import User
-from ..models.test import TestAttempt
+from ..models.test import TestAttempt, TestCategory, TestLevel
+from ..models.email_outbox import EmailDispatch, EmailOutbox
 from ..utils.auth import get_current_user, is_admin_user
-from ..utils.email_service import send_result_email
+from ..utils.email_service import render_result_email, result_email_subject
+from ..utils.email_queue import (
+    dispatch_progress, enqueue_email, enqueue_emails, get_pending_email, notify_sender
+)
+from ..utils.analysis_store import load_analyses, load_engine_analyses
 
 router = APIRouter(prefix="/api/email", tags=["Email"])
 
-@router.post("/send-result/{test_id}")
+# Tests rendered and inserted per round of a bulk dispatch
+BULK_RENDER_CHUNK = 500
+
+async def queue_result_email(db: AsyncSession, test: TestAttempt, user_email: str, user_name: str) -> EmailOutbox:
+    """Render a test's result email and add it to the outbox (the caller commits)"""
+    # Use GPT-4o as primary (the email has no per-question details)
+    gpt4o_analysis = (await db.run_sync(load_analyses, test, engines=["gpt4o"], include_questions=False)).get("gpt4o", {})
+    html_body, text_body = render_result_email(
+        user_name=user_name,
+        test_name=test.test_name,
+        test_id=test.id,
+        score=test.score,
+        analysis=gpt4o_analysis,
+        completed_at=test.completed.isoformat()
+    )
+    return await db.run_sync(
+        enqueue_email, user_email, result_email_subject(test.test_name), html_body,
+        test_id=test.id, text_body=text_body
+    )
+
+@router.post("/send-result/{test_id}", status_code=status.HTTP_202_ACCEPTED)
 async def send_test_result_email(
     test_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    """Send test result email (accessible by test owner or admin)"""
+    """Queue the test result email (accessible by test owner or admin)"""
     
     # Get test
-    test = db.query(TestAttempt).filter(TestAttempt.id == test_id).first()
+    test = await db.scalar(select(TestAttempt).options(selectinload(TestAttempt.user)).where(TestAttempt.id == test_id))
     
     if not test:
         raise HTTPException(status_code=404, detail="Test not found")
@@ -41,52 +69,29 @@ async def send_test_result_email(
     if not user_email:
         raise HTTPException(status_code=400, detail="No email address available")
     
-    # Parse analysis (use GPT-4o as primary)
-    analysis_data = json.loads(test.analysis)
-    if "analyses" in analysis_data:
-        gpt4o_analysis = json.loads(analysis_data["analyses"]["gpt4o"])
-    else:
-        gpt4o_analysis = analysis_data
+    pending = await db.run_sync(get_pending_email, test.id)
+    if pending:
+        return {"message": "Email already queued", "email_id": pending.id, "status": pending.status.value}
     
-    # Send email
-    result = await send_result_email(
-        user_email=user_email,
-        user_name=user_name,
-        test_name=test.test_name,
-        test_id=test.id,
-        score=test.score,
-        analysis=gpt4o_analysis,
-        completed_at=test.completed.isoformat()
-    )
+    # Delivered in the background by the email sender, which marks the test as emailed
+    email = await queue_result_email(db, test, user_email, user_name)
+    await db.commit()
+    notify_sender()
     
-    if result["success"]:
-        # Mark email as sent
-        test.email_sent = True
-        test.email_sent_at = datetime.utcnow()
-        db.commit()
-        
-        return {
-            "message": "Email sent successfully",
-            "email_id": result.get("email_id")
-        }
-    else:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Failed to send email: {result.get('error')}"
-        )
+    return {"message": "Email queued", "email_id": email.id, "status": email.status.value}
 
-@router.post("/resend-result/{test_id}")
+@router.post("/resend-result/{test_id}", status_code=status.HTTP_202_ACCEPTED)
 async def resend_test_result_email(
     test_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    """Resend test result email (admin only)"""
+    """Queue the test result email again (admin only)"""
     
     if not is_admin_user(current_user):
         raise HTTPException(status_code=403, detail="Admin access required")
     
-    test = db.query(TestAttempt).filter(TestAttempt.id == test_id).first()
+    test = await db.scalar(select(TestAttempt).options(selectinload(TestAttempt.user)).where(TestAttempt.id == test_id))
     
     if not test:
         raise HTTPException(status_code=404, detail="Test not found")
@@ -100,33 +105,146 @@ async def resend_test_result_email(
     if not user_email:
         raise HTTPException(status_code=400, detail="No email address available")
     
-    analysis_data = json.loads(test.analysis)
-    if "analyses" in analysis_data:
-        gpt4o_analysis = json.loads(analysis_data["analyses"]["gpt4o"])
-    else:
-        gpt4o_analysis = analysis_data
+    pending = await db.run_sync(get_pending_email, test.id)
+    if pending:
+        return {"message": "Email already queued", "email_id": pending.id, "status": pending.status.value}
     
-    result = await send_result_email(
-        user_email=user_email,
-        user_name=user_name,
-        test_name=test.test_name,
-        test_id=test.id,
-        score=test.score,
-        analysis=gpt4o_analysis,
-        completed_at=test.completed.isoformat()
+    email = await queue_result_email(db, test, user_email, user_name)
+    await db.commit()
+    notify_sender()
+    
+    return {"message": "Email queued for resend", "email_id": email.id, "status": email.status.value}
+
+@router.get("/outbox/{email_id}")
+async def get_email_status(
+    email_id: int,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Delivery status of a queued email (test owner or admin)"""
+    email = await db.get(EmailOutbox, email_id)
+    if not email:
+        raise HTTPException(status_code=404, detail="Email not found")
+    
+    if not is_admin_user(current_user):
+        test = await db.get(TestAttempt, email.test_id) if email.test_id else None
+        if not test or test.user_id != current_user.id:
+            raise HTTPException(status_code=403, detail="Not authorized")
+    
+    return {
+        "email_id": email.id,
+        "test_id": email.test_id,
+        "status": email.status.value,
+        "attempts": email.attempts,
+        "error": email.error,
+        "created_at": email.created_at,
+        "sent_at": email.sent_at
+    }
+
+def dispatch_result_emails(db: Session, admin_id: int, filters: Dict, limit: int) -> EmailDispatch:
+    """
+    Queue result emails for every completed, not yet emailed test matching
+    the filters that has never been through the outbox (failed deliveries are
+    left to resend-result). The cohort is selected in one query, analyses are
+    loaded and emails inserted per chunk. The caller commits, then calls
+    notify_sender().
+    """
+    queued_before = exists().where(EmailOutbox.test_id == TestAttempt.id, EmailOutbox.kind == "result")
+    query = db.query(
+        TestAttempt.id, TestAttempt.test_name, TestAttempt.score, TestAttempt.completed,
+        User.full_name, User.email
+    ).join(User, TestAttempt.user_id == User.id).filter(
+        TestAttempt.completed.isnot(None),
+        TestAttempt.score.isnot(None),
+        or_(TestAttempt.email_sent.is_(False), TestAttempt.email_sent.is_(None)),
+        User.email.isnot(None),
+        ~queued_before
     )
+    if filters.get("series"):
+        query = query.filter(TestAttempt.test_name == filters["series"])
+    if filters.get("category"):
+        query = query.filter(TestAttempt.category == TestCategory(filters["category"]))
+    if filters.get("level"):
+        query = query.filter(TestAttempt.level == TestLevel(filters["level"]))
+    if filters.get("date_from"):
+        query = query.filter(TestAttempt.completed >= datetime.fromisoformat(filters["date_from"]))
+    if filters.get("date_to"):
+        query = query.filter(TestAttempt.completed < datetime.fromisoformat(filters["date_to"]))
+    tests = query.order_by(TestAttempt.id).limit(limit).all()
+
+    dispatch = EmailDispatch(created_by=admin_id, filters=filters, total=len(tests))
+    db.add(dispatch)
+    db.flush()
+
+    for start in range(0, len(tests), BULK_RENDER_CHUNK):
+        chunk = tests[start:start + BULK_RENDER_CHUNK]
+        # Use GPT-4o as primary, as for single result emails
+        analyses = load_engine_analyses(db, [test.id for test in chunk], "gpt4o")
+        emails = []
+        for test in chunk:
+            html_body, text_body = render_result_email(
+                user_name=test.full_name or "Guest User",
+                test_name=test.test_name,
+                test_id=test.id,
+                score=test.score,
+                analysis=analyses.get(test.id, {}),
+                completed_at=test.completed.isoformat()
+            )
+            emails.append({
+                "test_id": test.id,
+                "kind": "result",
+                "to_address": test.email,
+                "subject": result_email_subject(test.test_name),
+                "html_body": html_body,
+                "text_body": text_body
+            })
+        enqueue_emails(db, emails, dispatch_id=dispatch.id)
+    return dispatch
+
+@router.post("/bulk-results", status_code=status.HTTP_202_ACCEPTED)
+async def send_bulk_result_emails(
+    series: Optional[str] = Query(None, description="Test (series) name"),
+    category: Optional[TestCategory] = None,
+    level: Optional[TestLevel] = None,
+    date_from: Optional[datetime] = Query(None, description="Completed at or after"),
+    date_to: Optional[datetime] = Query(None, description="Completed before"),
+    limit: int = Query(settings.EMAIL_BULK_MAX_TESTS, ge=1, le=settings.EMAIL_BULK_MAX_TESTS),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Queue result emails for a cohort of completed tests not emailed yet (admin only)"""
+    
+    if not is_admin_user(current_user):
+        raise HTTPException(status_code=403, detail="Admin access required")
+    
+    filters = {
+        "series": series,
+        "category": category.value if category else None,
+        "level": level.value if level else None,
+        "date_from": date_from.isoformat() if date_from else None,
+        "date_to": date_to.isoformat() if date_to else None,
+        "limit": limit
+    }
+    dispatch = await db.run_sync(dispatch_result_emails, current_user.id, filters, limit)
+    await db.commit()
+    notify_sender()
+    print(f"Bulk dispatch {dispatch.id}: {dispatch.total} result emails queued by user {current_user.id}")
+    
+    return {"message": "Emails queued", "dispatch_id": dispatch.id, "queued": dispatch.total}
+
+@router.get("/bulk-results/{dispatch_id}")
+async def get_bulk_dispatch_progress(
+    dispatch_id: int,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Delivery progress of a bulk result dispatch (admin only)"""
+    
+    if not is_admin_user(current_user):
+        raise HTTPException(status_code=403, detail="Admin access required")
+    
+    dispatch = await db.get(EmailDispatch, dispatch_id)
+    if not dispatch:
+        raise HTTPException(status_code=404, detail="Dispatch not found")
     
-    if result["success"]:
-        test.email_sent = True
-        test.email_sent_at = datetime.utcnow()
-        db.commit()
-        
-        return {
-            "message": "Email resent successfully",
-            "email_id": result.get("email_id")
-        }
-    else:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Failed to resend email: {result.get('error')}"
-        )
\ No newline at end of file
+    return await db.run_sync(dispatch_progress, dispatch)
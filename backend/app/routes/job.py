@@ -0,0 +1,100 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from ..database import get_db
+from ..models.user import User
+from ..models.analysis_job import AnalysisJob
+from ..models.test import TestAttempt
+from ..utils.auth import get_current_user, is_admin_user
+from ..utils.analysis_queue import (
+    summarize_progress, retryable_engines, get_active_job, claim_analysis, notify_workers
+)
+
+router = APIRouter(prefix="/api/job", tags=["Analysis Jobs"])
+
+async def get_job_for_user(job_id: int, current_user: User, db: AsyncSession) -> AnalysisJob:
+    job = await db.scalar(select(AnalysisJob).options(selectinload(AnalysisJob.test)).where(AnalysisJob.id == job_id))
+    
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    # Check permissions (test owner or admin)
+    if job.test.user_id != current_user.id and not is_admin_user(current_user):
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    return job
+
+@router.get("/{job_id}")
+async def get_job_status(
+    job_id: int,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get the status of an analysis job"""
+    job = await get_job_for_user(job_id, current_user, db)
+    
+    return {
+        "job_id": job.id,
+        "test_id": job.test_id,
+        "kind": job.kind,
+        "status": job.status.value,
+        "error": job.error,
+        "attempts": job.attempts,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None
+    }
+
+@router.get("/{job_id}/progress")
+async def get_job_progress(
+    job_id: int,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get per-engine progress of an analysis job"""
+    job = await get_job_for_user(job_id, current_user, db)
+    
+    return {
+        "job_id": job.id,
+        "test_id": job.test_id,
+        "status": job.status.value,
+        **summarize_progress(job.progress),
+        "engines": job.progress or {}
+    }
+
+@router.post("/resume/{test_id}", status_code=202)
+async def resume_analysis(
+    test_id: int,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Queue a job finishing engines that missed their deadline or failed (only missing questions are rescored)"""
+    test = await db.scalar(select(TestAttempt).where(TestAttempt.id == test_id))
+    
+    if not test:
+        raise HTTPException(status_code=404, detail="Test not found")
+    
+    if test.user_id != current_user.id and not is_admin_user(current_user):
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    if await db.run_sync(get_active_job, test.id):
+        raise HTTPException(status_code=400, detail="Analysis already in progress")
+    
+    engines = list(await db.run_sync(retryable_engines, test))
+    if not engines:
+        raise HTTPException(status_code=400, detail="No incomplete or failed analysis to resume")
+    
+    job, created = await db.run_sync(claim_analysis, test, "resume", engines=engines)
+    if not created:
+        raise HTTPException(status_code=400, detail="Analysis already in progress")
+    await db.commit()
+    notify_workers()
+    
+    return {
+        "message": "Analysis resumed",
+        "test_id": test.id,
+        "job_id": job.id,
+        "engines": engines,
+        "status": job.status.value
+    }
@@ -1,13 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-import json
-from ..database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Header, Query, Request
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+from typing import Optional
+import asyncio
+import time
+from ..database import get_db, AsyncSessionLocal
 from ..models.user import User
-from ..models.test import TestAttempt
+from ..models.test import TestAttempt, load_questions
+from ..models.analysis_job import JobStatus
 from ..schemas.result import ResultResponse, ResultAnalysis
 from ..utils.auth import get_current_user
 from fastapi.responses import StreamingResponse
-from ..utils.certificate_generator import generate_certificate
+from ..utils.http_cache import file_response
+from ..utils.pdf_renderer import RendererBusyError
+from ..utils.result_pdfs import PdfRequest, certificate_request, get_pdf, qa_request, qaa_request
+from ..utils.analysis_queue import get_latest_job, summarize_progress
+from ..utils import analysis_events
+from ..utils.analysis_events import format_sse
+from ..utils.analysis_store import load_analyses
+
+STREAM_POLL_SECONDS = 3.0
+PDF_BUSY_RETRY_AFTER_SECONDS = 5
 
 router = APIRouter(prefix="/api/result", tags=["Result"])
 
@@ -46,7 +60,7 @@ router = APIRouter(prefix="/api/result", tags=["Result"])
 async def get_test_result(
     test_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get detailed results for a specific test with all AI analyses"""
     
@@ -55,9 +69,9 @@ async def get_test_result(
     #     TestAttempt.user_id == current_user.id
     # ).first()
 
-    test = db.query(TestAttempt).filter(
+    test = await db.scalar(select(TestAttempt).where(
         TestAttempt.id == test_id
-    ).first()
+    ))
     
     if not test:
         raise HTTPException(status_code=404, detail="Test not found")
@@ -67,11 +81,24 @@ async def get_test_result(
 
     if not test.completed:
         if test.answers:  # Answers saved but analysis pending
+            job = await db.run_sync(get_latest_job, test.id)
+            progress = (job.progress or {}) if job else {}
+            analyses = {}
+            for engine, entry in progress.items():
+                if job.status == JobStatus.FAILED:
+                    message = f"Analysis failed: {job.error}"
+                else:
+                    message = f"Analysis in progress ({entry.get('completed', 0)}/{entry.get('total', 0)} questions)"
+                analyses[engine] = {"error": message, "progress": entry}
+
             return {
                 "test_id": test.id,
                 "test_name": test.test_name,
                 "score": 0,
-                "analyses": {
+                "status": job.status.value if job else "pending",
+                "job_id": job.id if job else None,
+                "progress": summarize_progress(progress),
+                "analyses": analyses or {
                     "gpt4o": {"error": "Analysis in progress, please refresh"}
                 },
                 "completed_at": test.created_at.isoformat(),
@@ -80,25 +107,7 @@ async def get_test_result(
         raise HTTPException(status_code=400, detail="No answers submitted")
 
     # Normal completed flow continues here
-    analysis_data = json.loads(test.analysis)
-    
-    # Handle backward compatibility - old tests don't have "analyses" key
-    if "analyses" in analysis_data:
-        # New multi-AI format
-        parsed_analyses = {}
-        for engine, analysis_str in analysis_data["analyses"].items():
-            try:
-                parsed_analyses[engine] = json.loads(analysis_str) if isinstance(analysis_str, str) else analysis_str
-            except:
-                parsed_analyses[engine] = {"error": "Failed to parse analysis"}
-    else:
-        # Old single-AI format - treat as GPT-4o only
-        parsed_analyses = {
-            "gpt4o": analysis_data,
-            "claude": {"error": "Not available for this test"},
-            # "grok": {"error": "Not available for this test"},
-            "mistral": {"error": "Not available for this test"}
-        }
+    parsed_analyses = await db.run_sync(load_analyses, test)
     
     return {
         "test_id": test.id,
@@ -111,39 +120,174 @@ async def get_test_result(
         "answers": test.answers  
     }
 
+@router.get("/{test_id}/stream")
+async def stream_test_result(
+    test_id: int,
+    token: Optional[str] = Query(None),
+    authorization: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db)
+):
+    """Stream per-engine results as Server-Sent Events while the analysis runs.
+    EventSource cannot send headers, so the token may be passed as ?token=..."""
+    
+    raw_token = token or (authorization or "").replace("Bearer ", "")
+    await get_current_user(raw_token, db)
+    
+    test = await db.scalar(select(TestAttempt).where(TestAttempt.id == test_id))
+    
+    if not test:
+        raise HTTPException(status_code=404, detail="Test not found")
+    
+    def completed_events(session: Session, test: TestAttempt):
+        events = [
+            format_sse("engine", {"engine": engine, "result": analysis})
+            for engine, analysis in load_analyses(session, test).items()
+        ]
+        events.append(format_sse("done", {"test_id": test.id, "status": "completed", "score": test.score}))
+        return events
+    
+    # Read finished results now, while the request's session is open. A test
+    # whose job ran in this process replays its channel instead, which keeps
+    # the stream open for engines that report after the job ("late")
+    if test.completed and not analysis_events.is_buffered(test_id):
+        replay = await db.run_sync(completed_events, test)
+    else:
+        replay = None
+    
+    async def event_stream():
+        if replay:
+            for event in replay:
+                yield event
+            return
+        
+        history, queue = analysis_events.subscribe(test_id)
+        # After "done", engines that outlived the job (their "late" results are still to come)
+        late_engines = None
+        done_at = None
+        
+        def finished(message) -> bool:
+            nonlocal late_engines, done_at
+            if message["event"] == "done":
+                late_engines = set(message["data"].get("pending_engines") or [])
+                done_at = time.monotonic()
+            elif message["event"] == "late" and late_engines is not None:
+                late_engines.discard(message["data"]["engine"])
+            return late_engines is not None and not late_engines
+        
+        try:
+            for message in history:
+                yield format_sse(message["event"], message["data"])
+                if finished(message):
+                    return
+            
+            last_progress = None
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=STREAM_POLL_SECONDS)
+                    yield format_sse(message["event"], message["data"])
+                    if finished(message):
+                        return
+                    continue
+                except asyncio.TimeoutError:
+                    pass
+                
+                if done_at is not None:
+                    # Late results are published while the test's channel lives
+                    if time.monotonic() - done_at >= analysis_events.CHANNEL_TTL_SECONDS:
+                        return
+                    yield ": keep-alive\n\n"
+                    continue
+                
+                # Nothing published in this process for a while: the job may be
+                # queued or running in a separate worker, so check the database
+                async with AsyncSessionLocal() as poll_db:
+                    current = await poll_db.scalar(select(TestAttempt).where(TestAttempt.id == test_id))
+                    if current is None:
+                        return
+                    if current.completed:
+                        finished_events = await poll_db.run_sync(completed_events, current)
+                    else:
+                        finished_events = None
+                        job = await poll_db.run_sync(get_latest_job, test_id)
+                        progress = summarize_progress(job.progress if job else None)
+                        progress["status"] = job.status.value if job else "pending"
+                
+                if finished_events:
+                    for event in finished_events:
+                        yield event
+                    return
+                if progress != last_progress:
+                    yield format_sse("progress", progress)
+                    last_progress = progress
+                else:
+                    yield ": keep-alive\n\n"
+        finally:
+            analysis_events.unsubscribe(test_id, queue)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"  # disable proxy buffering
+        }
+    )
+
 @router.patch("/feedback/{test_id}")
 async def submit_feedback(
     test_id: int,
     feedback: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Submit user feedback for a test"""
     
-    test = db.query(TestAttempt).filter(
+    test = await db.scalar(select(TestAttempt).where(
         TestAttempt.id == test_id
-    ).first()
+    ))
     
     if not test:
         raise HTTPException(status_code=404, detail="Test not found")
     
     test.feedback = feedback
-    db.commit()
+    await db.commit()
     
     return {"message": "Feedback submitted successfully"}
 
 
+async def pdf_response(request: Request, pdf: PdfRequest):
+    """Serve a stored PDF (rendering it first if needed) with ETag revalidation and byte ranges"""
+    try:
+        artifact = await get_pdf(pdf)
+    except RendererBusyError:
+        raise HTTPException(status_code=503, detail="PDF rendering is busy, please retry shortly",
+                            headers={"Retry-After": str(PDF_BUSY_RETRY_AFTER_SECONDS)})
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="PDF rendering timed out")
+    
+    return file_response(
+        str(artifact.path),
+        artifact.size,
+        artifact.etag,
+        media_type="application/pdf",
+        filename=pdf.filename,
+        range_header=request.headers.get("range"),
+        if_range=request.headers.get("if-range"),
+        if_none_match=request.headers.get("if-none-match")
+    )
+
 @router.get("/{test_id}/certificate")
 async def download_certificate(
     test_id: int,
+    request: Request,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    """Generate and download certificate for a test"""
+    """Download the certificate of a test (rendered once, then served from the artifact store)"""
     
-    test = db.query(TestAttempt).filter(
+    test = await db.scalar(select(TestAttempt).options(selectinload(TestAttempt.user)).where(
         TestAttempt.id == test_id
-    ).first()
+    ))
     
     if not test:
         raise HTTPException(status_code=404, detail="Test not found")
@@ -151,41 +295,21 @@ async def download_certificate(
     if not test.completed or not test.score:
         raise HTTPException(status_code=400, detail="Test not completed or score unavailable")
     
-    # Get user info
-    user_name = test.user.full_name if test.user else "Guest User"
-    user_email = test.user.email if test.user else "N/A"
-    
-    # Generate certificate
-    pdf_buffer = generate_certificate(
-        user_name=user_name,
-        email=user_email,
-        test_name=test.test_name,
-        score=test.score,
-        completed_at=test.completed.isoformat()
-    )
-    
-    # Return PDF as download
-    filename = f"INDX1000_Certificate_{user_name.replace(' ', '_')}_{test_id}.pdf"
-    
-    return StreamingResponse(
-        pdf_buffer,
-        media_type="application/pdf",
-        headers={
-            "Content-Disposition": f'attachment; filename="{filename}"'
-        }
-    )
+    pdf = certificate_request(test)
+    return await pdf_response(request, pdf)
 
 @router.get("/{test_id}/qa-pdf")
 async def download_qa_pdf(
     test_id: int,
+    request: Request,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    """Generate and download Q&A PDF"""
+    """Download the Q&A PDF"""
     
-    test = db.query(TestAttempt).filter(
+    test = await db.scalar(select(TestAttempt).options(selectinload(TestAttempt.user)).where(
         TestAttempt.id == test_id
-    ).first()
+    ))
     
     if not test:
         raise HTTPException(status_code=404, detail="Test not found")
@@ -193,45 +317,24 @@ async def download_qa_pdf(
     if not test.completed or not test.answers:
         raise HTTPException(status_code=400, detail="Test not completed")
     
-    # Import the generator
-    from ..utils.qa_pdf_generator import generate_qa_pdf
-    
-    # Get user info
-    user_name = test.user.full_name if test.user else "Guest User"
-    
-    # Generate PDF
-    pdf_buffer = generate_qa_pdf(
-        test_name=test.test_name,
-        user_name=user_name,
-        completed_at=test.completed.isoformat(),
-        questions=test.questions,
-        answers=test.answers
-    )
-    
-    # Return PDF as download
-    filename = f"INDX1000_QA_{user_name.replace(' ', '_')}_{test_id}.pdf"
-    
-    return StreamingResponse(
-        pdf_buffer,
-        media_type="application/pdf",
-        headers={
-            "Content-Disposition": f'attachment; filename="{filename}"'
-        }
-    )
+    await db.run_sync(load_questions, [test])
+    pdf = qa_request(test)
+    return await pdf_response(request, pdf)
 
 
 @router.get("/{test_id}/qaa-pdf/{model_name}")
 async def download_qaa_pdf(
     test_id: int,
     model_name: str,
+    request: Request,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    """Generate and download Q&A with Analysis PDF for specific AI model"""
+    """Download the Q&A with Analysis PDF for a specific AI model"""
     
-    test = db.query(TestAttempt).filter(
+    test = await db.scalar(select(TestAttempt).options(selectinload(TestAttempt.user)).where(
         TestAttempt.id == test_id
-    ).first()
+    ))
     
     if not test:
         raise HTTPException(status_code=404, detail="Test not found")
@@ -239,44 +342,14 @@ async def download_qaa_pdf(
     if not test.completed or not test.answers:
         raise HTTPException(status_code=400, detail="Test not completed")
     
-    # Parse analysis
-    analysis_data = json.loads(test.analysis)
-    
-    if "analyses" not in analysis_data:
+    # Load only this model's analysis
+    if not test.analysis:
         raise HTTPException(status_code=400, detail="Analysis not available")
     
-    model_analysis_str = analysis_data["analyses"].get(model_name)
-    if not model_analysis_str:
+    model_analysis = (await db.run_sync(load_analyses, test, engines=[model_name])).get(model_name)
+    if not model_analysis:
         raise HTTPException(status_code=404, detail=f"Analysis for {model_name} not found")
     
-    model_analysis = json.loads(model_analysis_str) if isinstance(model_analysis_str, str) else model_analysis_str
-    
-    # Import the generator
-    from ..utils.qaa_pdf_generator import generate_qaa_pdf
-    
-    # Get user info
-    user_name = test.user.full_name if test.user else "Guest User"
-    
-    # Generate PDF
-    pdf_buffer = generate_qaa_pdf(
-        test_name=test.test_name,
-        user_name=user_name,
-        completed_at=test.completed.isoformat(),
-        questions=test.questions,
-        answers=test.answers,
-        analysis=model_analysis,
-        model_name=model_name.upper(),
-        # score=test.score
-        score=model_analysis.get("overall_score", test.score)
-    )
-    
-    # Return PDF as download
-    filename = f"INDX1000_QAA_{model_name.upper()}_{user_name.replace(' ', '_')}_{test_id}.pdf"
-    
-    return StreamingResponse(
-        pdf_buffer,
-        media_type="application/pdf",
-        headers={
-            "Content-Disposition": f'attachment; filename="{filename}"'
-        }
-    )
\ No newline at end of file
+    await db.run_sync(load_questions, [test])
+    pdf = qaa_request(test, model_name, model_analysis)
+    return await pdf_response(request, pdf)
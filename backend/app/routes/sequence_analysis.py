@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from ..database import get_db
 from ..models.user import User
@@ -14,14 +15,14 @@ async def get_sequence_analyses(
     test_id: int,
     model_name: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> List[SequenceAnalysisResponse]:
     """Get all sequence analyses for a test and model"""
     
-    analyses = db.query(SequenceAnalysis).filter(
+    analyses = (await db.scalars(select(SequenceAnalysis).where(
         SequenceAnalysis.test_id == test_id,
         SequenceAnalysis.model_name == model_name
-    ).order_by(SequenceAnalysis.sequence_number).all()
+    ).order_by(SequenceAnalysis.sequence_number))).all()
     
     return analyses
 
@@ -29,7 +30,7 @@ async def get_sequence_analyses(
 async def save_sequence_analysis(
     data: SequenceAnalysisCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Save or update sequence analysis (admin only)"""
     
@@ -37,11 +38,11 @@ async def save_sequence_analysis(
         raise HTTPException(status_code=403, detail="Admin access required")
     
     # Check if exists
-    existing = db.query(SequenceAnalysis).filter(
+    existing = await db.scalar(select(SequenceAnalysis).where(
         SequenceAnalysis.test_id == data.test_id,
         SequenceAnalysis.model_name == data.model_name,
         SequenceAnalysis.sequence_number == data.sequence_number
-    ).first()
+    ))
     
     if existing:
         # Update
@@ -57,6 +58,6 @@ async def save_sequence_analysis(
         new_analysis = SequenceAnalysis(**data.dict())
         db.add(new_analysis)
     
-    db.commit()
+    await db.commit()
     
     return {"message": "Sequence analysis saved successfully"}
\ No newline at end of file
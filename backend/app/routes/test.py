@@ -1,24 +1,45 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Header, Query, Response, status
+from sqlalchemy import and_, or_, cast, func, select, Text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, load_only
+from typing import List, Optional
 from datetime import datetime
-import json
+import base64
+import binascii
 from ..database import get_db
 from ..models.user import User
-from ..models.test import TestAttempt
+from ..models.test import TestAttempt, TestCategory, TestLevel, load_questions
+from ..models.test_summary import TestSummary, TestSummaryEngineScore
 from ..schemas.test import (
     TestStartRequest, TestSubmitRequest, TestAttemptResponse, TestDashboardItem
 )
-from ..utils.auth import get_current_user
-from ..utils.ai_analyzer import generate_test_questions, analyze_test_results
+from ..utils.auth import get_current_user, is_admin_user
+from ..utils.ai_analyzer import generate_test_questions
+from ..utils.analysis_queue import claim_analysis, get_request_job, notify_workers
+from ..utils.test_summary import refresh_test_summary
 
 router = APIRouter(prefix="/api/test", tags=["Test"])
 
+DASHBOARD_PAGE_SIZE = 50
+DASHBOARD_MAX_PAGE_SIZE = 200
+DASHBOARD_HEAVY_FIELDS = {"answers", "questions"}  # JSON columns only sent when requested
+
+def encode_cursor(test: TestAttempt) -> str:
+    raw = f"{test.created_at.isoformat()}|{test.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_cursor(cursor: str):
+    try:
+        created_at, test_id = base64.urlsafe_b64decode(cursor.encode()).decode().rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(test_id)
+    except (ValueError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
 @router.post("/start", response_model=TestAttemptResponse)
 async def start_test(
     test_request: TestStartRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Start a new test and generate questions"""
     
@@ -42,8 +63,9 @@ async def start_test(
     )
     
     db.add(test_attempt)
-    db.commit()
-    db.refresh(test_attempt)
+    await db.run_sync(refresh_test_summary, test_attempt)
+    await db.commit()
+    await db.refresh(test_attempt)
     
     return test_attempt
 
@@ -92,78 +114,142 @@ async def start_test(
 #         "score": test.score
 #     }
 
-@router.post("/submit")
+@router.post("/submit", status_code=status.HTTP_202_ACCEPTED)
 async def submit_test(
     submit_request: TestSubmitRequest,
+    idempotency_key: Optional[str] = Header(None, max_length=100),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    """Submit test answers and get analysis"""
+    """Submit test answers and queue the analysis (a repeated or concurrent
+    submit gets the job already queued for the test)"""
     
-    test = db.query(TestAttempt).filter(
+    test = await db.scalar(select(TestAttempt).where(
         TestAttempt.id == submit_request.test_id,
         TestAttempt.user_id == current_user.id
-    ).first()
+    ))
     
     if not test:
         raise HTTPException(status_code=404, detail="Test not found")
     
-    if test.completed:
-        raise HTTPException(status_code=400, detail="Test already completed")
-    
-    # ✅ STEP 1: Save answers IMMEDIATELY
-    answers = [answer.dict() for answer in submit_request.answers]
-    test.answers = answers
-    test.completed = datetime.utcnow()  # Mark as submitted
-    db.commit()
-    
-    # ✅ STEP 2: Run analysis (even if this fails, answers are safe)
-    try:
-        analysis = await analyze_test_results(
-            questions=test.questions,
-            answers=answers,
-            category=test.category.value,
-            level=test.level.value
-        )
-        
-        # Update with analysis results
-        test.score = analysis["overall_score"]
-        test.analysis = json.dumps(analysis)
-        db.commit()
-        
-    except Exception as e:
-        print(f"Analysis failed but answers are saved: {e}")
-        # Answers are already saved, so test is not lost
-        test.score = 0  # Default score
-        test.analysis = json.dumps({"error": "Analysis in progress"})
-        db.commit()
-    
-    db.refresh(test)
+    # Retried request: answer with the job it queued, even once finished
+    job = idempotency_key and await db.run_sync(get_request_job, test.id, idempotency_key)
+    created = False
+    if not job:
+        if test.completed:
+            raise HTTPException(status_code=400, detail="Test already completed")
+        # ✅ STEP 1: Claim the analysis - concurrent submits attach to one job
+        job, created = await db.run_sync(claim_analysis, test, "test", request_key=idempotency_key)
+        if not job:
+            # Completed meanwhile, or claimed by an offline scoring batch
+            raise HTTPException(status_code=400, detail="Test already completed or being scored offline")
+    
+    if created:
+        # ✅ STEP 2: Save answers with the queued job (runs in a background worker, answers are safe)
+        answers = [answer.dict() for answer in submit_request.answers]
+        test.answers = answers
+        await db.run_sync(refresh_test_summary, test)
+    await db.commit()
+    if created:
+        notify_workers()
     
     return {
-        "message": "Test submitted successfully",
+        "message": "Test submitted successfully, analysis queued" if created else "Analysis already submitted",
         "test_id": test.id,
-        "score": test.score
+        "job_id": job.id,
+        "status": job.status.value
     }
 
 @router.get("/dashboard", response_model=List[TestDashboardItem])
 async def get_test_dashboard(
+    response: Response,
+    limit: int = Query(DASHBOARD_PAGE_SIZE, ge=1, le=DASHBOARD_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    category: Optional[TestCategory] = None,
+    level: Optional[TestLevel] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    completed: Optional[bool] = None,
+    email_sent: Optional[bool] = None,
+    user_id: Optional[int] = None,
+    include: Optional[str] = Query(None, description="Comma-separated heavy fields to include: answers, questions"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    """Get all tests taken by the user"""
+    """
+    Get tests, newest first, one page at a time (admins see every user's
+    tests, others their own). Pass the X-Next-Cursor response header back as
+    `cursor` for the next page; it is absent on the last page.
+    """
+    
+    include_fields = {f.strip() for f in (include or "").split(",") if f.strip()}
+    if include_fields - DASHBOARD_HEAVY_FIELDS:
+        raise HTTPException(status_code=400, detail=f"Unknown include fields: {', '.join(sorted(include_fields - DASHBOARD_HEAVY_FIELDS))}")
+    
+    columns = [
+        TestAttempt.id, TestAttempt.user_id, TestAttempt.test_name, TestAttempt.category, TestAttempt.level,
+        TestAttempt.score, TestAttempt.completed, TestAttempt.created_at, TestAttempt.remarks,
+        TestAttempt.feedback, TestAttempt.email_sent, TestAttempt.email_sent_at,
+        TestAttempt.series_id, TestAttempt.series_version
+    ]
+    # "questions" is materialized from the series version, or read from the stored column
+    columns += [
+        TestAttempt.stored_questions if field == "questions" else getattr(TestAttempt, field)
+        for field in sorted(include_fields)
+    ]
+    has_answers = and_(TestAttempt.answers.isnot(None), cast(TestAttempt.answers, Text) != "[]")
+    
+    query = select(TestAttempt, has_answers.label("has_answers")).options(
+        load_only(*columns),
+        joinedload(TestAttempt.user).load_only(User.full_name, User.email)
+    )
     
-    # tests = db.query(TestAttempt).filter(
-    #     TestAttempt.user_id == current_user.id
-    # ).order_by(TestAttempt.created_at.desc()).all()
-
-    tests = db.query(TestAttempt).order_by(
-        TestAttempt.created_at.desc()
-    ).all()
-
+    # Visibility: admins see everything, other users only their own tests
+    if is_admin_user(current_user):
+        if user_id is not None:
+            query = query.filter(TestAttempt.user_id == user_id)
+    else:
+        if user_id is not None and user_id != current_user.id:
+            raise HTTPException(status_code=403, detail="Not authorized")
+        query = query.filter(TestAttempt.user_id == current_user.id)
+    
+    if category:
+        query = query.filter(TestAttempt.category == category)
+    if level:
+        query = query.filter(TestAttempt.level == level)
+    if date_from:
+        query = query.filter(TestAttempt.created_at >= date_from)
+    if date_to:
+        query = query.filter(TestAttempt.created_at <= date_to)
+    if completed is not None:
+        query = query.filter(TestAttempt.completed.isnot(None) if completed else TestAttempt.completed.is_(None))
+    if email_sent is not None:
+        query = query.filter(
+            TestAttempt.email_sent.is_(True) if email_sent
+            else or_(TestAttempt.email_sent.is_(False), TestAttempt.email_sent.is_(None))
+        )
+    
+    # Keyset pagination on (created_at, id) - no OFFSET scans
+    if cursor:
+        cursor_created_at, cursor_id = decode_cursor(cursor)
+        query = query.filter(or_(
+            TestAttempt.created_at < cursor_created_at,
+            and_(TestAttempt.created_at == cursor_created_at, TestAttempt.id < cursor_id)
+        ))
+    
+    rows = (await db.execute(
+        query.order_by(TestAttempt.created_at.desc(), TestAttempt.id.desc()).limit(limit + 1)
+    )).all()
+    
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(rows[-1][0])
+    
+    if "questions" in include_fields:
+        await db.run_sync(load_questions, [test for test, _ in rows])
     
     result = []
-    for test in tests:
+    for test, test_has_answers in rows:
         test_dict = {
             "id": test.id,
             "test_name": test.test_name,
@@ -174,22 +260,111 @@ async def get_test_dashboard(
             "created_at": test.created_at,
             "remarks": test.remarks,
             "feedback": test.feedback,
+            "email_sent": test.email_sent,
+            "email_sent_at": test.email_sent_at,
             "certificate_available": test.completed and test.score is not None,
-            # "user": {
-            #     "full_name": test.user.full_name,
-            #     "email": test.user.email
-            # }
             "user": {
-                "full_name": test.user.full_name if test.user else None,
-                "email": test.user.email if test.user else None
+                "full_name": test.user.full_name,
+                "email": test.user.email
             } if test.user else None,
-            "answers": test.answers
-
+            "has_answers": bool(test_has_answers)
         }
+        for field in include_fields:
+            test_dict[field] = getattr(test, field)
         result.append(test_dict)
     
     return result
 
+@router.get("/dashboard/summary")
+async def get_dashboard_summary(
+    recent: int = Query(20, ge=0, le=200),
+    category: Optional[TestCategory] = None,
+    level: Optional[TestLevel] = None,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Counts, averages and recent attempts from the test_summaries table (admin only)"""
+    
+    if not is_admin_user(current_user):
+        raise HTTPException(status_code=403, detail="Admin access required")
+    
+    filters = []
+    if category:
+        filters.append(TestSummary.category == category)
+    if level:
+        filters.append(TestSummary.level == level)
+    completed = filters + [TestSummary.status == "completed"]
+    
+    total, submitted = (await db.execute(select(
+        func.count(TestSummary.test_id),
+        func.count(TestSummary.answer_count).filter(TestSummary.answer_count > 0)
+    ).filter(*filters))).one()
+    
+    completed_count, avg_score, avg_seconds, avg_answer_chars = (await db.execute(select(
+        func.count(TestSummary.test_id),
+        func.avg(TestSummary.score),
+        func.avg(TestSummary.completion_seconds),
+        func.avg(TestSummary.answer_chars_avg)
+    ).filter(*completed))).one()
+    
+    engine_averages = {
+        row.engine: row.avg_score
+        for row in await db.execute(select(
+            TestSummaryEngineScore.engine,
+            func.avg(TestSummaryEngineScore.score).label("avg_score")
+        ).join(TestSummary, TestSummary.test_id == TestSummaryEngineScore.test_id).filter(*completed).group_by(
+            TestSummaryEngineScore.engine
+        ))
+    }
+    
+    by_category_level = [
+        {
+            "category": row.category.value,
+            "level": row.level.value,
+            "count": row.count,
+            "avg_score": row.avg_score
+        }
+        for row in await db.execute(select(
+            TestSummary.category,
+            TestSummary.level,
+            func.count(TestSummary.test_id).label("count"),
+            func.avg(TestSummary.score).label("avg_score")
+        ).filter(*completed).group_by(TestSummary.category, TestSummary.level))
+    ]
+    
+    recent_rows = (await db.scalars(select(TestSummary).filter(*filters).order_by(
+        TestSummary.created_at.desc()
+    ).limit(recent))).all() if recent else []
+    
+    return {
+        "total_attempts": total,
+        "submitted": submitted,
+        "completed": completed_count,
+        "average_score": avg_score,
+        "average_completion_seconds": avg_seconds,
+        "average_answer_chars": avg_answer_chars,
+        "engine_averages": engine_averages,
+        "by_category_level": by_category_level,
+        "recent": [
+            {
+                "test_id": row.test_id,
+                "test_name": row.test_name,
+                "category": row.category.value,
+                "level": row.level.value,
+                "status": row.status,
+                "score": row.score,
+                "engine_scores": row.engine_scores,
+                "answer_count": row.answer_count,
+                "completion_seconds": row.completion_seconds,
+                "created_at": row.created_at,
+                "completed_at": row.completed_at,
+                "email_sent": row.email_sent,
+                "user": {"full_name": row.user_full_name, "email": row.user_email} if row.user_id else None
+            }
+            for row in recent_rows
+        ]
+    }
+
 @router.get("/categories")
 async def get_categories():
     """Get available test categories"""
@@ -207,7 +382,7 @@ async def get_categories():
 async def delete_test(
     test_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Delete a test attempt"""
     
@@ -216,15 +391,15 @@ async def delete_test(
     #     TestAttempt.user_id == current_user.id
     # ).first()
 
-    test = db.query(TestAttempt).filter(
+    test = await db.scalar(select(TestAttempt).where(
         TestAttempt.id == test_id
-    ).first()
+    ))
     
     if not test:
         raise HTTPException(status_code=404, detail="Test not found")
     
-    db.delete(test)
-    db.commit()
+    await db.delete(test)
+    await db.commit()
     
     return {"message": "Test deleted successfully", "test_id": test_id}
 
@@ -234,7 +409,7 @@ async def update_test_remarks(
     test_id: int,
     remarks: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Update remarks for a test (admin only)"""
     from ..utils.auth import is_admin_user
@@ -242,12 +417,12 @@ async def update_test_remarks(
     if not is_admin_user(current_user):
         raise HTTPException(status_code=403, detail="Admin access required")
     
-    test = db.query(TestAttempt).filter(TestAttempt.id == test_id).first()
+    test = await db.scalar(select(TestAttempt).where(TestAttempt.id == test_id))
     
     if not test:
         raise HTTPException(status_code=404, detail="Test not found")
     
     test.remarks = remarks
-    db.commit()
+    await db.commit()
     
     return {"message": "Remarks updated successfully", "test_id": test_id}
\ No newline at end of file
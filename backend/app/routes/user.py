@@ -1,9 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
 from ..database import get_db
 from ..models.user import User
+from ..models.test_summary import TestSummary
 from ..schemas.user import UserResponse
-from ..utils.auth import get_current_user
+from ..utils.auth import get_current_user, user_cache
 
 router = APIRouter(prefix="/api/user", tags=["User"])
 
@@ -15,12 +17,19 @@ async def get_profile(current_user: User = Depends(get_current_user)):
 async def update_profile(
     full_name: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    current_user.full_name = full_name
-    db.commit()
-    db.refresh(current_user)
-    return current_user
+    # current_user may come from the auth cache, so update the row in this session
+    user = await db.get(User, current_user.id)
+    user.full_name = full_name
+    # Test summaries keep a copy of the name for the dashboards
+    await db.execute(
+        update(TestSummary).where(TestSummary.user_id == user.id).values(user_full_name=full_name)
+    )
+    await db.commit()
+    await db.refresh(user)
+    user_cache.invalidate(user.email)
+    return user
 
 @router.get("/is-admin")
 async def check_admin_status(current_user: User = Depends(get_current_user)):
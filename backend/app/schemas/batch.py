@@ -0,0 +1,6 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+class BatchSubmitRequest(BaseModel):
+    test_ids: Optional[List[int]] = None  # re-analyse these tests; default = every test without analysis
+    limit: Optional[int] = None
@@ -1,5 +1,10 @@
-from pydantic import BaseModel
-from typing import List, Dict, Optional, Any
+from pydantic import BaseModel, Field
+from typing import List, Dict, Optional, Any, Union
+
+class QuestionFeedbackItem(BaseModel):
+    question_number: int
+    score: Union[int, float] = Field(ge=0, le=100)
+    feedback: str
 
 class ResultAnalysis(BaseModel):
     overall_score: float
@@ -45,8 +45,10 @@ class TestDashboardItem(BaseModel):
     feedback: Optional[str] = None
     email_sent: Optional[bool] = False  
     email_sent_at: Optional[datetime] = None  
-    user: Optional[Dict[str, str]] = None
+    user: Optional[Dict[str, Optional[str]]] = None
+    has_answers: Optional[bool] = None
     answers: Optional[List[Dict]] = None 
+    questions: Optional[List[Dict]] = None
     
     class Config:
         from_attributes = True
\ No newline at end of file
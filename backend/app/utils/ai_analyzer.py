@@ -1,12 +1,7 @@
-import openai
 from typing import List, Dict
 import json
 import re
-from ..config import settings
-from openai import OpenAI
-client = OpenAI(api_key=settings.OPENAI_API_KEY)
-
-openai.api_key = settings.OPENAI_API_KEY
+from .llm_clients import openai_client as client
 
 # def extract_json(text: str) -> str:
 #     """Extract JSON from markdown code blocks"""
@@ -51,7 +46,7 @@ async def generate_test_questions(category: str, level: str, num_questions: int
     """
     
     try:
-        response = client.chat.completions.create(
+        response = await client.chat.completions.create(
             model="gpt-4o",
             messages=[
                 {"role": "system", "content": "You are an expert test creator. Return ONLY valid JSON, no markdown formatting."},
@@ -118,7 +113,7 @@ CRITICAL RULES:
 - Keep feedback focused solely on this question-answer pair"""
 
         try:
-            response = client.chat.completions.create(
+            response = await client.chat.completions.create(
                 model="gpt-4o",
                 messages=[
                     {"role": "system", "content": "You are an independent question evaluator. Analyze each question in complete isolation. Return ONLY valid JSON, no markdown."},
@@ -171,7 +166,7 @@ CRITICAL FORMATTING RULES:
 - Write in a neutral, analytical tone similar to academic assessment"""
 
     try:
-        response = client.chat.completions.create(
+        response = await client.chat.completions.create(
             model="gpt-4o",
             messages=[
                 {"role": "system", "content": "You are an educational assessor providing high-level analysis based on aggregated scores only. Return ONLY valid JSON, no markdown."},
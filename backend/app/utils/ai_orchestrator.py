@@ -1,26 +1,18 @@
 import asyncio
 import json
-from typing import List, Dict
-from openai import OpenAI
-from anthropic import Anthropic
-import httpx
+from typing import List, Dict, Optional, Callable, Awaitable, Any
+from pydantic import ValidationError
 from ..config import settings
+from .llm_clients import chat_completion
+from .llm_scheduler import get_limiter, estimate_tokens
+from .llm_retry import call_with_policy
+from .llm_cache import llm_cache, make_cache_key
+from ..schemas.result import QuestionFeedbackItem
 
 
 import random
 import re
 
-
-# Initialize clients
-openai_client = OpenAI(api_key=settings.OPENAI_API_KEY)
-anthropic_client = Anthropic(api_key=settings.ANTHROPIC_API_KEY)
-# groq_client = OpenAI(
-#     api_key=settings.GROQ_API_KEY,
-#     base_url="https://api.groq.com/openai/v1"
-# )
-groq_client = OpenAI(api_key=settings.OPENAI_API_KEY)
- 
-
 def extract_json(text: str) -> str:
     """Extract JSON from markdown code blocks"""
     text = text.strip()
@@ -44,19 +36,98 @@ def sanitize_mistral_json(text: str) -> str:
     text = text.replace('“', '"').replace('”', '"')
     return text
 
-
-
-
-
-async def analyze_with_openai(session_payload: Dict, role_prompt: str) -> str:
-    """Analyze with GPT-4o"""
-    try:
-        question_feedback = []
-        
-        for q in session_payload["questions"]:
-            answer = next((a for a in session_payload["answers"] if a["question_id"] == q["question_id"]), None)
-            
-            isolated_prompt = f"""{role_prompt}
+JSON_ONLY_SYSTEM = "Return ONLY valid JSON, no markdown."
+
+# Which provider/model backs each analysis slot and how its prompts are framed.
+# NOTE: "claude" and "groq" currently run on gpt-4o-mini and "mistral" runs on Grok.
+ENGINES = {
+    "gpt4o": {
+        "label": "OpenAI",
+        "provider": "openai",
+        "model": "gpt-4o",
+        "question_system": "You are an independent question evaluator. Return ONLY valid JSON, no markdown.",
+        "aggregate_system": "You are an educational assessor. Return ONLY valid JSON, no markdown.",
+        "feedback_hint": "<brief feedback about THIS answer only>",
+        "question_max_tokens": 500,
+        "question_fallback": False,
+        "error_prefix": "",
+    },
+    "claude": {
+        "label": "Groq",
+        "provider": "groq",
+        "model": "gpt-4o-mini",
+        "question_system": JSON_ONLY_SYSTEM,
+        "aggregate_system": JSON_ONLY_SYSTEM,
+        "feedback_hint": "<brief feedback>",
+        "question_max_tokens": 500,
+        "question_fallback": False,
+        "error_prefix": "",
+    },
+    "grok": {
+        "label": "Grok",
+        "provider": "xai",
+        "model": "grok-4-1-fast-reasoning",
+        "question_system": JSON_ONLY_SYSTEM,
+        "aggregate_system": None,
+        "feedback_hint": "<brief feedback>",
+        "question_max_tokens": 1000,  # Increased for reasoning model
+        "question_fallback": True,
+        "error_prefix": "Grok unavailable: ",
+    },
+    "groq": {
+        "label": "Groq",
+        "provider": "groq",
+        "model": "gpt-4o-mini",
+        "question_system": JSON_ONLY_SYSTEM,
+        "aggregate_system": JSON_ONLY_SYSTEM,
+        "feedback_hint": "<brief feedback>",
+        "question_max_tokens": 500,
+        "question_fallback": False,
+        "error_prefix": "",
+    },
+    "mistral": {
+        "label": "Grok",
+        "provider": "xai",
+        "model": "grok-4-1-fast-reasoning",
+        "question_system": JSON_ONLY_SYSTEM,
+        "aggregate_system": None,
+        "feedback_hint": "<brief feedback>",
+        "question_max_tokens": 1000,
+        "question_fallback": True,
+        "error_prefix": "Grok unavailable: ",
+    },
+    "gemini": {
+        "label": "Gemini",
+        "provider": "gemini",
+        "model": "gemini-2.5-flash",
+        "question_system": None,
+        "aggregate_system": None,
+        "feedback_hint": "<brief feedback>",
+        "question_max_tokens": 500,
+        "question_fallback": True,
+        "error_prefix": "Gemini unavailable: ",
+    },
+}
+
+
+# Role-specific prompts, one per engine (also defines which engines run)
+ROLE_PROMPTS = {
+    "gpt4o": "You are a technical evaluator analyzing cognitive framing abilities. Analyze each question independently.RESPOND ENTIRELY IN FRENCH.",
+    "claude": "You are a pedagogical expert evaluating reasoning patterns. Analyze each question independently.RESPOND ENTIRELY IN FRENCH.",
+    "grok": "You are a critical thinking assessor evaluating decision-making. Analyze each question independently.RESPOND ENTIRELY IN FRENCH.",
+    "groq": "You are a cognitive skills evaluator analyzing analytical thinking. Analyze each question independently.RESPOND ENTIRELY IN FRENCH.",
+    # "gemini": "You are a strategic analyst evaluating problem-solving approaches. Analyze each question independently.",
+    "mistral": "You are an AI interaction specialist evaluating meta-cognitive awareness. Analyze each question independently.RESPOND ENTIRELY IN FRENCH."
+}
+
+
+def find_answer(session_payload: Dict, question_id: int) -> Optional[Dict]:
+    return next((a for a in session_payload["answers"] if a["question_id"] == question_id), None)
+
+
+def build_question_prompt(role_prompt: str, q: Dict, answer: Optional[Dict], feedback_hint: str = "<brief feedback>") -> str:
+    """Prompt scoring a single question in isolation"""
+    return f"""{role_prompt}
 
 Question: {q["question_text"]}
 Expected Criteria: {q.get("expected_criteria", "N/A")}
@@ -66,31 +137,44 @@ Provide analysis in JSON format with ONLY these fields:
 {{
   "question_number": {q["question_id"]},
   "score": <number between 0-100>,
-  "feedback": "<brief feedback about THIS answer only>"
+  "feedback": "{feedback_hint}"
 }}"""
 
-            response = openai_client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": "You are an independent question evaluator. Return ONLY valid JSON, no markdown."},
-                    {"role": "user", "content": isolated_prompt}
-                ],
-                temperature=0.3,
-                max_tokens=500
-            )
-            
-            content = extract_json(response.choices[0].message.content)
-            question_feedback.append(json.loads(content))
-        
-        total_score = sum(item.get("score", 0) for item in question_feedback)
-        overall_score = total_score / len(question_feedback) if question_feedback else 0
-        
-        aggregated_prompt = f"""{role_prompt}
+
+def build_batch_prompt(role_prompt: str, items: List[Dict], feedback_hint: str = "<brief feedback>") -> str:
+    """Prompt scoring several question/answer pairs in one request, each in its own isolated context"""
+    blocks = "\n\n".join(
+        f"""### Item {q["question_id"]}
+Question: {q["question_text"]}
+Expected Criteria: {q.get("expected_criteria", "N/A")}
+User Answer: {answer["answer_text"] if answer else "No answer provided"}"""
+        for q, answer in items
+    )
+    return f"""{role_prompt}
+
+Evaluate each of the following {len(items)} items INDEPENDENTLY. Treat every item as an isolated context:
+do not compare items, do not let one answer influence the score of another.
+
+{blocks}
+
+Return a JSON array with exactly one object per item, in the same order, each with ONLY these fields:
+[
+  {{
+    "question_number": <item number>,
+    "score": <number between 0-100>,
+    "feedback": "{feedback_hint}"
+  }}
+]"""
+
+
+def build_aggregate_prompt(role_prompt: str, total_questions: int, overall_score: float) -> str:
+    """Prompt for the session-level synthesis, based on aggregated scores only"""
+    return f"""{role_prompt}
 
 Analyze the user's cognitive interaction with AI systems based on these scores.
 
 Session Summary:
-- Total questions: {len(session_payload["questions"])}
+- Total questions: {total_questions}
 - Average score: {overall_score:.1f}%
 
 Provide analysis in STRICT JSON format with EXACTLY these fields:
@@ -112,38 +196,246 @@ CRITICAL FORMATTING RULES:
 - Score is already calculated: {overall_score} - do NOT recalculate
 - Write in a neutral, analytical tone similar to academic assessment"""
 
-        response = openai_client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": "You are an educational assessor. Return ONLY valid JSON, no markdown."},
-                {"role": "user", "content": aggregated_prompt}
-            ],
-            temperature=0.5,
-            max_tokens=1000
+
+def build_messages(system: Optional[str], prompt: str) -> List[Dict]:
+    messages = [{"role": "system", "content": system}] if system else []
+    messages.append({"role": "user", "content": prompt})
+    return messages
+
+
+async def complete(engine: str, messages: List[Dict], temperature: float, max_tokens: int) -> str:
+    """
+    Run one completion for an engine under the shared retry/circuit-breaker
+    policy. Every attempt (and hedge) is admitted by the provider's
+    scheduler, and no slot is held while backing off.
+    """
+    spec = ENGINES[engine]
+    limiter = get_limiter(spec["provider"])
+    tokens = estimate_tokens(messages, max_tokens)
+
+    async def attempt():
+        async with limiter.slot(tokens):
+            return await chat_completion(spec["provider"], spec["model"], messages, temperature, max_tokens)
+
+    return await call_with_policy(spec["provider"], attempt)
+
+
+def parse_question_feedback(content: str) -> Dict:
+    return json.loads(extract_json(content))
+
+
+def parse_feedback_list(content: str) -> List[Dict]:
+    items = json.loads(extract_json(content))
+    if not isinstance(items, list):
+        raise ValueError("Expected a JSON array of question feedback")
+    return items
+
+
+def parse_aggregate(content: str) -> Dict:
+    # Clean the content to remove control characters before parsing
+    content = extract_json(content)
+    content = content.replace('\r', '').replace('\t', ' ')
+    return json.loads(content)
+
+
+_pending_completions: Dict[str, asyncio.Future] = {}
+
+
+async def cached_complete(engine: str, messages: List[Dict], temperature: float, max_tokens: int,
+                          parse: Callable[[str], Any]) -> Any:
+    """
+    Completion through the response cache. Identical requests (same model,
+    prompt and parameters) are answered from the cache without an API call.
+    Only responses that parse are cached, so a bad reply is never replayed.
+    """
+    model = ENGINES[engine]["model"]
+    key = make_cache_key(model, messages, temperature, max_tokens)
+
+    cached = await llm_cache.get(key)
+    if cached is not None:
+        return parse(cached)
+
+    # Identical request already in flight (e.g. two guests submitting the
+    # same blank answer at once) - wait for it instead of paying twice
+    pending = _pending_completions.get(key)
+    if pending is not None:
+        return parse(await asyncio.shield(pending))
+
+    future = asyncio.get_running_loop().create_future()
+    _pending_completions[key] = future
+    try:
+        content = await complete(engine, messages, temperature, max_tokens)
+        parsed = parse(content)
+        await llm_cache.set(key, model, content)
+        future.set_result(content)
+        return parsed
+    except Exception as e:
+        future.set_exception(e)
+        future.exception()  # mark retrieved when nobody else was waiting
+        raise
+    except BaseException:
+        future.cancel()
+        raise
+    finally:
+        _pending_completions.pop(key, None)
+
+
+async def score_question(engine: str, session_payload: Dict, role_prompt: str, q: Dict) -> Dict:
+    """Score a single question/answer pair with one engine"""
+    spec = ENGINES[engine]
+    answer = find_answer(session_payload, q["question_id"])
+    isolated_prompt = build_question_prompt(role_prompt, q, answer, spec["feedback_hint"])
+
+    try:
+        return await cached_complete(
+            engine,
+            build_messages(spec["question_system"], isolated_prompt),
+            temperature=0.3,
+            max_tokens=spec["question_max_tokens"],
+            parse=parse_question_feedback
         )
-        
-        # Clean the content to remove control characters before parsing
-        content = extract_json(response.choices[0].message.content)  # or anthropic equivalent
-        # Add this line to remove control characters
-        content = content.replace('\r', '').replace('\t', ' ')
-
-        aggregated_analysis = json.loads(content)
-
-        return json.dumps({
-            "overall_score": overall_score * 10,
-            "index": aggregated_analysis.get("index", [])[:7],  # Limit to 7 items
-            "analysis": aggregated_analysis.get("analysis", ""),
-            "operational_projection": aggregated_analysis.get("operational_projection", ""),
-            "question_feedback": question_feedback
-        })
     except Exception as e:
-        print(f"OpenAI error: {e}")
-        return json.dumps({"error": str(e)})
-    
+        if not spec["question_fallback"]:
+            raise
+        print(f"{spec['label']} error for Q{q['question_id']}: {e}")
+        return {"question_number": q["question_id"], "score": 0, "feedback": "Analysis unavailable", "error": str(e)}
+
+
+async def score_batch(engine: str, session_payload: Dict, role_prompt: str, questions: List[Dict]) -> List[Dict]:
+    """
+    Score several questions with one request. Every returned item is
+    validated against QuestionFeedbackItem; questions whose item is missing
+    or invalid fall back to an individual score_question call.
+    """
+    spec = ENGINES[engine]
+    items = [(q, find_answer(session_payload, q["question_id"])) for q in questions]
+
+    try:
+        raw_items = await cached_complete(
+            engine,
+            build_messages(spec["question_system"], build_batch_prompt(role_prompt, items, spec["feedback_hint"])),
+            temperature=0.3,
+            max_tokens=spec["question_max_tokens"] * len(questions),
+            parse=parse_feedback_list
+        )
+    except Exception as e:
+        print(f"{spec['label']} batch error, scoring {len(questions)} questions individually: {e}")
+        raw_items = []
+
+    valid = {}
+    for raw in raw_items:
+        try:
+            item = QuestionFeedbackItem.model_validate(raw)
+        except ValidationError:
+            continue
+        valid[item.question_number] = {**raw, "question_number": item.question_number}
+
+    missing = [q for q in questions if q["question_id"] not in valid]
+    if missing:
+        fallback = await asyncio.gather(*[score_question(engine, session_payload, role_prompt, q) for q in missing])
+        for q, item in zip(missing, fallback):
+            valid[q["question_id"]] = item
+
+    return [valid[q["question_id"]] for q in questions]
+
+
+async def aggregate_engine(engine: str, session_payload: Dict, role_prompt: str, question_feedback: List[Dict]) -> Dict:
+    """Build the session-level analysis for one engine from its question scores"""
+    spec = ENGINES[engine]
+    total_score = sum(item.get("score", 0) for item in question_feedback)
+    overall_score = total_score / len(question_feedback) if question_feedback else 0
+
+    aggregated_prompt = build_aggregate_prompt(role_prompt, len(session_payload["questions"]), overall_score)
+    aggregated_analysis = await cached_complete(
+        engine,
+        build_messages(spec["aggregate_system"], aggregated_prompt),
+        temperature=0.5,
+        max_tokens=1000,
+        parse=parse_aggregate
+    )
+
+    return {
+        "overall_score": overall_score * 10,
+        "index": aggregated_analysis.get("index", [])[:7],  # Limit to 7 items
+        "analysis": aggregated_analysis.get("analysis", ""),
+        "operational_projection": aggregated_analysis.get("operational_projection", ""),
+        "question_feedback": question_feedback
+    }
+
 
+# Progress hook: on_event(engine, event, data) with event "question" (one
+# question_feedback item) or "engine" (the engine's final result dict)
+EventCallback = Callable[[str, str, Dict], Awaitable[None]]
 
 
+async def run_engine(engine: str, session_payload: Dict, role_prompt: str, on_event: Optional[EventCallback] = None,
+                     scored: Optional[Dict[int, Dict]] = None) -> str:
+    """
+    Score every question with one engine, then aggregate. Returns the engine's JSON result.
+    `scored` maps question_id -> feedback item: questions already in it (a resumed
+    run) are not scored again, and new items are added as they arrive so the
+    caller can read partial results while the engine is still running.
+    """
+    spec = ENGINES[engine]
+    scored = {} if scored is None else scored
+
+    batch_size = max(settings.LLM_BATCH_SIZES.get(engine, 1), 1)
 
+    async def score_and_report(chunk):
+        if len(chunk) > 1:
+            items = await score_batch(engine, session_payload, role_prompt, chunk)
+        else:
+            items = [await score_question(engine, session_payload, role_prompt, chunk[0])]
+        for q, item in zip(chunk, items):
+            scored[q["question_id"]] = item
+            if on_event:
+                await on_event(engine, "question", item)
+
+    try:
+        # Fan out all questions (or batches of questions) at once - the
+        # provider limiter decides how many requests are actually in flight
+        questions = session_payload["questions"]
+        remaining = [q for q in questions if q["question_id"] not in scored]
+        chunks = [remaining[i:i + batch_size] for i in range(0, len(remaining), batch_size)]
+        tasks = [asyncio.ensure_future(score_and_report(chunk)) for chunk in chunks]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        question_feedback = [scored[q["question_id"]] for q in questions]
+        result = await aggregate_engine(engine, session_payload, role_prompt, question_feedback)
+
+    except Exception as e:
+        print(f"{spec['label']} error: {e}")
+        result = {"error": f"{spec['error_prefix']}{str(e)}"}
+
+    if on_event:
+        await on_event(engine, "engine", result)
+    return json.dumps(result)
+
+
+def incomplete_result(session_payload: Dict, scored: Dict[int, Dict]) -> Dict:
+    """
+    Stored for an engine that missed its deadline: the question feedback
+    gathered so far, resumable later (see analysis_queue.resume_analysis)
+    """
+    questions = session_payload["questions"]
+    question_feedback = [scored[q["question_id"]] for q in questions if q["question_id"] in scored]
+    return {
+        "status": "incomplete",
+        "error": f"Analysis incomplete ({len(question_feedback)}/{len(questions)} questions)",
+        "completed_questions": len(question_feedback),
+        "total_questions": len(questions),
+        "question_feedback": question_feedback
+    }
+
+
+async def analyze_with_openai(session_payload: Dict, role_prompt: str) -> str:
+    """Analyze with GPT-4o"""
+    return await run_engine("gpt4o", session_payload, role_prompt)
 
 
 # async def analyze_with_claude(session_payload: Dict, role_prompt: str) -> str:
@@ -236,214 +528,16 @@ CRITICAL FORMATTING RULES:
 #     except Exception as e:
 #         print(f"Claude error: {e}")
 #         return json.dumps({"error": str(e)})
-    
 
 
 async def analyze_with_claude(session_payload: Dict, role_prompt: str) -> str:
-    """Analyze with Groq (LLaMA 3.1)"""
-    try:
-        question_feedback = []
-
-        for q in session_payload["questions"]:
-            answer = next(
-                (a for a in session_payload["answers"] if a["question_id"] == q["question_id"]),
-                None
-            )
+    """Analyze with Groq (gpt-4o-mini)"""
+    return await run_engine("claude", session_payload, role_prompt)
 
-            isolated_prompt = f"""{role_prompt}
-
-Question: {q["question_text"]}
-Expected Criteria: {q.get("expected_criteria", "N/A")}
-User Answer: {answer["answer_text"] if answer else "No answer provided"}
-
-Provide analysis in JSON format with ONLY these fields:
-{{
-  "question_number": {q["question_id"]},
-  "score": <number between 0-100>,
-  "feedback": "<brief feedback>"
-}}"""
-
-            response = groq_client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "Return ONLY valid JSON, no markdown."},
-                    {"role": "user", "content": isolated_prompt}
-                ],
-                temperature=0.3,
-                max_tokens=500
-            )
-
-            content = extract_json(response.choices[0].message.content)
-            question_feedback.append(json.loads(content))
-
-        total_score = sum(item.get("score", 0) for item in question_feedback)
-        overall_score = total_score / len(question_feedback) if question_feedback else 0
-
-        aggregated_prompt = f"""{role_prompt}
-
-Analyze the user's cognitive interaction with AI systems based on these scores.
-
-Session Summary:
-- Total questions: {len(session_payload["questions"])}
-- Average score: {overall_score:.1f}%
-
-Provide analysis in STRICT JSON format with EXACTLY these fields:
-{{
-  "overall_score": {overall_score},
-  "index": ["<item1>", "<item2>", "<item3>", "<item4>", "<item5>", "<item6>", "<item7>"],
-  "analysis": "<paragraph1>\\n\\n<paragraph2>\\n\\n<paragraph3>",
-  "operational_projection": "<one paragraph>"
-}}
-
-CRITICAL FORMATTING RULES:
-- index: Exactly 6-7 items, each 5-6 words maximum, descriptive phrases
-  Example: "Rapport à l'intention initiale", "Gestion de la continuité par rupture volontaire"
-- analysis: MUST be 2-3 separate paragraphs separated by \\n\\n (double newline)
-  Each paragraph should be 3-5 sentences
-  NO bullet points, NO sections, continuous prose only
-- operational_projection: ONE paragraph, 3-4 sentences, conditional phrasing
-- Do NOT use special characters, quotes, or control characters in strings
-- Score is already calculated: {overall_score} - do NOT recalculate
-- Write in a neutral, analytical tone similar to academic assessment"""
-
-        response = groq_client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "Return ONLY valid JSON, no markdown."},
-                {"role": "user", "content": aggregated_prompt}
-            ],
-            temperature=0.5,
-            max_tokens=1000
-        )
-
-        content = extract_json(response.choices[0].message.content)
-        content = content.replace('\r', '').replace('\t', ' ')
-        aggregated_analysis = json.loads(content)
-
-        return json.dumps({
-            "overall_score": overall_score * 10,
-            "index": aggregated_analysis.get("index", [])[:7],  # Limit to 7 items
-            "analysis": aggregated_analysis.get("analysis", ""),
-            "operational_projection": aggregated_analysis.get("operational_projection", ""),
-            "question_feedback": question_feedback
-        })
-    
-    except Exception as e:
-        print(f"Groq error: {e}")
-        return json.dumps({"error": str(e)})
-
-
-
-
-
-
-
-    
 
 async def analyze_with_groq(session_payload: Dict, role_prompt: str) -> str:
-    """Analyze with Groq (LLaMA 3.1)"""
-    try:
-        question_feedback = []
-
-        for q in session_payload["questions"]:
-            answer = next(
-                (a for a in session_payload["answers"] if a["question_id"] == q["question_id"]),
-                None
-            )
-
-            isolated_prompt = f"""{role_prompt}
-
-Question: {q["question_text"]}
-Expected Criteria: {q.get("expected_criteria", "N/A")}
-User Answer: {answer["answer_text"] if answer else "No answer provided"}
-
-Provide analysis in JSON format with ONLY these fields:
-{{
-  "question_number": {q["question_id"]},
-  "score": <number between 0-100>,
-  "feedback": "<brief feedback>"
-}}"""
-
-            response = groq_client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "Return ONLY valid JSON, no markdown."},
-                    {"role": "user", "content": isolated_prompt}
-                ],
-                temperature=0.3,
-                max_tokens=500
-            )
-
-            content = extract_json(response.choices[0].message.content)
-            question_feedback.append(json.loads(content))
-
-        total_score = sum(item.get("score", 0) for item in question_feedback)
-        overall_score = total_score / len(question_feedback) if question_feedback else 0
-
-        aggregated_prompt = f"""{role_prompt}
-
-Analyze the user's cognitive interaction with AI systems based on these scores.
-
-Session Summary:
-- Total questions: {len(session_payload["questions"])}
-- Average score: {overall_score:.1f}%
-
-Provide analysis in STRICT JSON format with EXACTLY these fields:
-{{
-  "overall_score": {overall_score},
-  "index": ["<item1>", "<item2>", "<item3>", "<item4>", "<item5>", "<item6>", "<item7>"],
-  "analysis": "<paragraph1>\\n\\n<paragraph2>\\n\\n<paragraph3>",
-  "operational_projection": "<one paragraph>"
-}}
-
-CRITICAL FORMATTING RULES:
-- index: Exactly 6-7 items, each 5-6 words maximum, descriptive phrases
-  Example: "Rapport à l'intention initiale", "Gestion de la continuité par rupture volontaire"
-- analysis: MUST be 2-3 separate paragraphs separated by \\n\\n (double newline)
-  Each paragraph should be 3-5 sentences
-  NO bullet points, NO sections, continuous prose only
-- operational_projection: ONE paragraph, 3-4 sentences, conditional phrasing
-- Do NOT use special characters, quotes, or control characters in strings
-- Score is already calculated: {overall_score} - do NOT recalculate
-- Write in a neutral, analytical tone similar to academic assessment"""
-
-        response = groq_client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "Return ONLY valid JSON, no markdown."},
-                {"role": "user", "content": aggregated_prompt}
-            ],
-            temperature=0.5,
-            max_tokens=1000
-        )
-
-        content = extract_json(response.choices[0].message.content)
-        content = content.replace('\r', '').replace('\t', ' ')
-        aggregated_analysis = json.loads(content)
-
-        return json.dumps({
-            "overall_score": overall_score * 10,
-            "index": aggregated_analysis.get("index", [])[:7],  # Limit to 7 items
-            "analysis": aggregated_analysis.get("analysis", ""),
-            "operational_projection": aggregated_analysis.get("operational_projection", ""),
-            "question_feedback": question_feedback
-        })
-    
-    except Exception as e:
-        print(f"Groq error: {e}")
-        return json.dumps({"error": str(e)})
-
-
-
-
-
-
-
-
-
-
-
-
+    """Analyze with Groq (gpt-4o-mini)"""
+    return await run_engine("groq", session_payload, role_prompt)
 
 
 # async def analyze_with_mistral(session_payload: Dict, role_prompt: str) -> str:
@@ -553,434 +647,62 @@ CRITICAL FORMATTING RULES:
 #     except Exception as e:
 #         print(f"Mistral error: {e}")
 #         return json.dumps({"error": str(e)})
-    
-async def analyze_with_mistral(session_payload: Dict, role_prompt: str) -> str:
-    """Analyze with Grok (xAI) - Production Fixed for grok-4-1"""
-    try:
-        # Use a longer timeout for reasoning models
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            
-            async def fetch_grok_completion(payload_data):
-                headers = {
-                    "Authorization": f"Bearer {settings.XAI_API_KEY}",
-                    "Content-Type": "application/json"
-                }
-                
-                # 1. Try the exact model from your screenshot
-                try:
-                    payload_data["model"] = "grok-4-1-fast-reasoning" 
-                    response = await client.post(
-                        "https://api.x.ai/v1/chat/completions", # FULL URL to prevent protocol error
-                        headers=headers, 
-                        json=payload_data
-                    )
-                    
-                    if response.status_code in [404, 403, 400]:
-                         print(f"Primary model failed {response.status_code}, trying alias...")
-                         raise Exception("Model unavailable")
-                    
-                    response.raise_for_status()
-                    return response
-                    
-                except Exception as e:
-                    # 2. Fallback to the alias 'grok-beta' which is usually safest
-                    print(f"Grok primary failed ({e}), switching to grok-beta...")
-                    payload_data["model"] = "grok-beta"
-                    return await client.post(
-                        "https://api.x.ai/v1/chat/completions", # FULL URL
-                        headers=headers, 
-                        json=payload_data
-                    )
-
-            # --- Processing Logic ---
-            async def process_single_question(q):
-                answer = next((a for a in session_payload["answers"] if a["question_id"] == q["question_id"]), None)
-                isolated_prompt = f"""{role_prompt}
-
-Question: {q["question_text"]}
-Expected Criteria: {q.get("expected_criteria", "N/A")}
-User Answer: {answer["answer_text"] if answer else "No answer provided"}
-
-Provide analysis in JSON format with ONLY these fields:
-{{
-  "question_number": {q["question_id"]},
-  "score": <number between 0-100>,
-  "feedback": "<brief feedback>"
-}}"""
-                try:
-                    response = await fetch_grok_completion({
-                        "messages": [
-                            {"role": "system", "content": "Return ONLY valid JSON, no markdown."},
-                            {"role": "user", "content": isolated_prompt}
-                        ],
-                        "temperature": 0.3,
-                        "max_tokens": 1000 # Increased for reasoning model
-                    })
-                    
-                    response.raise_for_status()
-                    result = response.json()
-                    content = extract_json(result["choices"][0]["message"]["content"])
-                    return json.loads(content)
-                except Exception as e:
-                    print(f"Grok error for Q{q['question_id']}: {e}")
-                    return {"question_number": q["question_id"], "score": 0, "feedback": "Analysis unavailable"}
-
-            # Execute Parallel
-            question_feedback = await asyncio.gather(
-                *[process_single_question(q) for q in session_payload["questions"]]
-            )
-            
-            # Aggregate
-            total_score = sum(item.get("score", 0) for item in question_feedback)
-            overall_score = total_score / len(question_feedback) if question_feedback else 0
-            
-            aggregated_prompt = f"""{role_prompt}
-
-Analyze the user's cognitive interaction with AI systems based on these scores.
-
-Session Summary:
-- Total questions: {len(session_payload["questions"])}
-- Average score: {overall_score:.1f}%
-
-Provide analysis in STRICT JSON format with EXACTLY these fields:
-{{
-  "overall_score": {overall_score},
-  "index": ["<item1>", "<item2>", "<item3>", "<item4>", "<item5>", "<item6>", "<item7>"],
-  "analysis": "<paragraph1>\\n\\n<paragraph2>\\n\\n<paragraph3>",
-  "operational_projection": "<one paragraph>"
-}}
-
-CRITICAL FORMATTING RULES:
-- index: Exactly 6-7 items, each 5-6 words maximum, descriptive phrases
-  Example: "Rapport à l'intention initiale", "Gestion de la continuité par rupture volontaire"
-- analysis: MUST be 2-3 separate paragraphs separated by \\n\\n (double newline)
-  Each paragraph should be 3-5 sentences
-  NO bullet points, NO sections, continuous prose only
-- operational_projection: ONE paragraph, 3-4 sentences, conditional phrasing
-- Do NOT use special characters, quotes, or control characters in strings
-- Score is already calculated: {overall_score} - do NOT recalculate
-- Write in a neutral, analytical tone similar to academic assessment"""
-
-            response = await fetch_grok_completion({
-                "messages": [{"role": "user", "content": aggregated_prompt}],
-                "temperature": 0.5,
-                "max_tokens": 1000
-            })
-            
-            response.raise_for_status()
-            result = response.json()
-            content = extract_json(result["choices"][0]["message"]["content"])  # ✅ Use 'result'
-            content = content.replace('\r', '').replace('\t', ' ')
-
-            aggregated_analysis = json.loads(content)
-
-            return json.dumps({
-                "overall_score": overall_score * 10,
-                "index": aggregated_analysis.get("index", [])[:7],  # Limit to 7 items
-                "analysis": aggregated_analysis.get("analysis", ""),
-                "operational_projection": aggregated_analysis.get("operational_projection", ""),
-                "question_feedback": question_feedback
-            })
-
-    except Exception as e:
-        print(f"Grok critical error: {e}")
-        return json.dumps({"error": f"Grok unavailable: {str(e)}"})
-
-
-
 
+async def analyze_with_mistral(session_payload: Dict, role_prompt: str) -> str:
+    """Analyze with Grok (xAI) - grok-4-1"""
+    return await run_engine("mistral", session_payload, role_prompt)
 
 
 async def analyze_with_grok(session_payload: Dict, role_prompt: str) -> str:
-    """Analyze with Grok (xAI) - Production Fixed for grok-4-1"""
-    try:
-        # Use a longer timeout for reasoning models
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            
-            async def fetch_grok_completion(payload_data):
-                headers = {
-                    "Authorization": f"Bearer {settings.XAI_API_KEY}",
-                    "Content-Type": "application/json"
-                }
-                
-                # 1. Try the exact model from your screenshot
-                try:
-                    payload_data["model"] = "grok-4-1-fast-reasoning" 
-                    response = await client.post(
-                        "https://api.x.ai/v1/chat/completions", # FULL URL to prevent protocol error
-                        headers=headers, 
-                        json=payload_data
-                    )
-                    
-                    if response.status_code in [404, 403, 400]:
-                         print(f"Primary model failed {response.status_code}, trying alias...")
-                         raise Exception("Model unavailable")
-                    
-                    response.raise_for_status()
-                    return response
-                    
-                except Exception as e:
-                    # 2. Fallback to the alias 'grok-beta' which is usually safest
-                    print(f"Grok primary failed ({e}), switching to grok-beta...")
-                    payload_data["model"] = "grok-beta"
-                    return await client.post(
-                        "https://api.x.ai/v1/chat/completions", # FULL URL
-                        headers=headers, 
-                        json=payload_data
-                    )
-
-            # --- Processing Logic ---
-            async def process_single_question(q):
-                answer = next((a for a in session_payload["answers"] if a["question_id"] == q["question_id"]), None)
-                isolated_prompt = f"""{role_prompt}
-
-Question: {q["question_text"]}
-Expected Criteria: {q.get("expected_criteria", "N/A")}
-User Answer: {answer["answer_text"] if answer else "No answer provided"}
-
-Provide analysis in JSON format with ONLY these fields:
-{{
-  "question_number": {q["question_id"]},
-  "score": <number between 0-100>,
-  "feedback": "<brief feedback>"
-}}"""
-                try:
-                    response = await fetch_grok_completion({
-                        "messages": [
-                            {"role": "system", "content": "Return ONLY valid JSON, no markdown."},
-                            {"role": "user", "content": isolated_prompt}
-                        ],
-                        "temperature": 0.3,
-                        "max_tokens": 1000 # Increased for reasoning model
-                    })
-                    
-                    response.raise_for_status()
-                    result = response.json()
-                    content = extract_json(result["choices"][0]["message"]["content"])
-                    return json.loads(content)
-                except Exception as e:
-                    print(f"Grok error for Q{q['question_id']}: {e}")
-                    return {"question_number": q["question_id"], "score": 0, "feedback": "Analysis unavailable"}
-
-            # Execute Parallel
-            question_feedback = await asyncio.gather(
-                *[process_single_question(q) for q in session_payload["questions"]]
-            )
-            
-            # Aggregate
-            total_score = sum(item.get("score", 0) for item in question_feedback)
-            overall_score = total_score / len(question_feedback) if question_feedback else 0
-            
-            aggregated_prompt = f"""{role_prompt}
-
-Analyze the user's cognitive interaction with AI systems based on these scores.
-
-Session Summary:
-- Total questions: {len(session_payload["questions"])}
-- Average score: {overall_score:.1f}%
-
-Provide analysis in STRICT JSON format with EXACTLY these fields:
-{{
-  "overall_score": {overall_score},
-  "index": ["<item1>", "<item2>", "<item3>", "<item4>", "<item5>", "<item6>", "<item7>"],
-  "analysis": "<paragraph1>\\n\\n<paragraph2>\\n\\n<paragraph3>",
-  "operational_projection": "<one paragraph>"
-}}
-
-CRITICAL FORMATTING RULES:
-- index: Exactly 6-7 items, each 5-6 words maximum, descriptive phrases
-  Example: "Rapport à l'intention initiale", "Gestion de la continuité par rupture volontaire"
-- analysis: MUST be 2-3 separate paragraphs separated by \\n\\n (double newline)
-  Each paragraph should be 3-5 sentences
-  NO bullet points, NO sections, continuous prose only
-- operational_projection: ONE paragraph, 3-4 sentences, conditional phrasing
-- Do NOT use special characters, quotes, or control characters in strings
-- Score is already calculated: {overall_score} - do NOT recalculate
-- Write in a neutral, analytical tone similar to academic assessment"""
-
-            response = await fetch_grok_completion({
-                "messages": [{"role": "user", "content": aggregated_prompt}],
-                "temperature": 0.5,
-                "max_tokens": 1000
-            })
-            
-            response.raise_for_status()
-            result = response.json()
-            content = extract_json(result["choices"][0]["message"]["content"])  # ✅ Use 'result'
-            content = content.replace('\r', '').replace('\t', ' ')
-
-            aggregated_analysis = json.loads(content)
-
-            return json.dumps({
-                "overall_score": overall_score * 10,
-                "index": aggregated_analysis.get("index", [])[:7],  # Limit to 7 items
-                "analysis": aggregated_analysis.get("analysis", ""),
-                "operational_projection": aggregated_analysis.get("operational_projection", ""),
-                "question_feedback": question_feedback
-            })
-
-    except Exception as e:
-        print(f"Grok critical error: {e}")
-        return json.dumps({"error": f"Grok unavailable: {str(e)}"})
-
+    """Analyze with Grok (xAI) - grok-4-1"""
+    return await run_engine("grok", session_payload, role_prompt)
 
 
 async def analyze_with_gemini(session_payload: Dict, role_prompt: str) -> str:
-    """Analyze with Gemini - Sequential & Robust Retry (Fixes 429 Errors)"""
-    try:
-        # TIMEOUT: Increased to 120s because we are waiting nicely between requests
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            
-            # SEMAPHORE 1: Strictly process ONE question at a time.
-            # This ensures we don't accidentally flood the 15 RPM limit.
-            sem = asyncio.Semaphore(1) 
+    """Analyze with Gemini (gemini-2.5-flash) - rate limits are handled by the scheduler and retry policy"""
+    return await run_engine("gemini", session_payload, role_prompt)
 
-            async def process_single_question(q):
-                async with sem:
-                    answer = next((a for a in session_payload["answers"] if a["question_id"] == q["question_id"]), None)
-                    isolated_prompt = f"""{role_prompt}
 
-Question: {q["question_text"]}
-Expected Criteria: {q.get("expected_criteria", "N/A")}
-User Answer: {answer["answer_text"] if answer else "No answer provided"}
+# Called with (engine, result JSON) when an engine that missed its deadline finishes
+LateResultCallback = Callable[[str, str], Awaitable[None]]
 
-Provide analysis in JSON format with ONLY these fields:
-{{
-  "question_number": {q["question_id"]},
-  "score": <number between 0-100>,
-  "feedback": "<brief feedback>"
-}}"""
-                    
-                    # Robust Retry Loop (Exponential Backoff)
-                    max_retries = 5
-                    base_delay = 4 # Wait 4 seconds minimum between successful requests
-                    
-                    for attempt in range(max_retries):
-                        try:
-                            # 1. Enforce a rate-limit sleep BEFORE the request
-                            # This ensures we naturally stay under ~15 RPM
-                            await asyncio.sleep(base_delay)
-
-                            response = await client.post(
-                                f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash:generateContent?key={settings.GEMINI_API_KEY}",
-                                headers={"Content-Type": "application/json"},
-                                json={
-                                    "contents": [{"parts": [{"text": isolated_prompt}]}],
-                                    "generationConfig": {
-                                        "temperature": 0.3, 
-                                        "maxOutputTokens": 500,
-                                        "responseMimeType": "application/json"
-                                    }
-                                }
-                            )
-                            
-                            # 2. Handle Rate Limit (429) specifically
-                            if response.status_code == 429:
-                                wait_time = (2 ** attempt) * 5  # Exponential: 5s, 10s, 20s...
-                                print(f"Gemini Q{q['question_id']} hit rate limit (429). Retrying in {wait_time}s...")
-                                await asyncio.sleep(wait_time)
-                                continue # Try loop again
-
-                            response.raise_for_status()
-                            result = response.json()
-                            text_content = result["candidates"][0]["content"]["parts"][0]["text"]
-                            content = extract_json(text_content)
-                            return json.loads(content)
-
-                        except Exception as e:
-                            print(f"Attempt {attempt+1} failed for Q{q['question_id']}: {e}")
-                            if attempt == max_retries - 1:
-                                return {
-                                    "question_number": q["question_id"],
-                                    "score": 0,
-                                    "feedback": "Analysis unavailable after retries"
-                                }
-                            await asyncio.sleep(2) # Small sleep for non-429 errors
-
-            # Run strictly sequential but managed by asyncio
-            question_feedback = await asyncio.gather(
-                *[process_single_question(q) for q in session_payload["questions"]]
-            )
-            
-            # Aggregate Results
-            total_score = sum(item.get("score", 0) for item in question_feedback)
-            overall_score = total_score / len(question_feedback) if question_feedback else 0
-            
-            aggregated_prompt = f"""{role_prompt}
+# Engines still running after orchestrate_analysis returned (kept referenced
+# so they are not garbage collected mid-flight)
+_late_engines = set()
 
-Analyze the user's cognitive interaction with AI systems based on these scores.
 
-Session Summary:
-- Total questions: {len(session_payload["questions"])}
-- Average score: {overall_score:.1f}%
+def engine_deadline(engine: str) -> float:
+    """Seconds an engine may take before its partial result is returned (0 = no deadline)"""
+    total = settings.ANALYSIS_TOTAL_DEADLINE_SECONDS
+    deadline = settings.ANALYSIS_ENGINE_DEADLINES.get(engine, total)
+    if total and deadline:
+        return min(deadline, total)
+    return deadline or total
 
-Provide analysis in STRICT JSON format with EXACTLY these fields:
-{{
-  "overall_score": {overall_score},
-  "index": ["<item1>", "<item2>", "<item3>", "<item4>", "<item5>", "<item6>", "<item7>"],
-  "analysis": "<paragraph1>\\n\\n<paragraph2>\\n\\n<paragraph3>",
-  "operational_projection": "<one paragraph>"
-}}
 
-CRITICAL FORMATTING RULES:
-- index: Exactly 6-7 items, each 5-6 words maximum, descriptive phrases
-  Example: "Rapport à l'intention initiale", "Gestion de la continuité par rupture volontaire"
-- analysis: MUST be 2-3 separate paragraphs separated by \\n\\n (double newline)
-  Each paragraph should be 3-5 sentences
-  NO bullet points, NO sections, continuous prose only
-- operational_projection: ONE paragraph, 3-4 sentences, conditional phrasing
-- Do NOT use special characters, quotes, or control characters in strings
-- Score is already calculated: {overall_score} - do NOT recalculate
-- Write in a neutral, analytical tone similar to academic assessment"""
-            
-            # Final Aggregation Request (Retry logic included inline)
-            for attempt in range(3):
-                try:
-                    await asyncio.sleep(2) # Brief pause before summary
-                    response = await client.post(
-                        f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash:generateContent?key={settings.GEMINI_API_KEY}",
-                        headers={"Content-Type": "application/json"},
-                        json={
-                            "contents": [{"parts": [{"text": aggregated_prompt}]}],
-                            "generationConfig": {
-                                "temperature": 0.5, 
-                                "maxOutputTokens": 1000,
-                                "responseMimeType": "application/json"
-                            }
-                        }
-                    )
-                    if response.status_code == 429:
-                        await asyncio.sleep(5 * (attempt + 1))
-                        continue
-                        
-                    response.raise_for_status()
-                    result = response.json()
-                    text_content = result["candidates"][0]["content"]["parts"][0]["text"]
-                    content = extract_json(response.choices[0].message.content)  # or anthropic equivalent
-                    # Add this line to remove control characters
-                    content = content.replace('\r', '').replace('\t', ' ')
-
-                    aggregated_analysis = json.loads(content)
-                    break
-                except:
-                    if attempt == 2: # Fallback if summary fails
-                         aggregated_analysis = {}
-
-            return json.dumps({
-                "overall_score": overall_score * 10,
-                "index": aggregated_analysis.get("index", [])[:7],  # Limit to 7 items
-                "analysis": aggregated_analysis.get("analysis", ""),
-                "operational_projection": aggregated_analysis.get("operational_projection", ""),
-                "question_feedback": question_feedback
-            })
-            
+async def _deliver_late_result(engine: str, task: asyncio.Future, on_late_result: LateResultCallback):
+    try:
+        result = await task
+        await on_late_result(engine, result)
     except Exception as e:
-        print(f"Gemini critical error: {e}")
-        return json.dumps({"error": f"Gemini unavailable: {str(e)}"})
+        print(f"Late result for {engine} could not be stored: {e}")
 
 
-async def orchestrate_analysis(questions: List[Dict], answers: List[Dict], category: str, level: str) -> Dict:
-    """Orchestrate analysis across all 5 AI engines"""
+async def orchestrate_analysis(questions: List[Dict], answers: List[Dict], category: str, level: str,
+                               on_event: Optional[EventCallback] = None,
+                               on_late_result: Optional[LateResultCallback] = None,
+                               engines: Optional[List[str]] = None,
+                               resume_from: Optional[Dict[str, List[Dict]]] = None) -> Dict:
+    """
+    Orchestrate analysis across all 5 AI engines (or `engines`).
+
+    Each engine gets a deadline (ANALYSIS_ENGINE_DEADLINES, capped by
+    ANALYSIS_TOTAL_DEADLINE_SECONDS). An engine that misses it is returned
+    as an "incomplete" result with its partial question_feedback; it keeps
+    running and its final result is handed to `on_late_result` (or it is
+    cancelled when there is no callback). `resume_from` holds the partial
+    question_feedback of previously incomplete engines.
+    """
     
     # Create frozen session payload
     session_payload = {
@@ -993,36 +715,49 @@ async def orchestrate_analysis(questions: List[Dict], answers: List[Dict], categ
         }
     }
     
-    # Define role-specific prompts
-    role_prompts = {
-        "gpt4o": "You are a technical evaluator analyzing cognitive framing abilities. Analyze each question independently.RESPOND ENTIRELY IN FRENCH.",
-        "claude": "You are a pedagogical expert evaluating reasoning patterns. Analyze each question independently.RESPOND ENTIRELY IN FRENCH.",
-        "grok": "You are a critical thinking assessor evaluating decision-making. Analyze each question independently.RESPOND ENTIRELY IN FRENCH.",
-        "groq": "You are a cognitive skills evaluator analyzing analytical thinking. Analyze each question independently.RESPOND ENTIRELY IN FRENCH.",
-        # "gemini": "You are a strategic analyst evaluating problem-solving approaches. Analyze each question independently.",
-        "mistral": "You are an AI interaction specialist evaluating meta-cognitive awareness. Analyze each question independently.RESPOND ENTIRELY IN FRENCH."
+    # Run all engines in parallel - each one fans its questions out
+    # through the per-provider scheduler
+    engine_names = engines or list(ROLE_PROMPTS.keys())
+    resume_from = resume_from or {}
+    scored = {
+        name: {item["question_number"]: item for item in resume_from.get(name, [])}
+        for name in engine_names
     }
-    
-    # Run all analyses in parallel
-    results = await asyncio.gather(
-        analyze_with_openai(session_payload, role_prompts["gpt4o"]),
-        analyze_with_claude(session_payload, role_prompts["claude"]),
-        analyze_with_grok(session_payload, role_prompts["grok"]),
-        analyze_with_groq(session_payload, role_prompts["groq"]),
-        # analyze_with_gemini(session_payload, role_prompts["gemini"]),
-        analyze_with_mistral(session_payload, role_prompts["mistral"]),
-        return_exceptions=True
-    )
-    
+    tasks = {
+        name: asyncio.ensure_future(run_engine(name, session_payload, ROLE_PROMPTS[name], on_event, scored[name]))
+        for name in engine_names
+    }
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    results = {}
+    try:
+        # Tasks run concurrently, so waiting on them in deadline order
+        # takes no longer than the largest deadline
+        for name in sorted(engine_names, key=lambda n: engine_deadline(n) or float("inf")):
+            deadline = engine_deadline(name)
+            timeout = max(started + deadline - loop.time(), 0) if deadline else None
+            done, _ = await asyncio.wait({tasks[name]}, timeout=timeout)
+            if done:
+                results[name] = tasks[name].result()
+                continue
+
+            print(f"{ENGINES[name]['label']} ({name}) missed its {deadline:g}s deadline, "
+                  f"returning {len(scored[name])}/{len(questions)} questions")
+            results[name] = json.dumps(incomplete_result(session_payload, scored[name]))
+            if on_late_result:
+                late = asyncio.ensure_future(_deliver_late_result(name, tasks[name], on_late_result))
+                _late_engines.add(late)
+                late.add_done_callback(_late_engines.discard)
+            else:
+                tasks[name].cancel()
+    except BaseException:
+        for task in tasks.values():
+            task.cancel()
+        raise
+
     # Structure the output
     return {
         "session_id": session_payload["session_id"],
-        "analyses": {
-            "gpt4o": results[0],
-            "claude": results[1],
-            "grok": results[2],
-            'groq': results[3],
-            # "gemini": results[3],
-            "mistral": results[4]
-        }
-    }
\ No newline at end of file
+        "analyses": {name: results[name] for name in engine_names}
+    }
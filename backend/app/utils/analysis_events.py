@@ -0,0 +1,83 @@
+import asyncio
+import json
+from typing import Dict, List, Tuple
+
+
+# How long a finished test's events stay buffered for late subscribers
+CHANNEL_TTL_SECONDS = 120
+
+
+class _Channel:
+    def __init__(self):
+        self.history: List[Dict] = []
+        self.subscribers = set()
+        self.closed = False
+
+
+# In-process pub/sub of analysis events, keyed by test id. Events published
+# by a job running in this process reach /api/result/{id}/stream directly;
+# jobs run by a separate worker process are picked up by the stream's DB poll.
+_channels: Dict[int, _Channel] = {}
+
+
+def _get_channel(test_id: int) -> _Channel:
+    channel = _channels.get(test_id)
+    if channel is None:
+        channel = _channels[test_id] = _Channel()
+    return channel
+
+
+def publish(test_id: int, event: str, data: Dict):
+    """
+    Push an event to every subscriber of a test (and to its replay buffer).
+    "late" results of engines that outlived the job only go to a channel that
+    still exists: once a finished test's channel is dropped they are read
+    from the database, and a channel is never created again for them.
+    """
+    channel = _channels.get(test_id)
+    if channel is None:
+        if event == "late":
+            return
+        channel = _channels[test_id] = _Channel()
+    message = {"event": event, "data": data}
+    channel.history.append(message)
+    for queue in channel.subscribers:
+        queue.put_nowait(message)
+
+    if event == "done":
+        channel.closed = True
+        asyncio.get_running_loop().call_later(CHANNEL_TTL_SECONDS, _drop_channel, test_id, channel)
+
+
+def _drop_channel(test_id: int, channel: _Channel):
+    if _channels.get(test_id) is channel and not channel.subscribers:
+        del _channels[test_id]
+
+
+def is_buffered(test_id: int) -> bool:
+    """Whether this process still holds the test's events (its job ran here)"""
+    channel = _channels.get(test_id)
+    return channel is not None and bool(channel.history)
+
+
+def subscribe(test_id: int) -> Tuple[List[Dict], asyncio.Queue]:
+    """Returns (events published so far, queue receiving the next ones)"""
+    channel = _get_channel(test_id)
+    queue = asyncio.Queue()
+    channel.subscribers.add(queue)
+    return list(channel.history), queue
+
+
+def unsubscribe(test_id: int, queue: asyncio.Queue):
+    channel = _channels.get(test_id)
+    if channel is None:
+        return
+    channel.subscribers.discard(queue)
+    # Drop finished channels, and channels nobody published to (e.g. the job
+    # runs in another process)
+    if not channel.subscribers and (channel.closed or not channel.history):
+        _channels.pop(test_id, None)
+
+
+def format_sse(event: str, data: Dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
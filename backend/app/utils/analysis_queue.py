@@ -0,0 +1,496 @@
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import or_, and_
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import flag_modified
+from ..config import settings
+from ..database import SessionLocal
+from ..models.test import TestAttempt
+from ..models.analysis_job import AnalysisJob, JobStatus
+from ..models.scoring_batch import ScoringBatch, BatchStatus
+from .ai_orchestrator import orchestrate_analysis, ROLE_PROMPTS
+from .ai_analyzer import analyze_test_results
+from . import analysis_events
+from .test_summary import refresh_test_summary
+from .analysis_store import record_question, record_engine, record_analyses, reset_engines, engines_to_retry
+from .result_pdfs import schedule_prerender
+
+
+# Set whenever a job is enqueued so idle in-process workers pick it up
+# immediately. Workers in a separate process rely on polling instead.
+_wakeup = asyncio.Event()
+_workers: List[asyncio.Task] = []
+
+# Workers share the API's event loop: their blocking job, claim and result
+# writes run on these threads instead
+_db_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="analysis-db")
+
+
+async def in_db_thread(fn, *args):
+    return await asyncio.get_running_loop().run_in_executor(_db_executor, fn, *args)
+
+
+def initial_progress(kind: str, total_questions: int, engines: Optional[List[str]] = None) -> Dict:
+    if engines is None:
+        engines = list(ROLE_PROMPTS.keys()) if kind == "demo" else ["gpt4o"]
+    return {
+        engine: {"status": "queued", "completed": 0, "total": total_questions}
+        for engine in engines
+    }
+
+
+def summarize_progress(progress: Optional[Dict]) -> Dict:
+    """Overall question counts across engines for a job's progress map"""
+    progress = progress or {}
+    completed = sum(p.get("completed", 0) for p in progress.values())
+    total = sum(p.get("total", 0) for p in progress.values())
+    return {
+        "completed_questions": completed,
+        "total_questions": total,
+        "percent": round(100 * completed / total, 1) if total else 0,
+        "engines_done": sum(1 for p in progress.values() if p.get("status") in ("completed", "failed")),
+        "engines_total": len(progress),
+    }
+
+
+def create_job(db: Session, test: TestAttempt, kind: str, engines: Optional[List[str]] = None,
+               request_key: Optional[str] = None) -> AnalysisJob:
+    """Add a queued analysis job for a test. The caller commits, then calls notify_workers()"""
+    job = AnalysisJob(
+        test_id=test.id,
+        kind=kind,  # "demo", "test" or "resume" (finish incomplete engines)
+        request_key=request_key,
+        status=JobStatus.QUEUED,
+        progress=initial_progress(kind, len(test.questions or []), engines)
+    )
+    db.add(job)
+    return job
+
+
+def get_active_job(db: Session, test_id: int) -> Optional[AnalysisJob]:
+    return db.query(AnalysisJob).filter(
+        AnalysisJob.test_id == test_id,
+        AnalysisJob.status.in_([JobStatus.QUEUED, JobStatus.RUNNING])
+    ).order_by(AnalysisJob.id.desc()).first()
+
+
+def get_latest_job(db: Session, test_id: int) -> Optional[AnalysisJob]:
+    return db.query(AnalysisJob).filter(
+        AnalysisJob.test_id == test_id
+    ).order_by(AnalysisJob.id.desc()).first()
+
+
+def get_request_job(db: Session, test_id: int, request_key: str) -> Optional[AnalysisJob]:
+    """The job queued by an earlier request with the same Idempotency-Key, if any"""
+    return db.query(AnalysisJob).filter(
+        AnalysisJob.test_id == test_id,
+        AnalysisJob.request_key == request_key
+    ).first()
+
+
+def in_open_batch(db: Session, test_id: int) -> bool:
+    """Whether a submitted offline scoring batch (utils/batch_scoring.py) holds the test's claim"""
+    return any(
+        test_id in test_ids
+        for (test_ids,) in db.query(ScoringBatch.test_ids).filter(ScoringBatch.status == BatchStatus.SUBMITTED)
+    )
+
+
+def claim_analysis(db: Session, test: TestAttempt, kind: str, engines: Optional[List[str]] = None,
+                   request_key: Optional[str] = None) -> Tuple[Optional[AnalysisJob], bool]:
+    """
+    Queue an analysis job unless one is already in flight for the test.
+    The claim is a compare-and-set on test_attempts.analysis_claimed_at, so
+    of several concurrent submits exactly one creates the job and the others
+    get the in-flight job back. Returns (job, created); (None, False) when a
+    "demo"/"test" job is asked for a test that was completed meanwhile, or
+    when an offline scoring batch holds the claim.
+    The caller commits, then calls notify_workers() if created.
+    """
+    claim = db.query(TestAttempt).filter(TestAttempt.id == test.id)
+    if kind != "resume":
+        claim = claim.filter(TestAttempt.completed.is_(None))
+    now = datetime.utcnow()
+
+    claimed = claim.filter(TestAttempt.analysis_claimed_at.is_(None)).update(
+        {"analysis_claimed_at": now}, synchronize_session=False
+    )
+    if not claimed:
+        job = get_active_job(db, test.id)
+        if job or in_open_batch(db, test.id):
+            return job, False
+        # A claim without a live job (left by a crash or by hand) - take it
+        # over, still compare-and-set so only one request wins
+        held = db.query(TestAttempt.analysis_claimed_at).filter(TestAttempt.id == test.id).scalar()
+        claimed = held is not None and claim.filter(TestAttempt.analysis_claimed_at == held).update(
+            {"analysis_claimed_at": now}, synchronize_session=False
+        )
+        if not claimed:
+            job = get_active_job(db, test.id)
+            return job, False
+
+    return create_job(db, test, kind, engines=engines, request_key=request_key), True
+
+
+def release_claim(db: Session, test_id: int):
+    """Clear a test's analysis claim once its job has finished or failed"""
+    db.query(TestAttempt).filter(TestAttempt.id == test_id).update(
+        {"analysis_claimed_at": None}, synchronize_session=False
+    )
+
+
+def notify_workers():
+    _wakeup.set()
+
+
+def claim_next_job() -> Optional[int]:
+    """
+    Atomically claim the oldest queued job (or a running job whose worker
+    stopped heart-beating). Uses compare-and-set on the status so several
+    workers or processes can poll the same table safely.
+    """
+    db = SessionLocal()
+    try:
+        now = datetime.utcnow()
+        stale_before = now - timedelta(seconds=settings.ANALYSIS_JOB_STALE_SECONDS)
+
+        candidates = db.query(AnalysisJob.id, AnalysisJob.status).filter(
+            or_(
+                AnalysisJob.status == JobStatus.QUEUED,
+                and_(AnalysisJob.status == JobStatus.RUNNING, AnalysisJob.updated_at < stale_before)
+            )
+        ).order_by(AnalysisJob.created_at).limit(10).all()
+
+        for job_id, status in candidates:
+            query = db.query(AnalysisJob).filter(AnalysisJob.id == job_id, AnalysisJob.status == status)
+            if status == JobStatus.RUNNING:
+                query = query.filter(AnalysisJob.updated_at < stale_before)
+
+            claimed = query.update({
+                "status": JobStatus.RUNNING,
+                "started_at": now,
+                "updated_at": now,
+                "attempts": AnalysisJob.attempts + 1
+            }, synchronize_session=False)
+            db.commit()
+
+            if claimed:
+                return job_id
+        return None
+    finally:
+        db.close()
+
+
+def gpt4o_score(analysis: Dict) -> float:
+    """Test score = GPT-4o overall score, for backward compatibility (0 while incomplete)"""
+    gpt4o_analysis = analysis["analyses"].get("gpt4o")
+    if isinstance(gpt4o_analysis, str):
+        gpt4o_analysis = json.loads(gpt4o_analysis)
+    return (gpt4o_analysis or {}).get("overall_score", 0)
+
+
+def retryable_engines(db: Session, test: TestAttempt) -> Dict[str, List[Dict]]:
+    """Engines a resume job would finish, with the question feedback they keep"""
+    return engines_to_retry(db, test, engines=ROLE_PROMPTS.keys())
+
+
+def store_engine_result(test_id: int, engine: str, result: str):
+    """Merge one engine's result into a test's stored analysis (late or resumed engines)"""
+    db = SessionLocal()
+    try:
+        test = db.query(TestAttempt).filter(TestAttempt.id == test_id).with_for_update().first()
+        if not test:
+            return
+        analysis = json.loads(test.analysis) if test.analysis else {}
+        analysis.setdefault("analyses", {})[engine] = result
+        test.analysis = json.dumps(analysis)
+        record_engine(db, test_id, engine, json.loads(result))
+        if engine == "gpt4o":
+            test.score = gpt4o_score(analysis)
+        refresh_test_summary(db, test)
+
+        job = get_latest_job(db, test_id)
+        if job and job.progress and engine in job.progress:
+            job.progress[engine]["status"] = "failed" if "error" in json.loads(result) else "completed"
+            flag_modified(job, "progress")
+        db.commit()
+    finally:
+        db.close()
+
+
+def make_late_result_handler(test_id: int):
+    """orchestrate_analysis callback storing an engine that finished after its deadline"""
+    async def on_late_result(engine: str, result: str):
+        await in_db_thread(store_engine_result, test_id, engine, result)
+        analysis_events.publish(test_id, "late", {"engine": engine, "result": json.loads(result)})
+    return on_late_result
+
+
+async def _run_demo_analysis(test: TestAttempt, on_event) -> Tuple[Dict, float]:
+    """Multi-engine analysis for demo series, with GPT-4o-only fallback"""
+    try:
+        analysis = await orchestrate_analysis(
+            questions=test.questions,
+            answers=test.answers,
+            category="demo",
+            level="évaluation",
+            on_event=on_event,
+            on_late_result=make_late_result_handler(test.id)
+        )
+        return analysis, gpt4o_score(analysis)
+
+    except Exception as e:
+        print(f"Multi-AI analysis failed: {e}")
+
+        # Fallback to single AI (GPT-4o only) if multi-AI fails
+        fallback_analysis = await analyze_test_results(
+            questions=test.questions,
+            answers=test.answers,
+            category="demo",
+            level="évaluation"
+        )
+        return {
+            "analyses": {
+                "gpt4o": json.dumps(fallback_analysis),
+                "claude": json.dumps({"error": "Analysis timeout"}),
+                "mistral": json.dumps({"error": "Analysis timeout"})
+            }
+        }, fallback_analysis["overall_score"]
+
+
+async def _run_resume_analysis(in_session, test: TestAttempt, on_event) -> Tuple[Dict, float]:
+    """Finish incomplete or failed engines, rescoring only the questions they are missing.
+    in_session(fn, *args) runs fn(db, *args) on the job's session."""
+    resume_from = await in_session(retryable_engines, test)
+    resumed = {}
+    if resume_from:
+        resumed = (await orchestrate_analysis(
+            questions=test.questions,
+            answers=test.answers,
+            category="demo",
+            level="évaluation",
+            on_event=on_event,
+            on_late_result=make_late_result_handler(test.id),
+            engines=list(resume_from),
+            resume_from=resume_from
+        ))["analyses"]
+
+    # A late engine of the original run may have finished meanwhile - never
+    # replace a finished result with a partial one
+    await in_session(lambda db: db.refresh(test))
+    analysis = json.loads(test.analysis)
+    for engine, result in resumed.items():
+        current = analysis["analyses"].get(engine)
+        current = json.loads(current) if isinstance(current, str) else (current or {})
+        if json.loads(result).get("status") == "incomplete" and current and "error" not in current:
+            continue
+        analysis["analyses"][engine] = result
+    return analysis, gpt4o_score(analysis)
+
+
+async def _run_test_analysis(test: TestAttempt) -> Tuple[Dict, float]:
+    """Single-engine analysis for generated tests (/api/test/submit)"""
+    try:
+        analysis = await analyze_test_results(
+            questions=test.questions,
+            answers=test.answers,
+            category=test.category.value,
+            level=test.level.value
+        )
+        return analysis, analysis["overall_score"]
+    except Exception as e:
+        print(f"Analysis failed but answers are saved: {e}")
+        return {"error": "Analysis in progress"}, 0
+
+
+def _save_progress(db: Session, job: AnalysisJob, progress: Dict):
+    job.progress = progress
+    flag_modified(job, "progress")  # nested dict mutated in place
+    db.commit()
+
+
+def _start_job(db: Session, job_id: int) -> Tuple[Optional[AnalysisJob], Dict]:
+    """Load a claimed job and mark its engines running. Returns (job, progress)"""
+    job = db.query(AnalysisJob).filter(AnalysisJob.id == job_id).first()
+    if not job:
+        return None, {}
+    test = job.test
+
+    progress = job.progress or initial_progress(job.kind, len(test.questions or []))
+    for entry in progress.values():
+        entry.update(status="running", completed=0)
+    if job.kind == "demo":
+        reset_engines(db, test.id, progress.keys())
+    elif job.kind == "resume":
+        for engine, question_feedback in retryable_engines(db, test).items():
+            if engine in progress:
+                progress[engine]["completed"] = len(question_feedback)
+    _save_progress(db, job, progress)
+    return job, progress
+
+
+def _finish_job(db: Session, job: AnalysisJob, progress: Dict, analysis: Dict, score: float):
+    """Store a job's results on its test and release the test's claim"""
+    test = job.test
+    # Engines past their deadline keep running and fill in later
+    for engine, entry in progress.items():
+        if entry["status"] == "running":
+            entry["status"] = "incomplete"
+
+    test.score = score
+    test.analysis = json.dumps(analysis)
+    test.completed = datetime.utcnow()
+    if job.kind in ("demo", "resume"):
+        record_analyses(db, test.id, analysis["analyses"])
+    refresh_test_summary(db, test)
+
+    job.status = JobStatus.COMPLETED
+    job.finished_at = datetime.utcnow()
+    release_claim(db, test.id)
+    _save_progress(db, job, progress)
+
+
+def _requeue_job(db: Session, job_id: int):
+    db.rollback()
+    db.query(AnalysisJob).filter(AnalysisJob.id == job_id).update(
+        {"status": JobStatus.QUEUED}, synchronize_session=False
+    )
+    db.commit()
+
+
+def _fail_job(db: Session, job_id: int, error: str) -> Optional[int]:
+    """Mark a job failed and release its test's claim. Returns the test id"""
+    db.rollback()
+    test_id = db.query(AnalysisJob.test_id).filter(AnalysisJob.id == job_id).scalar()
+    db.query(AnalysisJob).filter(AnalysisJob.id == job_id).update({
+        "status": JobStatus.FAILED,
+        "error": error,
+        "finished_at": datetime.utcnow()
+    }, synchronize_session=False)
+    if test_id is not None:
+        release_claim(db, test_id)
+    db.commit()
+    return test_id
+
+
+async def run_job(job_id: int):
+    """
+    Run one claimed job to completion and store the results on its test.
+    The job's session is only used on the DB threads, one step at a time:
+    engine events arrive concurrently.
+    """
+    # Loaded attributes stay readable on the event loop after each commit
+    db = SessionLocal(expire_on_commit=False)
+    session_lock = asyncio.Lock()
+
+    async def in_session(fn, *args):
+        async with session_lock:
+            return await in_db_thread(fn, db, *args)
+
+    try:
+        job, progress = await in_session(_start_job, job_id)
+        if not job:
+            return
+        test = job.test
+        last_write = 0.0
+        finished = False
+
+        def record_event(db: Session, engine: str, event: str, data: Dict):
+            nonlocal last_write
+            if finished:
+                return  # late engine - stored by make_late_result_handler
+
+            entry = progress.setdefault(engine, {"status": "running", "completed": 0, "total": len(test.questions)})
+            if event == "question":
+                entry["completed"] += 1
+                record_question(db, test.id, engine, data)
+            elif event == "engine":
+                entry["status"] = "failed" if "error" in data else "completed"
+                record_engine(db, test.id, engine, data)
+
+            # Throttle writes - per-question events can arrive in bursts
+            if event == "engine" or time.monotonic() - last_write >= 1.0:
+                _save_progress(db, job, progress)
+                last_write = time.monotonic()
+
+        async def on_event(engine: str, event: str, data: Dict):
+            analysis_events.publish(test.id, event, {"engine": engine, "result": data})
+            if not finished:
+                await in_session(record_event, engine, event, data)
+
+        if job.kind == "demo":
+            analysis, score = await _run_demo_analysis(test, on_event)
+        elif job.kind == "resume":
+            analysis, score = await _run_resume_analysis(in_session, test, on_event)
+        else:
+            analysis, score = await _run_test_analysis(test)
+
+        def finish(db: Session):
+            nonlocal finished
+            _finish_job(db, job, progress, analysis, score)
+            finished = True
+
+        await in_session(finish)
+        # Engines past their deadline report later as "late" events
+        late_engines = [engine for engine, entry in progress.items() if entry["status"] == "incomplete"]
+        analysis_events.publish(test.id, "done", {
+            "test_id": test.id, "status": "completed", "score": score, "pending_engines": late_engines
+        })
+        schedule_prerender(test.id)
+
+    except asyncio.CancelledError:
+        # Shutting down - put the job back so another worker picks it up
+        await in_session(_requeue_job, job_id)
+        raise
+
+    except Exception as e:
+        print(f"Analysis job {job_id} failed: {e}")
+        test_id = await in_session(_fail_job, job_id, str(e))
+        if test_id is not None:
+            analysis_events.publish(test_id, "done", {"test_id": test_id, "status": "failed", "error": str(e)})
+
+    finally:
+        await in_db_thread(db.close)
+
+
+async def _worker_loop():
+    while True:
+        try:
+            job_id = await in_db_thread(claim_next_job)
+        except Exception as e:
+            print(f"Analysis worker could not claim a job: {e}")
+            job_id = None
+
+        if job_id is None:
+            try:
+                await asyncio.wait_for(_wakeup.wait(), timeout=settings.ANALYSIS_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            _wakeup.clear()
+            continue
+
+        await run_job(job_id)
+
+
+def start_workers(count: Optional[int] = None):
+    """Start in-process analysis workers on the running event loop"""
+    count = settings.ANALYSIS_WORKERS if count is None else count
+    for _ in range(count):
+        _workers.append(asyncio.create_task(_worker_loop()))
+
+
+async def stop_workers():
+    for task in _workers:
+        task.cancel()
+    await asyncio.gather(*_workers, return_exceptions=True)
+    _workers.clear()
+
+
+async def run_workers(count: int):
+    """Entry point for a dedicated worker process (see analysis_worker.py)"""
+    start_workers(count)
+    await asyncio.gather(*_workers)
@@ -0,0 +1,228 @@
+import json
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy.orm import Session
+from ..models.test import TestAttempt
+from ..models.engine_result import EngineResult, QuestionScore
+
+
+# Normalized analysis storage: one engine_results row per (test, engine) and
+# one question_scores row per (test, engine, question), written as results
+# arrive. test.analysis keeps the legacy JSON blob, which is still read for
+# tests analysed before these tables existed.
+
+
+def parse_analyses(analysis_text: str) -> dict:
+    """Parse the stored analysis blob into {engine: analysis dict}"""
+    analysis_data = json.loads(analysis_text)
+    
+    # Handle backward compatibility - old tests don't have "analyses" key
+    if "analyses" in analysis_data:
+        # New multi-AI format
+        parsed_analyses = {}
+        for engine, analysis_str in analysis_data["analyses"].items():
+            try:
+                parsed_analyses[engine] = json.loads(analysis_str) if isinstance(analysis_str, str) else analysis_str
+            except:
+                parsed_analyses[engine] = {"error": "Failed to parse analysis"}
+    else:
+        # Old single-AI format - treat as GPT-4o only
+        parsed_analyses = {
+            "gpt4o": analysis_data,
+            "claude": {"error": "Not available for this test"},
+            # "grok": {"error": "Not available for this test"},
+            "mistral": {"error": "Not available for this test"}
+        }
+    
+    return parsed_analyses
+
+
+def _question_rows(db: Session, test_id: int, engine: str) -> Dict[int, QuestionScore]:
+    db.flush()  # SessionLocal doesn't autoflush - include rows added since the last commit
+    rows = db.query(QuestionScore).filter(QuestionScore.test_id == test_id, QuestionScore.engine == engine)
+    return {row.question_id: row for row in rows}
+
+
+def _apply_question(row: QuestionScore, item: Dict):
+    row.score = item.get("score")
+    row.feedback = item.get("feedback")
+    row.error = item.get("error")
+
+
+def record_question(db: Session, test_id: int, engine: str, item: Dict):
+    """Upsert one question score (the caller commits)"""
+    question_id = item["question_number"]
+    db.flush()
+    row = db.query(QuestionScore).filter(
+        QuestionScore.test_id == test_id,
+        QuestionScore.engine == engine,
+        QuestionScore.question_id == question_id
+    ).first()
+    if row is None:
+        row = QuestionScore(test_id=test_id, engine=engine, question_id=question_id)
+        db.add(row)
+    _apply_question(row, item)
+
+
+def record_engine(db: Session, test_id: int, engine: str, result: Dict):
+    """Upsert an engine's session-level result and its question_feedback (the caller commits)"""
+    db.flush()
+    row = db.query(EngineResult).filter(EngineResult.test_id == test_id, EngineResult.engine == engine).first()
+    if row is None:
+        row = EngineResult(test_id=test_id, engine=engine)
+        db.add(row)
+
+    if result.get("status") == "incomplete":
+        if row.status == "completed":
+            return  # a finished result is never replaced by a partial one
+        row.status = "incomplete"
+        row.total_questions = result.get("total_questions")
+    elif "error" in result:
+        row.status = "failed"
+    else:
+        row.status = "completed"
+    row.error = result.get("error")
+    row.overall_score = result.get("overall_score")
+    row.index = result.get("index")
+    row.analysis = result.get("analysis")
+    row.operational_projection = result.get("operational_projection")
+
+    existing = _question_rows(db, test_id, engine)
+    for item in result.get("question_feedback", []):
+        question = existing.get(item.get("question_number"))
+        if question is None:
+            question = QuestionScore(test_id=test_id, engine=engine, question_id=item["question_number"])
+            db.add(question)
+        _apply_question(question, item)
+
+
+def record_analyses(db: Session, test_id: int, analyses: Dict):
+    """Upsert every engine of an orchestrate_analysis-style {engine: JSON result} map"""
+    for engine, result in analyses.items():
+        record_engine(db, test_id, engine, json.loads(result) if isinstance(result, str) else result)
+
+
+def reset_engines(db: Session, test_id: int, engines: Iterable[str]):
+    """Start a fresh analysis: mark engines running and drop their previous results (the caller commits)"""
+    engines = list(engines)
+    db.query(QuestionScore).filter(
+        QuestionScore.test_id == test_id, QuestionScore.engine.in_(engines)
+    ).delete(synchronize_session=False)
+    db.query(EngineResult).filter(
+        EngineResult.test_id == test_id, EngineResult.engine.in_(engines)
+    ).delete(synchronize_session=False)
+    for engine in engines:
+        db.add(EngineResult(test_id=test_id, engine=engine, status="running"))
+
+
+def _question_item(row: QuestionScore) -> Dict:
+    item = {"question_number": row.question_id, "score": row.score, "feedback": row.feedback}
+    if row.error:
+        item["error"] = row.error
+    return item
+
+
+def _engine_dict(row: EngineResult, questions: List[Dict]) -> Dict:
+    if row.status == "failed":
+        return {"error": row.error}
+    if row.status in ("incomplete", "running"):
+        total = row.total_questions or len(questions)
+        return {
+            "status": "incomplete",
+            "error": f"Analysis incomplete ({len(questions)}/{total} questions)",
+            "completed_questions": len(questions),
+            "total_questions": total,
+            "question_feedback": questions
+        }
+    return {
+        "overall_score": row.overall_score,
+        "index": row.index or [],
+        "analysis": row.analysis or "",
+        "operational_projection": row.operational_projection or "",
+        "question_feedback": questions
+    }
+
+
+def load_analyses(db: Session, test: TestAttempt, engines: Optional[List[str]] = None,
+                  include_questions: bool = True) -> Dict[str, Dict]:
+    """
+    {engine: analysis dict} for a test, in the same shape as the legacy blob.
+    Only the requested engines (and question rows, if needed) are loaded.
+    """
+    query = db.query(EngineResult).filter(EngineResult.test_id == test.id)
+    if engines:
+        query = query.filter(EngineResult.engine.in_(engines))
+    rows = query.order_by(EngineResult.id).all()
+
+    if not rows:
+        if not test.analysis:
+            return {}
+        parsed = parse_analyses(test.analysis)
+        return {engine: data for engine, data in parsed.items() if not engines or engine in engines}
+
+    questions: Dict[str, List[Dict]] = {row.engine: [] for row in rows}
+    if include_questions:
+        order = {q["question_id"]: i for i, q in enumerate(test.questions or [])}
+        for question in db.query(QuestionScore).filter(
+            QuestionScore.test_id == test.id, QuestionScore.engine.in_(list(questions))
+        ):
+            questions[question.engine].append(_question_item(question))
+        for items in questions.values():
+            items.sort(key=lambda item: order.get(item["question_number"], item["question_number"]))
+
+    return {row.engine: _engine_dict(row, questions[row.engine]) for row in rows}
+
+
+def load_engine_analyses(db: Session, test_ids: List[int], engine: str) -> Dict[int, Dict]:
+    """
+    {test_id: analysis dict} of one engine for many tests, without question
+    feedback. One query for the normalized rows, one more for tests only
+    stored in the legacy blob.
+    """
+    rows = db.query(EngineResult).filter(EngineResult.engine == engine, EngineResult.test_id.in_(test_ids))
+    analyses = {row.test_id: _engine_dict(row, []) for row in rows}
+
+    legacy = [test_id for test_id in test_ids if test_id not in analyses]
+    if legacy:
+        for test_id, analysis_text in db.query(TestAttempt.id, TestAttempt.analysis).filter(
+            TestAttempt.id.in_(legacy), TestAttempt.analysis.isnot(None)
+        ):
+            analyses[test_id] = parse_analyses(analysis_text).get(engine, {})
+    return analyses
+
+
+def engines_to_retry(db: Session, test: TestAttempt, engines: Optional[Iterable[str]] = None) -> Dict[str, List[Dict]]:
+    """
+    {engine: question_feedback already scored} for every engine that is
+    incomplete, failed or has failed questions. Retrying passes these items
+    to orchestrate_analysis(resume_from=...) so only the rest is redone.
+    """
+    query = db.query(EngineResult).filter(EngineResult.test_id == test.id)
+    if engines is not None:
+        query = query.filter(EngineResult.engine.in_(list(engines)))
+    rows = query.all()
+
+    if not rows and test.analysis:
+        # Legacy blob - only incomplete engines can be resumed
+        try:
+            analyses = json.loads(test.analysis).get("analyses", {})
+        except ValueError:
+            return {}
+        retry = {}
+        for engine, result in analyses.items():
+            result = json.loads(result) if isinstance(result, str) else result
+            if result.get("status") == "incomplete" and (engines is None or engine in engines):
+                retry[engine] = [item for item in result.get("question_feedback", []) if "error" not in item]
+        return retry
+
+    failed_questions = {
+        engine for (engine,) in db.query(QuestionScore.engine).filter(
+            QuestionScore.test_id == test.id, QuestionScore.error.isnot(None)
+        ).distinct()
+    }
+    retry = {}
+    for row in rows:
+        if row.status in ("running", "incomplete", "failed") or row.engine in failed_questions:
+            retry[row.engine] = [
+                _question_item(q) for q in _question_rows(db, test.id, row.engine).values() if not q.error
+            ]
+    return retry
@@ -0,0 +1,270 @@
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from ..config import settings
+from ..models.engine_result import QuestionScore
+from ..models.test_summary import TestSummary
+from .ai_orchestrator import ENGINES
+
+
+# INDX scores are question averages (0-100) scaled by 10
+SCORE_RANGE = (0.0, 1000.0)
+QUESTION_SCORE_MAX = 100.0
+PERCENTILES = (10, 25, 50, 75, 90)
+
+
+class Cohort:
+    """
+    Completed attempts matching a filter, held as columnar arrays:
+    test_ids (N,), indx (N,) and engine_scores (N, E) with NaN where an
+    engine produced no score. Derived statistics are memoized on the object.
+    """
+
+    def __init__(self, test_ids: np.ndarray, indx: np.ndarray, engines: List[str], engine_scores: np.ndarray):
+        self.test_ids = test_ids
+        self.indx = indx
+        self.engines = engines
+        self.engine_scores = engine_scores
+        self.sorted_indx = np.sort(indx[~np.isnan(indx)])
+        self.stats: Optional[Dict] = None
+        self.questions: Optional[List[Dict]] = None
+
+
+def cohort_filters(series: Optional[str] = None, category=None, level=None, date_from=None, date_to=None) -> list:
+    filters = [TestSummary.status == "completed"]
+    if series:
+        filters.append(TestSummary.test_name == series)
+    if category:
+        filters.append(TestSummary.category == category)
+    if level:
+        filters.append(TestSummary.level == level)
+    if date_from:
+        filters.append(TestSummary.created_at >= date_from)
+    if date_to:
+        filters.append(TestSummary.created_at < date_to)
+    return filters
+
+
+def load_cohort(db: Session, filters: list) -> Cohort:
+    """
+    Fetch the cohort's scores from test_summaries into NumPy arrays. Engine
+    scores are pulled out of the JSON column by the database, one float
+    column per engine, so no JSON is decoded in Python.
+    """
+    engines = list(ENGINES)
+    rows = db.query(
+        TestSummary.test_id,
+        TestSummary.score,
+        *[TestSummary.engine_scores[engine].as_float() for engine in engines]
+    ).filter(*filters).all()
+
+    columns = list(zip(*rows)) or [()] * (len(engines) + 2)
+    test_ids = np.array(columns[0], dtype=np.int64)
+    indx = np.array(columns[1], dtype=np.float64)  # None -> NaN
+    engine_scores = np.array(columns[2:], dtype=np.float64).T.reshape(len(rows), len(engines))
+
+    # Drop engines that never scored anything in this cohort
+    scored = ~np.all(np.isnan(engine_scores), axis=0)
+    return Cohort(test_ids, indx, [e for e, keep in zip(engines, scored) if keep], engine_scores[:, scored])
+
+
+def distribution(values: np.ndarray) -> Dict:
+    """Summary statistics and a fixed-range histogram of non-missing values"""
+    values = values[~np.isnan(values)]
+    counts, edges = np.histogram(values, bins=settings.ANALYTICS_HISTOGRAM_BINS, range=SCORE_RANGE)
+    if not len(values):
+        return {"count": 0, "histogram": {"edges": edges.tolist(), "counts": counts.tolist()}}
+    quantiles = np.percentile(values, PERCENTILES)
+    return {
+        "count": int(len(values)),
+        "mean": float(values.mean()),
+        "std": float(values.std(ddof=1)) if len(values) > 1 else 0.0,
+        "min": float(values.min()),
+        "max": float(values.max()),
+        "percentiles": {f"p{p}": float(q) for p, q in zip(PERCENTILES, quantiles)},
+        "histogram": {"edges": edges.tolist(), "counts": counts.tolist()}
+    }
+
+
+def pairwise_correlation(scores: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Pearson correlation between engine columns over pairwise-complete rows"""
+    present = ~np.isnan(scores)
+    filled = np.where(present, scores, 0.0)
+    both = present.T.astype(np.float64) @ present.astype(np.float64)  # (E, E) pair counts
+
+    # Per-pair sums restricted to rows where both engines scored
+    sum_x = filled.T @ present          # sum of x over rows where y is present
+    sum_xx = (filled ** 2).T @ present
+    sum_xy = filled.T @ filled
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cov = sum_xy - sum_x * sum_x.T / both
+        var_x = sum_xx - sum_x ** 2 / both
+        corr = cov / np.sqrt(var_x * var_x.T)
+    corr[both < 3] = np.nan
+    return corr, both.astype(np.int64)
+
+
+def krippendorff_alpha(scores: np.ndarray) -> Optional[float]:
+    """
+    Krippendorff's alpha, interval metric, treating engines as coders and
+    tests as units. Missing scores are allowed; units with fewer than two
+    scores are not pairable and are ignored.
+    """
+    present = ~np.isnan(scores)
+    m = present.sum(axis=1)
+    pairable = m >= 2
+    if not pairable.any():
+        return None
+    scores, present, m = scores[pairable], present[pairable], m[pairable]
+    values = scores[present]
+    n = len(values)
+
+    unit_means = np.nansum(scores, axis=1) / m
+    unit_ss = np.nansum((scores - unit_means[:, None]) ** 2, axis=1)
+    # sum over ordered pairs (vi - vj)^2 within a unit = 2 * m * SS_unit
+    observed = np.sum(2 * m * unit_ss / (m - 1)) / n
+    expected = 2 * np.sum((values - values.mean()) ** 2) / (n - 1)
+    if expected == 0:
+        return None
+    return float(1 - observed / expected)
+
+
+def agreement(cohort: Cohort) -> Dict:
+    engines, scores = cohort.engines, cohort.engine_scores
+    corr, pairs = pairwise_correlation(scores)
+    consensus = np.nanmean(scores, axis=1) if len(engines) else np.empty(0)
+    with np.errstate(invalid="ignore"):
+        bias = np.nanmean(scores - consensus[:, None], axis=0) if len(scores) else np.full(len(engines), np.nan)
+
+    def clean(value):
+        return None if np.isnan(value) else float(value)
+
+    return {
+        "engines": engines,
+        "krippendorff_alpha": krippendorff_alpha(scores),
+        "correlation": {a: {b: clean(corr[i, j]) for j, b in enumerate(engines)} for i, a in enumerate(engines)},
+        "pair_counts": {a: {b: int(pairs[i, j]) for j, b in enumerate(engines)} for i, a in enumerate(engines)},
+        "bias_vs_consensus": {engine: clean(bias[i]) for i, engine in enumerate(engines)}
+    }
+
+
+def cohort_stats(cohort: Cohort) -> Dict:
+    if cohort.stats is None:
+        cohort.stats = {
+            "attempts": int(len(cohort.test_ids)),
+            "indx": distribution(cohort.indx),
+            "engines": {engine: distribution(cohort.engine_scores[:, i]) for i, engine in enumerate(cohort.engines)},
+            "agreement": agreement(cohort)
+        }
+    return cohort.stats
+
+
+def question_difficulty(db: Session, filters: list) -> List[Dict]:
+    """
+    Per-question difficulty for a single series. Aggregation runs in the
+    database (one row per question and engine); NumPy combines engines.
+    Placeholder scores from failed engine calls are excluded.
+    """
+    rows = db.query(
+        QuestionScore.question_id,
+        QuestionScore.engine,
+        func.count(QuestionScore.score),
+        func.avg(QuestionScore.score),
+        func.avg(QuestionScore.score * QuestionScore.score)
+    ).join(
+        TestSummary, TestSummary.test_id == QuestionScore.test_id
+    ).filter(
+        *filters,
+        QuestionScore.error.is_(None),
+        QuestionScore.score.isnot(None)
+    ).group_by(QuestionScore.question_id, QuestionScore.engine).all()
+    if not rows:
+        return []
+
+    questions = sorted({row[0] for row in rows})
+    engines = sorted({row[1] for row in rows})
+    q_index = {q: i for i, q in enumerate(questions)}
+    e_index = {e: i for i, e in enumerate(engines)}
+    count = np.zeros((len(questions), len(engines)))
+    mean = np.full((len(questions), len(engines)), np.nan)
+    mean_sq = np.full((len(questions), len(engines)), np.nan)
+    for question_id, engine, n, avg, avg_sq in rows:
+        i, j = q_index[question_id], e_index[engine]
+        count[i, j], mean[i, j], mean_sq[i, j] = n, avg, avg_sq
+
+    total = count.sum(axis=1)
+    pooled_mean = np.nansum(mean * count, axis=1) / total
+    pooled_var = np.nansum(mean_sq * count, axis=1) / total - pooled_mean ** 2
+    spread = np.nanstd(mean, axis=1)  # how much engines disagree on the question
+
+    order = np.argsort(pooled_mean)  # hardest first
+    return [
+        {
+            "question_id": questions[i],
+            "responses": int(total[i] / max(np.count_nonzero(count[i]), 1)),
+            "mean_score": float(pooled_mean[i]),
+            "std": float(np.sqrt(max(pooled_var[i], 0.0))),
+            "difficulty": float(1 - pooled_mean[i] / QUESTION_SCORE_MAX),
+            "engine_spread": float(spread[i]),
+            "engine_means": {engine: (None if np.isnan(mean[i, j]) else float(mean[i, j])) for j, engine in enumerate(engines)}
+        }
+        for i in order
+    ]
+
+
+def percentile_rank(cohort: Cohort, score: float) -> Optional[float]:
+    """Share of the cohort scoring below `score` (ties count half), 0-100"""
+    n = len(cohort.sorted_indx)
+    if not n:
+        return None
+    below = np.searchsorted(cohort.sorted_indx, score, side="left")
+    at_or_below = np.searchsorted(cohort.sorted_indx, score, side="right")
+    return float(100.0 * (below + 0.5 * (at_or_below - below)) / n)
+
+
+class AnalyticsCache:
+    """
+    Per-process LRU of loaded cohorts keyed by filter. Every entry is tagged
+    with the test_summaries version (row count + last update) it was built
+    from; any submission or new result changes the version and invalidates
+    all entries, including when it was written by another process.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, Tuple[tuple, Cohort]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def version(self, db: Session) -> tuple:
+        return tuple(db.query(func.count(TestSummary.test_id), func.max(TestSummary.updated_at)).one())
+
+    def cohort(self, db: Session, key: tuple, filters: list) -> Cohort:
+        version = self.version(db)
+        entry = self._entries.get(key)
+        if entry and entry[0] == version:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        started = time.perf_counter()
+        cohort = load_cohort(db, filters)
+        print(f"Analytics cohort {key} loaded: {len(cohort.test_ids)} attempts in {time.perf_counter() - started:.3f}s")
+        self._entries[key] = (version, cohort)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return cohort
+
+    def invalidate(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+analytics_cache = AnalyticsCache(settings.ANALYTICS_CACHE_MAX_ENTRIES)
@@ -0,0 +1,126 @@
+import os
+import re
+import tempfile
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Optional
+from ..config import settings
+
+
+class ArtifactKey:
+    """A rendered file of a test. content_hash covers every input of the
+    render, so a key's content never changes and new inputs get a new key."""
+
+    def __init__(self, test_id: int, kind: str, model_name: Optional[str], content_hash: str, extension: str = "pdf"):
+        self.test_id = test_id
+        self.kind = kind  # certificate, qa, qaa
+        self.model_name = model_name or "-"
+        if not re.fullmatch(r"[\w.-]+", self.model_name):  # part of a file name
+            raise ValueError(f"Invalid artifact model name: {model_name!r}")
+        self.content_hash = content_hash
+        self.extension = extension
+
+    @property
+    def prefix(self) -> str:
+        """Shared by every version of this artifact"""
+        return f"{self.kind}-{self.model_name}-"
+
+    @property
+    def name(self) -> str:
+        return f"{self.prefix}{self.content_hash}.{self.extension}"
+
+
+class StoredArtifact:
+    """An artifact on disk, ready to be served"""
+
+    def __init__(self, key: ArtifactKey, path: Path, size: int, mtime_ns: int):
+        self.key = key
+        self.path = path
+        self.size = size
+        # Strong ETag; a rewrite of the same key (a concurrent render) gets a new one
+        self.etag = f'"{key.content_hash[:24]}-{mtime_ns:x}-{size:x}"'
+
+
+class ArtifactStore(ABC):
+    """Base artifact backend with hit/miss accounting. Writes must be atomic:
+    a reader sees the previous file or the complete new one, never a partial one."""
+    backend = "none"
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    @abstractmethod
+    def _get(self, key: ArtifactKey) -> Optional[StoredArtifact]:
+        ...
+
+    @abstractmethod
+    def _put(self, key: ArtifactKey, content: bytes) -> StoredArtifact:
+        ...
+
+    def get(self, key: ArtifactKey) -> Optional[StoredArtifact]:
+        artifact = self._get(key)
+        if artifact is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return artifact
+
+    def put(self, key: ArtifactKey, content: bytes) -> StoredArtifact:
+        artifact = self._put(key, content)
+        self.writes += 1
+        return artifact
+
+    def stats(self) -> Dict:
+        return {"backend": self.backend, "hits": self.hits, "misses": self.misses, "writes": self.writes}
+
+
+class LocalArtifactStore(ArtifactStore):
+    """Artifacts on local disk: <root>/<test_id>/<kind>-<model>-<hash>.<ext>"""
+    backend = "local"
+
+    def __init__(self, root: str):
+        super().__init__()
+        self.root = Path(root)
+
+    def _path(self, key: ArtifactKey) -> Path:
+        return self.root / str(key.test_id) / key.name
+
+    def _stat(self, key: ArtifactKey, path: Path) -> Optional[StoredArtifact]:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        return StoredArtifact(key, path, stat.st_size, stat.st_mtime_ns)
+
+    def _get(self, key: ArtifactKey) -> Optional[StoredArtifact]:
+        return self._stat(key, self._path(key))
+
+    def _put(self, key: ArtifactKey, content: bytes) -> StoredArtifact:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+        # Older versions (rendered from inputs that have changed since) are never served again
+        for stale in path.parent.glob(f"{key.prefix}*.{key.extension}"):
+            if stale != path:
+                stale.unlink(missing_ok=True)
+        return self._stat(key, path)
+
+
+def _build_store() -> ArtifactStore:
+    backend = settings.ARTIFACT_BACKEND
+    if backend == "local":
+        return LocalArtifactStore(settings.ARTIFACT_DIR)
+    raise ValueError(f"Unknown ARTIFACT_BACKEND: {backend}")
+
+
+artifact_store = _build_store()
@@ -1,23 +1,59 @@
+import asyncio
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Dict, Optional, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from ..config import settings
 from ..database import get_db
 from ..models.user import User
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/login")
 
+# bcrypt releases the GIL, so a small thread pool hashes in parallel without
+# blocking the event loop; the bound keeps a burst of logins from taking every core
+_hash_executor = ThreadPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
+
+# Stored instead of a hash for accounts that never log in with a password
+# (guests); no bcrypt output starts with "!", so nothing can verify against it
+UNUSABLE_PASSWORD_PREFIX = "!"
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
+    if not hashed_password or hashed_password.startswith(UNUSABLE_PASSWORD_PREFIX):
+        return False
     return pwd_context.verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
+def make_unusable_password() -> str:
+    return UNUSABLE_PASSWORD_PREFIX
+
+async def hash_password(password: str) -> str:
+    """get_password_hash on the bounded hashing pool"""
+    return await asyncio.get_running_loop().run_in_executor(_hash_executor, get_password_hash, password)
+
+def _verify_and_update(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    if not hashed_password or hashed_password.startswith(UNUSABLE_PASSWORD_PREFIX):
+        return False, None
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+async def check_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify on the bounded hashing pool. Returns (valid, new_hash); new_hash is
+    set when the stored hash used a different work factor and should be replaced.
+    """
+    return await asyncio.get_running_loop().run_in_executor(
+        _hash_executor, _verify_and_update, plain_password, hashed_password
+    )
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -28,7 +64,50 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+class UserCache:
+    """
+    Short-TTL, per-process cache of user rows keyed by token subject (email),
+    so authenticating a request doesn't cost a query. Callers get a fresh,
+    session-less User each time; load the user in your own session before
+    modifying it, and invalidate the entry afterwards.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()  # email -> (expires_at, column values)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, email: str) -> Optional[User]:
+        entry = self._entries.get(email)
+        if entry is None or entry[0] < time.monotonic():
+            self._entries.pop(email, None)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(email)
+        self.hits += 1
+        return User(**entry[1])
+
+    def set(self, user: User):
+        if self.ttl_seconds <= 0:
+            return
+        values = {column.key: getattr(user, column.key) for column in User.__table__.columns}
+        self._entries[user.email] = (time.monotonic() + self.ttl_seconds, values)
+        self._entries.move_to_end(user.email)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, email: str):
+        self._entries.pop(email, None)
+
+    def stats(self) -> Dict:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+user_cache = UserCache(settings.AUTH_USER_CACHE_MAX_ENTRIES, settings.AUTH_USER_CACHE_TTL_SECONDS)
+
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -42,9 +121,12 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
     except JWTError:
         raise credentials_exception
     
-    user = db.query(User).filter(User.email == email).first()
+    user = user_cache.get(email)
     if user is None:
-        raise credentials_exception
+        user = await db.scalar(select(User).where(User.email == email))
+        if user is None:
+            raise credentials_exception
+        user_cache.set(user)
     return user
 
 
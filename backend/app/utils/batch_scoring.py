@@ -0,0 +1,336 @@
+import json
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import Text, cast, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from ..config import settings
+from ..models.test import TestAttempt, load_questions
+from ..models.series import SeriesVersionMissing
+from ..models.scoring_batch import ScoringBatch, BatchStatus
+from .llm_clients import openai_batch_client
+from .analysis_queue import release_claim
+from .analysis_store import record_engine
+from .test_summary import refresh_test_summary
+from .result_pdfs import schedule_prerender
+from .ai_orchestrator import (
+    ENGINES, ROLE_PROMPTS, find_answer, build_question_prompt, build_aggregate_prompt,
+    build_messages, parse_question_feedback, parse_aggregate
+)
+
+
+# Offline scoring through the OpenAI Batch API: the same prompts as the
+# interactive GPT-4o engine (analyze_with_openai), submitted as JSONL files
+# and graded asynchronously at batch pricing, outside the interactive
+# rate limits. Driven by /api/batch or batch_scoring.py.
+ENGINE = "gpt4o"
+BATCH_ENDPOINT = "/v1/chat/completions"
+PROVIDER_PENDING = ("validating", "in_progress", "finalizing", "cancelling")
+
+
+def collect_pending_tests(db: Session, test_ids: Optional[List[int]] = None, limit: Optional[int] = None) -> List[TestAttempt]:
+    """
+    Claim submitted tests to grade offline and return them. Explicit test_ids
+    are re-analysed even if they already have results; otherwise every
+    submitted test without an analysis. Tests take the realtime path's claim
+    (analysis_queue.claim_analysis), so tests with a queued or running job or
+    already in an open batch are skipped, and the claim is held until the
+    batch's results are written back.
+    """
+    pending = select(TestAttempt.id).where(
+        TestAttempt.analysis_claimed_at.is_(None),
+        # Start routes store answers=[]; submit replaces them
+        cast(TestAttempt.answers, Text) != "[]",
+        or_(TestAttempt.series_id.isnot(None), cast(TestAttempt.stored_questions, Text) != "[]")
+    )
+    if test_ids:
+        pending = pending.where(TestAttempt.id.in_(test_ids))
+    else:
+        pending = pending.where(TestAttempt.analysis.is_(None))
+    pending = pending.order_by(TestAttempt.id).limit(limit or settings.BATCH_MAX_TESTS)
+
+    claimed = db.execute(
+        update(TestAttempt)
+        .where(TestAttempt.id.in_(pending), TestAttempt.analysis_claimed_at.is_(None))
+        .values(analysis_claimed_at=datetime.utcnow())
+        .returning(TestAttempt.id)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+    db.commit()
+    if not claimed:
+        return []
+    tests = db.query(TestAttempt).filter(TestAttempt.id.in_(claimed)).order_by(TestAttempt.id).all()
+    try:
+        load_questions(db, tests)  # the requests are built on the event loop
+    except SeriesVersionMissing:
+        release_claims(db, claimed)
+        db.commit()
+        raise
+    return tests
+
+
+def release_claims(db: Session, test_ids: List[int]):
+    """Hand tests back to the realtime path (the caller commits)"""
+    for test_id in test_ids:
+        release_claim(db, test_id)
+
+
+def session_payload_for(test: TestAttempt) -> Dict:
+    return {
+        "session_id": f"{test.category.value}_{test.level.value}",
+        "questions": test.questions,
+        "answers": test.answers or [],
+    }
+
+
+def batch_request(custom_id: str, messages: List[Dict], temperature: float, max_tokens: int) -> Dict:
+    """One line of a Batch API input file"""
+    return {
+        "custom_id": custom_id,
+        "method": "POST",
+        "url": BATCH_ENDPOINT,
+        "body": {
+            "model": ENGINES[ENGINE]["model"],
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens
+        }
+    }
+
+
+def build_question_requests(tests: List[TestAttempt]) -> List[Dict]:
+    """Per-question requests, identical to score_question for the GPT-4o engine"""
+    spec = ENGINES[ENGINE]
+    requests = []
+    for test in tests:
+        payload = session_payload_for(test)
+        for q in test.questions:
+            prompt = build_question_prompt(ROLE_PROMPTS[ENGINE], q, find_answer(payload, q["question_id"]), spec["feedback_hint"])
+            requests.append(batch_request(
+                f"test-{test.id}-q-{q['question_id']}",
+                build_messages(spec["question_system"], prompt),
+                temperature=0.3,
+                max_tokens=spec["question_max_tokens"]
+            ))
+    return requests
+
+
+def overall_score_of(question_feedback: List[Dict]) -> float:
+    total_score = sum(item.get("score", 0) for item in question_feedback)
+    return total_score / len(question_feedback) if question_feedback else 0
+
+
+def build_aggregate_requests(feedback_by_test: Dict[str, List[Dict]]) -> List[Dict]:
+    """Session-level requests, identical to aggregate_engine for the GPT-4o engine"""
+    spec = ENGINES[ENGINE]
+    return [
+        batch_request(
+            f"test-{test_id}-aggregate",
+            build_messages(spec["aggregate_system"], build_aggregate_prompt(
+                ROLE_PROMPTS[ENGINE], len(question_feedback), overall_score_of(question_feedback)
+            )),
+            temperature=0.5,
+            max_tokens=1000
+        )
+        for test_id, question_feedback in feedback_by_test.items()
+    ]
+
+
+async def submit_requests(db: AsyncSession, requests: List[Dict], stage: str, test_ids: List[int],
+                          parent: Optional[ScoringBatch] = None,
+                          question_feedback: Optional[Dict] = None) -> ScoringBatch:
+    """Upload a JSONL input file, create the provider batch and record it"""
+    body = "\n".join(json.dumps(r, ensure_ascii=False) for r in requests).encode("utf-8")
+    input_file = await openai_batch_client.files.create(
+        file=(f"indx-{stage}-{datetime.utcnow():%Y%m%d%H%M%S}.jsonl", body),
+        purpose="batch"
+    )
+    provider_batch = await openai_batch_client.batches.create(
+        input_file_id=input_file.id,
+        endpoint=BATCH_ENDPOINT,
+        completion_window=settings.BATCH_COMPLETION_WINDOW
+    )
+
+    batch = ScoringBatch(
+        parent_id=parent.id if parent else None,
+        stage=stage,
+        status=BatchStatus.SUBMITTED,
+        provider_batch_id=provider_batch.id,
+        provider_status=provider_batch.status,
+        input_file_id=input_file.id,
+        test_ids=test_ids,
+        question_feedback=question_feedback,
+        request_count=len(requests)
+    )
+    db.add(batch)
+    await db.commit()
+    return batch
+
+
+async def submit_pending(db: AsyncSession, test_ids: Optional[List[int]] = None, limit: Optional[int] = None) -> Optional[ScoringBatch]:
+    """Start an offline scoring run for pending tests. Returns None when there is nothing to grade"""
+    tests = await db.run_sync(collect_pending_tests, test_ids, limit)
+    if not tests:
+        return None
+    claimed = [t.id for t in tests]
+    try:
+        return await submit_requests(db, build_question_requests(tests), "questions", claimed)
+    except Exception:
+        await db.rollback()
+        await db.run_sync(release_claims, claimed)
+        await db.commit()
+        raise
+
+
+async def download_results(output_file_id: Optional[str]) -> Dict[str, str]:
+    """{custom_id: message content} for every successful request of a batch"""
+    if not output_file_id:
+        return {}
+    output = await openai_batch_client.files.content(output_file_id)
+
+    results = {}
+    for line in output.text.splitlines():
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        response = record.get("response") or {}
+        if record.get("error") or response.get("status_code") != 200:
+            continue
+        results[record["custom_id"]] = response["body"]["choices"][0]["message"]["content"]
+    return results
+
+
+def collect_question_feedback(db: Session, batch: ScoringBatch, results: Dict[str, str]) -> Tuple[Dict[str, List[Dict]], List[int]]:
+    """Question feedback per test; tests with a missing or unparseable answer are returned as failed"""
+    feedback_by_test, failed = {}, []
+    for test in db.query(TestAttempt).filter(TestAttempt.id.in_(batch.test_ids)):
+        try:
+            feedback_by_test[str(test.id)] = [
+                parse_question_feedback(results[f"test-{test.id}-q-{q['question_id']}"])
+                for q in test.questions
+            ]
+        except (KeyError, ValueError) as e:
+            print(f"Batch {batch.id}: no usable question scores for test {test.id} ({e})")
+            failed.append(test.id)
+    return feedback_by_test, failed
+
+
+def write_back(db: Session, batch: ScoringBatch, results: Dict[str, str]) -> Tuple[List[int], List[int]]:
+    """
+    Store the final GPT-4o analysis on each test of an aggregate batch and
+    release its claim. Batched tests were already submitted (their realtime
+    job failed), so the analysis completes them.
+    Returns (failed test ids, newly completed test ids).
+    """
+    failed, completed = [], []
+    for test_id, question_feedback in (batch.question_feedback or {}).items():
+        release_claim(db, int(test_id))
+        test = db.query(TestAttempt).filter(TestAttempt.id == int(test_id)).first()
+        if not test:
+            continue
+        try:
+            aggregated_analysis = parse_aggregate(results[f"test-{test_id}-aggregate"])
+        except (KeyError, ValueError) as e:
+            print(f"Batch {batch.id}: no usable aggregate for test {test_id} ({e})")
+            failed.append(test.id)
+            continue
+
+        result = {
+            "overall_score": overall_score_of(question_feedback) * 10,
+            "index": aggregated_analysis.get("index", [])[:7],  # Limit to 7 items
+            "analysis": aggregated_analysis.get("analysis", ""),
+            "operational_projection": aggregated_analysis.get("operational_projection", ""),
+            "question_feedback": question_feedback
+        }
+
+        # Re-analysis only replaces the GPT-4o slot, other engines are kept
+        try:
+            analysis = json.loads(test.analysis) if test.analysis else {}
+        except ValueError:
+            analysis = {}
+        if "analyses" not in analysis:
+            analysis = {"session_id": session_payload_for(test)["session_id"], "analyses": {}}
+        analysis["analyses"][ENGINE] = json.dumps(result)
+
+        test.analysis = json.dumps(analysis)
+        record_engine(db, test.id, ENGINE, result)
+        test.score = result["overall_score"]
+        if not test.completed:
+            test.completed = datetime.utcnow()
+            completed.append(test.id)
+        refresh_test_summary(db, test)
+    return failed, completed
+
+
+def _finish(batch: ScoringBatch, status: BatchStatus, failed: Optional[List[int]] = None, error: Optional[str] = None):
+    batch.status = status
+    batch.finished_at = datetime.utcnow()
+    if failed:
+        error = f"{error + '; ' if error else ''}not scored, still pending: {sorted(failed)}"
+    batch.error = error
+
+
+async def poll_batch(db: AsyncSession, batch: ScoringBatch) -> ScoringBatch:
+    """Refresh one submitted batch and, once the provider is done, process its results"""
+    provider_batch = await openai_batch_client.batches.retrieve(batch.provider_batch_id)
+    batch.provider_status = provider_batch.status
+    batch.output_file_id = provider_batch.output_file_id
+
+    if provider_batch.status in PROVIDER_PENDING:
+        await db.commit()
+        return batch
+
+    # completed, or expired / failed / cancelled - keep whatever finished
+    results = await download_results(provider_batch.output_file_id)
+    error = None if provider_batch.status == "completed" else f"Provider batch {provider_batch.status}"
+    if not results:
+        _finish(batch, BatchStatus.FAILED, error=error or "Batch produced no results")
+        await db.run_sync(release_claims, batch.test_ids)
+        await db.commit()
+        return batch
+
+    if batch.stage == "questions":
+        feedback_by_test, failed = await db.run_sync(collect_question_feedback, batch, results)
+        _finish(batch, BatchStatus.COMPLETED, failed, error)
+        await db.run_sync(release_claims, failed)
+        await db.commit()
+        if feedback_by_test:
+            scored = [int(test_id) for test_id in feedback_by_test]
+            try:
+                await submit_requests(
+                    db, build_aggregate_requests(feedback_by_test), "aggregate",
+                    scored, parent=batch, question_feedback=feedback_by_test
+                )
+            except Exception:
+                await db.rollback()
+                await db.run_sync(release_claims, scored)
+                await db.commit()
+                raise
+    else:
+        failed, completed = await db.run_sync(write_back, batch, results)
+        _finish(batch, BatchStatus.COMPLETED, failed, error)
+        await db.commit()
+        for test_id in completed:
+            schedule_prerender(test_id)
+    return batch
+
+
+async def poll_batches(db: AsyncSession) -> List[ScoringBatch]:
+    """Poll every submitted batch once. Returns the batches that were checked"""
+    batches = (await db.scalars(
+        select(ScoringBatch).where(ScoringBatch.status == BatchStatus.SUBMITTED).order_by(ScoringBatch.id)
+    )).all()
+    failed = False
+    for batch in batches:
+        batch_id = batch.id
+        try:
+            await poll_batch(db, batch)
+        except Exception as e:
+            await db.rollback()
+            failed = True
+            print(f"Polling scoring batch {batch_id} failed: {e}")
+    if failed:
+        # The rollback expired every loaded batch; reload them for the caller
+        for batch in batches:
+            await db.refresh(batch)
+    return batches
@@ -0,0 +1,271 @@
+import asyncio
+import smtplib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from sqlalchemy import or_, and_, func, insert, select, update
+from sqlalchemy.orm import Session
+from ..config import settings
+from ..database import SessionLocal
+from ..models.email_outbox import EmailDispatch, EmailOutbox, EmailStatus
+from ..models.test import TestAttempt
+from .email_service import build_message, smtp_pool
+from .llm_scheduler import ProviderLimiter
+from .test_summary import refresh_test_summary
+
+
+# Emails claimed per sender round; the limiter below paces the actual sends
+CLAIM_BATCH = 50
+
+# Set whenever an email is queued so the sender wakes up immediately
+_wakeup = asyncio.Event()
+_sender: Optional[asyncio.Task] = None
+
+# smtplib is blocking: sends run on one thread per pooled SMTP connection
+_smtp_executor = ThreadPoolExecutor(max_workers=settings.EMAIL_SMTP_CONNECTIONS, thread_name_prefix="smtp")
+
+# Outbox reads and writes of the sender are blocking too; they run here, off the event loop
+_db_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="email-db")
+
+# Deliveries recorded by this process since it started (sent, failed for good, retried)
+_delivery_counts = {"sent": 0, "failed": 0, "retried": 0}
+
+# Provider quota: concurrent SMTP sessions and messages per minute
+smtp_limiter = ProviderLimiter("smtp", settings.EMAIL_SMTP_CONNECTIONS, settings.EMAIL_RATE_PER_MINUTE, 0)
+
+
+def enqueue_email(db: Session, to_address: str, subject: str, html_body: str,
+                  test_id: Optional[int] = None, kind: str = "result",
+                  text_body: Optional[str] = None) -> EmailOutbox:
+    """Add an email to the outbox. The caller commits, then calls notify_sender()"""
+    email = EmailOutbox(
+        test_id=test_id,
+        kind=kind,
+        to_address=to_address,
+        subject=subject,
+        html_body=html_body,
+        text_body=text_body,
+        status=EmailStatus.QUEUED,
+        next_attempt_at=datetime.utcnow()
+    )
+    db.add(email)
+    db.flush()  # assign the id
+    return email
+
+
+def enqueue_emails(db: Session, emails: List[Dict], dispatch_id: Optional[int] = None) -> int:
+    """
+    Bulk-insert rendered emails, each {to_address, subject, html_body,
+    text_body, test_id, kind}, in one statement. The caller commits, then calls
+    notify_sender().
+    """
+    if not emails:
+        return 0
+    now = datetime.utcnow()
+    db.execute(insert(EmailOutbox), [
+        {
+            **email,
+            "dispatch_id": dispatch_id,
+            "status": EmailStatus.QUEUED,
+            "attempts": 0,
+            "next_attempt_at": now,
+            "created_at": now,
+            "updated_at": now
+        }
+        for email in emails
+    ])
+    return len(emails)
+
+
+def get_pending_email(db: Session, test_id: int, kind: str = "result") -> Optional[EmailOutbox]:
+    """An email for the test that is still waiting to be delivered"""
+    return db.query(EmailOutbox).filter(
+        EmailOutbox.test_id == test_id,
+        EmailOutbox.kind == kind,
+        EmailOutbox.status.in_([EmailStatus.QUEUED, EmailStatus.SENDING])
+    ).order_by(EmailOutbox.id.desc()).first()
+
+
+def dispatch_progress(db: Session, dispatch: EmailDispatch) -> Dict:
+    """Delivery counts of a bulk dispatch, with its send rate so far and an ETA"""
+    counts = dict(db.query(EmailOutbox.status, func.count(EmailOutbox.id)).filter(
+        EmailOutbox.dispatch_id == dispatch.id
+    ).group_by(EmailOutbox.status).all())
+    last_sent_at = db.query(func.max(EmailOutbox.sent_at)).filter(EmailOutbox.dispatch_id == dispatch.id).scalar()
+
+    sent, failed = counts.get(EmailStatus.SENT, 0), counts.get(EmailStatus.FAILED, 0)
+    remaining = counts.get(EmailStatus.QUEUED, 0) + counts.get(EmailStatus.SENDING, 0)
+    elapsed = (last_sent_at - dispatch.created_at).total_seconds() if last_sent_at else 0
+    per_minute = 60 * sent / elapsed if elapsed > 0 else None
+    return {
+        "dispatch_id": dispatch.id,
+        "filters": dispatch.filters,
+        "created_at": dispatch.created_at,
+        "total": dispatch.total,
+        **{status.value: counts.get(status, 0) for status in EmailStatus},
+        "percent": round(100 * (sent + failed) / dispatch.total, 1) if dispatch.total else 100.0,
+        "done": remaining == 0,
+        "sent_per_minute": round(per_minute, 1) if per_minute else None,
+        "eta_seconds": round(60 * remaining / per_minute) if per_minute and remaining else None
+    }
+
+
+def notify_sender():
+    _wakeup.set()
+
+
+def claim_due_emails(limit: int) -> List:
+    """
+    Claim queued emails that are due (and emails whose sender stopped
+    heart-beating) with one UPDATE ... RETURNING, so several processes can
+    share the outbox: the chosen rows are locked with SKIP LOCKED where the
+    database supports it, and the status is checked again by the UPDATE.
+    Returns the claimed rows with what is needed to send them.
+    """
+    db = SessionLocal()
+    try:
+        now = datetime.utcnow()
+        stale_before = now - timedelta(seconds=settings.EMAIL_SENDING_STALE_SECONDS)
+        claimable = or_(
+            and_(EmailOutbox.status == EmailStatus.QUEUED, EmailOutbox.next_attempt_at <= now),
+            and_(EmailOutbox.status == EmailStatus.SENDING, EmailOutbox.updated_at < stale_before)
+        )
+        due = select(EmailOutbox.id).where(claimable).order_by(
+            EmailOutbox.next_attempt_at
+        ).limit(limit).with_for_update(skip_locked=True)
+
+        claimed = db.execute(
+            update(EmailOutbox)
+            .where(EmailOutbox.id.in_(due), claimable)
+            .values(status=EmailStatus.SENDING, updated_at=now, attempts=EmailOutbox.attempts + 1)
+            .returning(
+                EmailOutbox.id, EmailOutbox.to_address, EmailOutbox.subject,
+                EmailOutbox.html_body, EmailOutbox.text_body
+            )
+            .execution_options(synchronize_session=False)
+        ).all()
+        db.commit()
+        return claimed
+    finally:
+        db.close()
+
+
+def is_permanent(error: Exception) -> bool:
+    """5xx replies mean the provider will not accept this message as it is"""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(500 <= code < 600 for code, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPAuthenticationError):
+        return False  # credentials problem - retry once it is fixed
+    code = getattr(error, "smtp_code", None)
+    return isinstance(code, int) and 500 <= code < 600
+
+
+def retry_delay(attempts: int) -> float:
+    return min(settings.EMAIL_RETRY_BASE_DELAY * 2 ** max(attempts - 1, 0), settings.EMAIL_RETRY_MAX_DELAY)
+
+
+def record_delivery(email_id: int, error: Optional[Exception] = None):
+    """Mark an email sent (and its test's result as emailed), or schedule its retry"""
+    db = SessionLocal()
+    try:
+        email = db.query(EmailOutbox).filter(EmailOutbox.id == email_id).first()
+        if not email:
+            return
+        now = datetime.utcnow()
+        if error is None:
+            email.status = EmailStatus.SENT
+            email.sent_at = now
+            email.error = None
+            outcome = "sent"
+            if email.kind == "result" and email.test_id:
+                test = db.query(TestAttempt).filter(TestAttempt.id == email.test_id).first()
+                if test:
+                    test.email_sent = True
+                    test.email_sent_at = now
+                    refresh_test_summary(db, test)
+        elif is_permanent(error) or email.attempts >= settings.EMAIL_MAX_ATTEMPTS:
+            email.status = EmailStatus.FAILED
+            email.error = str(error)
+            outcome = "failed"
+        else:
+            email.status = EmailStatus.QUEUED
+            email.error = str(error)
+            email.next_attempt_at = now + timedelta(seconds=retry_delay(email.attempts))
+            outcome = "retried"
+        db.commit()
+        _delivery_counts[outcome] += 1
+    finally:
+        db.close()
+
+
+async def deliver(email):
+    """Send one claimed email (a row returned by claim_due_emails)"""
+    loop = asyncio.get_running_loop()
+    message = build_message(email.to_address, email.subject, email.html_body, email.text_body)
+    error = None
+    try:
+        async with smtp_limiter.slot():
+            await loop.run_in_executor(_smtp_executor, smtp_pool.send, message)
+    except Exception as e:
+        print(f"Email {email.id} to {email.to_address} failed: {e}")
+        error = e
+    await loop.run_in_executor(_db_executor, record_delivery, email.id, error)
+
+
+async def _sender_loop():
+    while True:
+        try:
+            emails = await asyncio.get_running_loop().run_in_executor(_db_executor, claim_due_emails, CLAIM_BATCH)
+        except Exception as e:
+            print(f"Email sender could not claim emails: {e}")
+            emails = []
+
+        if not emails:
+            try:
+                await asyncio.wait_for(_wakeup.wait(), timeout=settings.EMAIL_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            _wakeup.clear()
+            continue
+
+        await asyncio.gather(*(deliver(email) for email in emails))
+
+
+def start_sender():
+    """Start the in-process email sender on the running event loop"""
+    global _sender
+    if settings.EMAIL_SENDER_ENABLED and _sender is None:
+        _sender = asyncio.create_task(_sender_loop())
+
+
+async def stop_sender():
+    """Stop the sender and close pooled SMTP connections. Emails cut off
+    mid-send stay claimed and are retried once their claim goes stale."""
+    global _sender
+    if _sender is not None:
+        _sender.cancel()
+        await asyncio.gather(_sender, return_exceptions=True)
+        _sender = None
+    await asyncio.get_running_loop().run_in_executor(_smtp_executor, smtp_pool.close)
+
+
+def count_outbox_backlog() -> Dict[EmailStatus, int]:
+    """Emails still to deliver, counted on the (status, next_attempt_at) index"""
+    db = SessionLocal()
+    try:
+        return dict(db.query(EmailOutbox.status, func.count(EmailOutbox.id)).filter(
+            EmailOutbox.status.in_([EmailStatus.QUEUED, EmailStatus.SENDING])
+        ).group_by(EmailOutbox.status).all())
+    finally:
+        db.close()
+
+
+async def get_sender_stats() -> Dict:
+    """Outbox backlog, this process's delivery counters, SMTP pool and rate limiter"""
+    backlog = await asyncio.get_running_loop().run_in_executor(_db_executor, count_outbox_backlog)
+    return {
+        "outbox": {status.value: backlog.get(status, 0) for status in (EmailStatus.QUEUED, EmailStatus.SENDING)},
+        "delivered": dict(_delivery_counts),
+        "smtp": smtp_pool.stats(),
+        "rate": smtp_limiter.stats()
+    }
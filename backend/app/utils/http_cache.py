@@ -0,0 +1,89 @@
+import hashlib
+import re
+from typing import Iterator, Optional, Tuple
+from fastapi.responses import FileResponse, Response, StreamingResponse
+
+
+def make_etag(content: bytes) -> str:
+    """Strong ETag for an exact response body"""
+    return '"' + hashlib.sha256(content).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match check (weak comparison, as RFC 9110 requires for GET/HEAD)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return etag in candidates or f"W/{etag}" in candidates
+
+
+def byte_range(range_header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    (first, last) byte of a single "bytes=" Range request, or None to send
+    the whole file: no Range, several ranges (which a server may ignore) or
+    an invalid one such as bytes=5-3 (which RFC 9110 says to ignore).
+    Raises ValueError when the range cannot be satisfied.
+    """
+    match = re.fullmatch(r"bytes=(\d*)-(\d*)", (range_header or "").strip())
+    if not match or not any(match.groups()):
+        return None
+    first, last = match.groups()
+
+    if not first:  # bytes=-N: the last N bytes
+        if int(last) == 0 or size == 0:
+            raise ValueError(f"Range {range_header} not satisfiable for {size} bytes")
+        return max(size - int(last), 0), size - 1
+
+    start = int(first)
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        raise ValueError(f"Range {range_header} not satisfiable for {size} bytes")
+    return start, min(int(last), size - 1) if last else size - 1
+
+
+def _read_slice(path: str, start: int, length: int, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    with open(path, "rb") as f:
+        f.seek(start)
+        while length > 0:
+            chunk = f.read(min(chunk_size, length))
+            if not chunk:
+                return
+            length -= len(chunk)
+            yield chunk
+
+
+def file_response(path: str, size: int, etag: str, media_type: str, filename: str,
+                  range_header: Optional[str] = None, if_range: Optional[str] = None,
+                  if_none_match: Optional[str] = None) -> Response:
+    """
+    Serve an immutable file from disk with its ETag: 304 on a matching
+    If-None-Match, 206 for a single byte range (when If-Range, if sent,
+    still matches), the streamed file otherwise.
+    """
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Cache-Control": "private, no-cache",  # revalidate with the ETag
+        "Content-Disposition": f'attachment; filename="{filename}"'
+    }
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    if if_range is None or if_range.strip() == etag:
+        try:
+            requested = byte_range(range_header, size)
+        except ValueError:
+            return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+        if requested:
+            start, end = requested
+            return StreamingResponse(
+                _read_slice(path, start, end - start + 1),
+                status_code=206,
+                media_type=media_type,
+                headers={**headers, "Content-Range": f"bytes {start}-{end}/{size}", "Content-Length": str(end - start + 1)}
+            )
+
+    return FileResponse(path, media_type=media_type, headers=headers)
@@ -0,0 +1,232 @@
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from sqlalchemy import bindparam, func, text, update
+from ..config import settings
+from ..database import SessionLocal
+from ..models.llm_cache import LLMCacheEntry
+
+
+# Lookups and writes of blocking backends (the database) run here
+_cache_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="llm-cache")
+
+
+def make_cache_key(model: str, messages: List[Dict], temperature: float, max_tokens: int) -> str:
+    """Content address of a completion request. The messages carry the role
+    prompt, question and answer, so identical submissions share a key."""
+    payload = json.dumps(
+        {"model": model, "messages": messages, "temperature": temperature, "max_tokens": max_tokens},
+        sort_keys=True,
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """Base cache backend with hit/miss accounting. Backends whose _get/_set
+    block (blocking = True) are called on a thread pool, off the event loop."""
+    backend = "none"
+    blocking = False
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.errors = 0
+
+    def _get(self, key: str) -> Optional[str]:
+        return None
+
+    def _set(self, key: str, model: str, value: str):
+        pass
+
+    def _record_hit(self, key: str):
+        pass
+
+    async def _call(self, fn, *args):
+        if self.blocking:
+            return await asyncio.get_running_loop().run_in_executor(_cache_executor, fn, *args)
+        return fn(*args)
+
+    async def get(self, key: str) -> Optional[str]:
+        try:
+            value = await self._call(self._get, key)
+        except Exception as e:
+            print(f"LLM cache read failed: {e}")
+            self.errors += 1
+            value = None
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._record_hit(key)
+        return value
+
+    async def set(self, key: str, model: str, value: str):
+        try:
+            await self._call(self._set, key, model, value)
+            self.writes += 1
+        except Exception as e:
+            print(f"LLM cache write failed: {e}")
+            self.errors += 1
+
+    def size(self) -> Optional[int]:
+        return None
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.backend,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0,
+            "writes": self.writes,
+            "errors": self.errors,
+            "entries": self.size(),
+        }
+
+
+class MemoryLLMCache(LLMCache):
+    """Per-process LRU cache with a TTL"""
+    backend = "memory"
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        super().__init__()
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+
+    def _get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def _set(self, key: str, model: str, value: str):
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def size(self) -> int:
+        return len(self._entries)
+
+
+class DatabaseLLMCache(LLMCache):
+    """
+    Shared cache in the llm_cache_entries table (SQLite or Postgres).
+    Per-entry hit counters are accumulated in memory and written in one
+    batch every HIT_FLUSH_SECONDS; the entry count is refreshed in the
+    background at most every SIZE_REFRESH_SECONDS.
+    """
+    backend = "database"
+    blocking = True
+
+    HIT_FLUSH_SECONDS = 30
+    SIZE_REFRESH_SECONDS = 60
+
+    def __init__(self, ttl_seconds: int):
+        super().__init__()
+        self.ttl_seconds = ttl_seconds
+        self._pending_hits: Dict[str, int] = {}
+        self._hits_flushed_at = time.monotonic()
+        self._size: Optional[int] = None
+        self._size_checked_at = 0.0
+
+    def _get(self, key: str) -> Optional[str]:
+        db = SessionLocal()
+        try:
+            entry = db.query(LLMCacheEntry.value, LLMCacheEntry.expires_at).filter(LLMCacheEntry.key == key).first()
+            if entry is None:
+                return None
+            if entry.expires_at and entry.expires_at < datetime.utcnow():
+                db.query(LLMCacheEntry).filter(LLMCacheEntry.key == key).delete(synchronize_session=False)
+                db.commit()
+                return None
+            return entry.value
+        finally:
+            db.close()
+
+    def _set(self, key: str, model: str, value: str):
+        db = SessionLocal()
+        try:
+            db.merge(LLMCacheEntry(
+                key=key,
+                model=model,
+                value=value,
+                hits=0,
+                created_at=datetime.utcnow(),
+                expires_at=datetime.utcnow() + timedelta(seconds=self.ttl_seconds)
+            ))
+            db.commit()
+        finally:
+            db.close()
+
+    def _record_hit(self, key: str):
+        self._pending_hits[key] = self._pending_hits.get(key, 0) + 1
+        if time.monotonic() - self._hits_flushed_at >= self.HIT_FLUSH_SECONDS:
+            hits, self._pending_hits = self._pending_hits, {}
+            self._hits_flushed_at = time.monotonic()
+            asyncio.get_running_loop().run_in_executor(_cache_executor, self._flush_hits, hits)
+
+    def _flush_hits(self, hits: Dict[str, int]):
+        table = LLMCacheEntry.__table__
+        db = SessionLocal()
+        try:
+            db.execute(
+                update(table).where(table.c.key == bindparam("entry_key")).values(
+                    hits=func.coalesce(table.c.hits, 0) + bindparam("entry_hits")
+                ),
+                [{"entry_key": key, "entry_hits": count} for key, count in hits.items()]
+            )
+            db.commit()
+        except Exception as e:
+            print(f"LLM cache hit counters not saved: {e}")
+        finally:
+            db.close()
+
+    def _refresh_size(self):
+        db = SessionLocal()
+        try:
+            if db.bind.dialect.name == "postgresql":
+                # Planner estimate kept current by autovacuum: no table scan
+                estimate = db.execute(text(
+                    "SELECT reltuples::bigint FROM pg_class WHERE oid = 'llm_cache_entries'::regclass"
+                )).scalar()
+                if estimate is not None and estimate >= 0:
+                    self._size = estimate
+                    return
+            self._size = db.query(func.count(LLMCacheEntry.key)).scalar()
+        except Exception as e:
+            print(f"LLM cache size not refreshed: {e}")
+        finally:
+            db.close()
+
+    def size(self) -> Optional[int]:
+        """Last known entry count (None until the first refresh has finished)"""
+        if time.monotonic() - self._size_checked_at >= self.SIZE_REFRESH_SECONDS:
+            self._size_checked_at = time.monotonic()
+            asyncio.get_running_loop().run_in_executor(_cache_executor, self._refresh_size)
+        return self._size
+
+
+def _build_cache() -> LLMCache:
+    backend = settings.LLM_CACHE_BACKEND
+    if backend == "memory":
+        return MemoryLLMCache(settings.LLM_CACHE_MAX_ENTRIES, settings.LLM_CACHE_TTL_SECONDS)
+    if backend == "database":
+        return DatabaseLLMCache(settings.LLM_CACHE_TTL_SECONDS)
+    return LLMCache()
+
+
+llm_cache = _build_cache()
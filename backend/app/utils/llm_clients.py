@@ -0,0 +1,136 @@
+from typing import Dict, List
+import httpx
+from openai import AsyncOpenAI
+from anthropic import AsyncAnthropic, NOT_GIVEN
+from ..config import settings
+
+
+XAI_CHAT_URL = "https://api.x.ai/v1/chat/completions"
+MISTRAL_CHAT_URL = "https://api.mistral.ai/v1/chat/completions"
+GEMINI_BASE_URL = "https://generativelanguage.googleapis.com/v1beta/models"
+
+# Shared, pooled HTTP client for the providers we call over raw HTTP
+# (xAI, Mistral, Gemini). Connections are kept alive between requests
+# instead of doing a new TLS handshake for every engine call.
+http_client = httpx.AsyncClient(
+    timeout=httpx.Timeout(120.0, connect=10.0),  # reasoning models are slow
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+)
+
+# SDK clients - async so that awaiting a completion yields the event loop.
+# Built-in retries are off: llm_retry.call_with_policy is the only retry layer.
+openai_client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY, max_retries=0)
+anthropic_client = AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY, max_retries=0)
+# groq_client = AsyncOpenAI(
+#     api_key=settings.GROQ_API_KEY,
+#     base_url="https://api.groq.com/openai/v1"
+# )
+groq_client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY, max_retries=0)
+# Batch API (files + batches endpoints), optionally against a local stand-in
+openai_batch_client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BATCH_BASE_URL)
+
+
+async def close_clients():
+    """Close pooled connections (called on application shutdown)"""
+    await http_client.aclose()
+    await openai_client.close()
+    await anthropic_client.close()
+    await groq_client.close()
+    await openai_batch_client.close()
+
+
+# xAI answers these when a model name is unknown or not enabled for the key
+GROK_MODEL_UNAVAILABLE = (400, 403, 404)
+GROK_FALLBACK_MODEL = "grok-beta"
+
+
+async def fetch_grok_completion(payload_data: Dict):
+    """
+    POST a chat completion to xAI over the shared connection pool. If the
+    requested model is unavailable, fall back once to the 'grok-beta' alias.
+    Transient errors are left to the retry policy.
+    """
+    headers = {
+        "Authorization": f"Bearer {settings.XAI_API_KEY}",
+        "Content-Type": "application/json"
+    }
+
+    response = await http_client.post(XAI_CHAT_URL, headers=headers, json=payload_data)
+    if response.status_code in GROK_MODEL_UNAVAILABLE and payload_data["model"] != GROK_FALLBACK_MODEL:
+        print(f"Grok model {payload_data['model']} unavailable ({response.status_code}), switching to {GROK_FALLBACK_MODEL}...")
+        response = await http_client.post(XAI_CHAT_URL, headers=headers, json={**payload_data, "model": GROK_FALLBACK_MODEL})
+    return response
+
+
+async def fetch_gemini_completion(model: str, messages: List[Dict], temperature: float, max_tokens: int) -> str:
+    """generateContent call; system messages become the system instruction"""
+    system = "\n".join(m["content"] for m in messages if m["role"] == "system")
+    body = {
+        "contents": [{"role": "user", "parts": [{"text": m["content"]}]} for m in messages if m["role"] != "system"],
+        "generationConfig": {
+            "temperature": temperature,
+            "maxOutputTokens": max_tokens,
+            "responseMimeType": "application/json"
+        }
+    }
+    if system:
+        body["systemInstruction"] = {"parts": [{"text": system}]}
+
+    response = await http_client.post(
+        f"{GEMINI_BASE_URL}/{model}:generateContent?key={settings.GEMINI_API_KEY}",
+        headers={"Content-Type": "application/json"},
+        json=body
+    )
+    response.raise_for_status()
+    return response.json()["candidates"][0]["content"]["parts"][0]["text"]
+
+
+async def chat_completion(provider: str, model: str, messages: List[Dict], temperature: float, max_tokens: int) -> str:
+    """Run a single chat completion against a provider and return the message text"""
+    if provider in ("openai", "groq"):
+        client = openai_client if provider == "openai" else groq_client
+        response = await client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens
+        )
+        return response.choices[0].message.content
+
+    if provider == "anthropic":
+        # Anthropic takes the system prompt as a separate argument
+        system = "\n".join(m["content"] for m in messages if m["role"] == "system")
+        message = await anthropic_client.messages.create(
+            model=model,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            system=system or NOT_GIVEN,
+            messages=[m for m in messages if m["role"] != "system"]
+        )
+        return message.content[0].text
+
+    if provider in ("xai", "mistral"):
+        payload = {
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens
+        }
+        if provider == "xai":
+            response = await fetch_grok_completion(payload)
+        else:
+            response = await http_client.post(
+                MISTRAL_CHAT_URL,
+                headers={
+                    "Authorization": f"Bearer {settings.MISTRAL_API_KEY}",
+                    "Content-Type": "application/json"
+                },
+                json=payload
+            )
+        response.raise_for_status()
+        return response.json()["choices"][0]["message"]["content"]
+
+    if provider == "gemini":
+        return await fetch_gemini_completion(model, messages, temperature, max_tokens)
+
+    raise ValueError(f"Unknown LLM provider: {provider}")
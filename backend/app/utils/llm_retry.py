@@ -0,0 +1,193 @@
+import asyncio
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+import httpx
+import openai
+import anthropic
+from ..config import settings
+
+
+T = TypeVar("T")
+
+# Statuses worth retrying: rate limits, timeouts and provider-side errors
+RETRYABLE_STATUSES = {408, 409, 425, 429, 500, 502, 503, 504, 529}
+
+
+class CircuitOpenError(Exception):
+    """Raised without calling the provider while its circuit breaker is open"""
+
+    def __init__(self, provider: str, retry_in: float):
+        super().__init__(f"{provider} circuit open, retry in {retry_in:.0f}s")
+        self.provider = provider
+        self.retry_in = retry_in
+
+
+def parse_retry_after(headers) -> Optional[float]:
+    """Seconds to wait from Retry-After (seconds or HTTP date) or retry-after-ms"""
+    if not headers:
+        return None
+    value = headers.get("retry-after-ms")
+    if value:
+        try:
+            return float(value) / 1000
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        try:
+            return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+        except (TypeError, ValueError):
+            return None
+
+
+def classify(exc: BaseException) -> Tuple[bool, Optional[float]]:
+    """(retryable, retry_after) for an exception raised by a provider call"""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in RETRYABLE_STATUSES, parse_retry_after(exc.response.headers)
+    if isinstance(exc, (openai.APIStatusError, anthropic.APIStatusError)):
+        return exc.status_code in RETRYABLE_STATUSES, parse_retry_after(exc.response.headers)
+    if isinstance(exc, (httpx.TransportError, openai.APIConnectionError, anthropic.APIConnectionError)):
+        return True, None  # connection errors and timeouts (APITimeoutError is a subclass)
+    return False, None
+
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    """Full-jitter exponential backoff; a server-provided Retry-After is a floor"""
+    delay = random.uniform(0, min(settings.LLM_RETRY_MAX_DELAY, settings.LLM_RETRY_BASE_DELAY * 2 ** attempt))
+    if retry_after is not None:
+        delay = max(delay, min(retry_after, settings.LLM_RETRY_AFTER_CAP))
+    return delay
+
+
+class CircuitBreaker:
+    """
+    Per-provider breaker. After `failure_threshold` consecutive provider
+    failures it opens and every call fails fast for `reset_seconds`; then a
+    single probe is let through (half-open) and its outcome closes or
+    re-opens the circuit.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_seconds: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.rejected = 0
+        self._probe_in_flight = False
+
+    def before_call(self):
+        if self.state == "closed":
+            return
+        elapsed = time.monotonic() - self.opened_at
+        if self.state == "open" and elapsed >= self.reset_seconds:
+            self.state = "half_open"
+        if self.state == "half_open" and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return
+        self.rejected += 1
+        raise CircuitOpenError(self.name, max(self.reset_seconds - elapsed, 0))
+
+    def record_success(self):
+        self.state = "closed"
+        self.failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        self._probe_in_flight = False
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                print(f"Circuit breaker for {self.name} opened after {self.failures} failures")
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+    def release_probe(self):
+        """The call let through was cancelled before it had an outcome;
+        the next call may probe instead"""
+        self._probe_in_flight = False
+
+    def stats(self) -> Dict:
+        return {"state": self.state, "consecutive_failures": self.failures, "rejected": self.rejected}
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(provider: str) -> CircuitBreaker:
+    breaker = _breakers.get(provider)
+    if breaker is None:
+        breaker = CircuitBreaker(provider, settings.LLM_BREAKER_FAILURE_THRESHOLD, settings.LLM_BREAKER_RESET_SECONDS)
+        _breakers[provider] = breaker
+    return breaker
+
+
+def get_breaker_stats() -> Dict[str, Dict]:
+    return {name: breaker.stats() for name, breaker in _breakers.items()}
+
+
+async def _hedged(call: Callable[[], Awaitable[T]], hedge_after: float) -> T:
+    """
+    Start `call`; if it hasn't finished after `hedge_after` seconds start a
+    second identical call and return whichever succeeds first.
+    """
+    first = asyncio.ensure_future(call())
+    done, _ = await asyncio.wait({first}, timeout=hedge_after)
+    if done:
+        return first.result()
+
+    tasks = {first, asyncio.ensure_future(call())}
+    try:
+        error = None
+        while tasks:
+            done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def call_with_policy(provider: str, call: Callable[[], Awaitable[T]]) -> T:
+    """
+    Run a provider call under the shared policy: circuit breaker check,
+    optional hedging, and jittered exponential backoff (honoring
+    Retry-After) for retryable failures. `call` must start a fresh request
+    each time it is invoked.
+    """
+    breaker = get_breaker(provider)
+    hedge_after = settings.LLM_HEDGE_AFTER_SECONDS.get(provider, 0)
+    max_attempts = max(settings.LLM_RETRY_MAX_ATTEMPTS, 1)
+
+    for attempt in range(max_attempts):
+        breaker.before_call()
+        try:
+            result = await (_hedged(call, hedge_after) if hedge_after > 0 else call())
+        except asyncio.CancelledError:
+            breaker.release_probe()
+            raise
+        except Exception as e:
+            retryable, retry_after = classify(e)
+            if not retryable:
+                # The provider answered (bad request, auth, parse error) - not an outage
+                breaker.record_success()
+                raise
+            breaker.record_failure()
+            if attempt == max_attempts - 1:
+                raise
+            delay = backoff_delay(attempt, retry_after)
+            print(f"{provider} call failed ({e}), retry {attempt + 1}/{max_attempts - 1} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+        else:
+            breaker.record_success()
+            return result
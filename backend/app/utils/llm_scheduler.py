@@ -0,0 +1,113 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Dict, List
+from ..config import settings
+
+
+DEFAULT_LIMITS = {
+    "max_in_flight": 4,
+    "requests_per_minute": 60,
+    "tokens_per_minute": 0,  # 0 = no token budget
+}
+
+
+def estimate_tokens(messages: List[Dict], max_tokens: int) -> int:
+    """Rough token cost of a request (prompt chars / 4 + completion budget)"""
+    prompt_chars = sum(len(m.get("content") or "") for m in messages)
+    return prompt_chars // 4 + max_tokens
+
+
+class ProviderLimiter:
+    """
+    Concurrency scheduler for a single LLM provider:
+    - at most `max_in_flight` requests running at once
+    - at most `requests_per_minute` / `tokens_per_minute` admitted
+      over a sliding 60s window
+    Requests that don't fit wait their turn instead of triggering 429s.
+    """
+
+    def __init__(self, name: str, max_in_flight: int, requests_per_minute: int, tokens_per_minute: int):
+        self.name = name
+        self.max_in_flight = max_in_flight
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+        self._admission_lock = asyncio.Lock()
+        self._window = deque()  # (admitted_at, tokens)
+        self._window_tokens = 0
+        self.in_flight = 0
+        self.waiting = 0
+
+    def _expire(self, now: float):
+        while self._window and now - self._window[0][0] >= 60:
+            _, tokens = self._window.popleft()
+            self._window_tokens -= tokens
+
+    def _fits(self, tokens: int) -> bool:
+        if self.requests_per_minute and len(self._window) >= self.requests_per_minute:
+            return False
+        # A single request bigger than the whole budget is still let through
+        # once the window is empty, otherwise it would wait forever
+        if self.tokens_per_minute and self._window and self._window_tokens + tokens > self.tokens_per_minute:
+            return False
+        return True
+
+    async def _reserve(self, tokens: int):
+        # FIFO admission: the lock is held while sleeping so later
+        # requests cannot overtake one that is waiting for budget
+        async with self._admission_lock:
+            while True:
+                now = time.monotonic()
+                self._expire(now)
+                if self._fits(tokens):
+                    self._window.append((now, tokens))
+                    self._window_tokens += tokens
+                    return
+                await asyncio.sleep(max(60 - (now - self._window[0][0]), 0.05))
+
+    @asynccontextmanager
+    async def slot(self, tokens: int = 0):
+        """Wait for an in-flight slot and per-minute budget, then run the request"""
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        try:
+            await self._reserve(tokens)
+            self.in_flight += 1
+            try:
+                yield
+            finally:
+                self.in_flight -= 1
+        finally:
+            self._semaphore.release()
+
+    def stats(self) -> Dict:
+        self._expire(time.monotonic())
+        return {
+            "max_in_flight": self.max_in_flight,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "requests_last_minute": len(self._window),
+            "tokens_last_minute": self._window_tokens,
+        }
+
+
+_limiters: Dict[str, ProviderLimiter] = {}
+
+
+def get_limiter(provider: str) -> ProviderLimiter:
+    """Get (or lazily create) the shared limiter for a provider"""
+    limiter = _limiters.get(provider)
+    if limiter is None:
+        limits = {**DEFAULT_LIMITS, **settings.LLM_PROVIDER_LIMITS.get(provider, {})}
+        limiter = ProviderLimiter(provider, **limits)
+        _limiters[provider] = limiter
+    return limiter
+
+
+def get_scheduler_stats() -> Dict[str, Dict]:
+    return {name: limiter.stats() for name, limiter in _limiters.items()}
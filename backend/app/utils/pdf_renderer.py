@@ -0,0 +1,119 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Optional
+from ..config import settings
+from .certificate_generator import generate_certificate
+from .qa_pdf_generator import generate_qa_pdf
+from .qaa_pdf_generator import generate_qaa_pdf
+
+
+RENDERERS = {
+    "certificate": generate_certificate,
+    "qa": generate_qa_pdf,
+    "qaa": generate_qaa_pdf
+}
+
+
+def render_pdf(kind: str, params: Dict) -> bytes:
+    """Runs in a pool process"""
+    return RENDERERS[kind](**params).getvalue()
+
+
+class RendererBusyError(Exception):
+    """Raised instead of queueing a render when the pool's queue is full"""
+
+    def __init__(self, pending: int):
+        super().__init__(f"PDF renderer busy ({pending} renders pending)")
+        self.pending = pending
+
+
+class PdfRenderer:
+    """
+    ReportLab layout is CPU-bound, so renders run in a pool of worker
+    processes: they scale with cores and never hold the GIL of the API
+    process. At most max_queue renders are waiting or running; beyond that
+    render() fails fast with RendererBusyError, and background renders only
+    get half of the queue so they never crowd out downloads. A render that
+    exceeds the timeout raises asyncio.TimeoutError to its caller; if it had
+    not started yet it is dropped, otherwise it keeps its worker until done.
+    """
+
+    def __init__(self, processes: int, max_queue: int, timeout: float):
+        self.processes = processes
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self.pending = 0
+        self.rendered = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.failures = 0
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn: forking would copy the event loop, its threads and open connections
+            self._pool = ProcessPoolExecutor(self.processes, mp_context=multiprocessing.get_context("spawn"))
+        return self._pool
+
+    def _release(self, _):
+        self.pending -= 1
+
+    async def render(self, kind: str, params: Dict, background: bool = False) -> bytes:
+        limit = self.max_queue // 2 if background else self.max_queue
+        if self.pending >= limit:
+            self.rejected += 1
+            raise RendererBusyError(self.pending)
+
+        pool = self._get_pool()
+        try:
+            future = pool.submit(render_pdf, kind, params)
+        except BrokenProcessPool:
+            # A worker died (e.g. killed for memory); start a fresh pool
+            self._pool = None
+            future = self._get_pool().submit(render_pdf, kind, params)
+        self.pending += 1
+        result = asyncio.wrap_future(future)
+        result.add_done_callback(self._release)
+
+        try:
+            content = await asyncio.wait_for(asyncio.shield(result), self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            future.cancel()  # only succeeds while it is still queued
+            raise
+        except BrokenProcessPool:
+            self.failures += 1
+            if self._pool is pool:
+                self._pool = None
+            raise
+        except Exception:
+            self.failures += 1
+            raise
+        self.rendered += 1
+        return content
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def stats(self) -> Dict:
+        return {
+            "processes": self.processes,
+            "pending": self.pending,
+            "max_queue": self.max_queue,
+            "rendered": self.rendered,
+            "rejected": self.rejected,
+            "timeouts": self.timeouts,
+            "failures": self.failures
+        }
+
+
+pdf_renderer = PdfRenderer(
+    settings.PDF_RENDER_PROCESSES or os.cpu_count() or 1,
+    settings.PDF_RENDER_MAX_QUEUE,
+    settings.PDF_RENDER_TIMEOUT_SECONDS
+)
@@ -0,0 +1,143 @@
+import asyncio
+import hashlib
+import json
+from typing import Dict, List, Optional, Set
+from sqlalchemy.orm import Session, selectinload
+from ..config import settings
+from ..database import SessionLocal
+from ..models.test import TestAttempt
+from .analysis_store import load_analyses
+from .artifact_store import ArtifactKey, StoredArtifact, artifact_store
+from .pdf_renderer import RendererBusyError, pdf_renderer
+
+
+# Bump when a generator's layout changes so stored PDFs are rendered again
+PDF_LAYOUT_VERSION = 1
+
+# Renders in progress in this process, so concurrent downloads share one
+_in_flight: Dict[str, asyncio.Task] = {}
+_prerender_tasks: Set[asyncio.Task] = set()
+
+
+class PdfRequest:
+    """The inputs of one result PDF, the file name it downloads as, and its artifact key"""
+
+    def __init__(self, test_id: int, kind: str, model_name: Optional[str], filename: str, params: Dict):
+        self.kind = kind
+        self.filename = filename
+        self.params = params
+        payload = json.dumps(
+            {"kind": kind, "layout": PDF_LAYOUT_VERSION, "params": params},
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str
+        )
+        self.key = ArtifactKey(test_id, kind, model_name, hashlib.sha256(payload.encode("utf-8")).hexdigest())
+
+
+def _user_name(test: TestAttempt) -> str:
+    return test.user.full_name if test.user else "Guest User"
+
+
+def certificate_request(test: TestAttempt) -> PdfRequest:
+    user_name = _user_name(test)
+    return PdfRequest(test.id, "certificate", None, f"INDX1000_Certificate_{user_name.replace(' ', '_')}_{test.id}.pdf", {
+        "user_name": user_name,
+        "email": test.user.email if test.user else "N/A",
+        "test_name": test.test_name,
+        "score": test.score,
+        "completed_at": test.completed.isoformat()
+    })
+
+
+def qa_request(test: TestAttempt) -> PdfRequest:
+    user_name = _user_name(test)
+    return PdfRequest(test.id, "qa", None, f"INDX1000_QA_{user_name.replace(' ', '_')}_{test.id}.pdf", {
+        "test_name": test.test_name,
+        "user_name": user_name,
+        "completed_at": test.completed.isoformat(),
+        "questions": test.questions,
+        "answers": test.answers
+    })
+
+
+def qaa_request(test: TestAttempt, model_name: str, analysis: Dict) -> PdfRequest:
+    user_name = _user_name(test)
+    filename = f"INDX1000_QAA_{model_name.upper()}_{user_name.replace(' ', '_')}_{test.id}.pdf"
+    return PdfRequest(test.id, "qaa", model_name, filename, {
+        "test_name": test.test_name,
+        "user_name": user_name,
+        "completed_at": test.completed.isoformat(),
+        "questions": test.questions,
+        "answers": test.answers,
+        "analysis": analysis,
+        "model_name": model_name.upper(),
+        "score": analysis.get("overall_score", test.score)
+    })
+
+
+def result_pdf_requests(db: Session, test: TestAttempt) -> List[PdfRequest]:
+    """Every PDF a completed test offers for download"""
+    requests = []
+    if test.score:
+        requests.append(certificate_request(test))
+    if test.answers:
+        requests.append(qa_request(test))
+        for model_name, analysis in load_analyses(db, test).items():
+            if analysis and "error" not in analysis:
+                requests.append(qaa_request(test, model_name, analysis))
+    return requests
+
+
+async def _render_and_store(request: PdfRequest, background: bool) -> StoredArtifact:
+    content = await pdf_renderer.render(request.kind, request.params, background=background)
+    return await asyncio.get_running_loop().run_in_executor(None, artifact_store.put, request.key, content)
+
+
+async def get_pdf(request: PdfRequest, background: bool = False) -> StoredArtifact:
+    """
+    The stored PDF for these inputs, rendered (once) if it is not stored yet.
+    Raises RendererBusyError or asyncio.TimeoutError from the render pool.
+    """
+    artifact = artifact_store.get(request.key)
+    if artifact:
+        return artifact
+
+    name = f"{request.key.test_id}/{request.key.name}"
+    task = _in_flight.get(name)
+    if task is None:
+        # A task of its own: a download that disconnects does not cancel the render
+        task = asyncio.ensure_future(_render_and_store(request, background))
+        _in_flight[name] = task
+        task.add_done_callback(lambda _: _in_flight.pop(name, None))
+    return await asyncio.shield(task)
+
+
+async def prerender_result_pdfs(test_id: int):
+    """Render the PDFs of a freshly completed test ahead of the first download"""
+    db = SessionLocal()
+    try:
+        test = db.query(TestAttempt).options(selectinload(TestAttempt.user)).filter(TestAttempt.id == test_id).first()
+        if not test or not test.completed:
+            return
+        requests = result_pdf_requests(db, test)
+    finally:
+        db.close()
+
+    for request in requests:
+        try:
+            await get_pdf(request, background=True)
+        except RendererBusyError:
+            print(f"Renderer busy, PDFs of test {test_id} will render on download")
+            return
+        except Exception as e:
+            print(f"Pre-rendering {request.key.name} of test {test_id} failed: {e}")
+
+
+def schedule_prerender(test_id: int):
+    """Start prerender_result_pdfs in the background (ARTIFACT_PRERENDER)"""
+    if not settings.ARTIFACT_PRERENDER:
+        return
+    task = asyncio.create_task(prerender_result_pdfs(test_id))
+    _prerender_tasks.add(task)  # keep a reference until it finishes
+    task.add_done_callback(_prerender_tasks.discard)
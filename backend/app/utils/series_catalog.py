@@ -0,0 +1,148 @@
+import hashlib
+import json
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from ..models.series import Series, SeriesVersion, cache_version
+from .http_cache import make_etag
+
+
+CATALOG_PATH = Path(__file__).resolve().parent.parent / "data" / "demo_series.json"
+
+# Series offered to guests and regular users; admins see the whole catalog
+PUBLIC_SERIES_IDS = (
+    "series_25_a",
+    "series_25_f",
+    "series_25_g",
+    "series_25_h",
+    "series_25_i",
+    "series_15_j",
+    "series_1_k",
+)
+
+
+class Listing:
+    """A pre-serialized /series response body and its ETag"""
+
+    def __init__(self, series_ids):
+        payload = {
+            "series": [
+                {
+                    "id": series_id,
+                    "title": SERIES[series_id]["title"],
+                    "description": SERIES[series_id]["description"],
+                    "question_count": len(SERIES[series_id]["questions"])
+                }
+                for series_id in series_ids
+            ]
+        }
+        self.body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.etag = make_etag(self.body)
+
+
+def _load() -> Mapping[str, Dict]:
+    with open(CATALOG_PATH, encoding="utf-8") as f:
+        return MappingProxyType(json.load(f))
+
+
+# Loaded once per process; the catalog only changes with a deploy
+SERIES: Mapping[str, Dict] = _load()
+
+PUBLIC_LISTING = Listing(PUBLIC_SERIES_IDS)
+ADMIN_LISTING = Listing(SERIES.keys())
+
+# series_id -> {question_id: question}
+QUESTION_MAPS: Mapping[str, Mapping[int, Dict]] = MappingProxyType({
+    series_id: MappingProxyType({q["question_id"]: q for q in series["questions"]})
+    for series_id, series in SERIES.items()
+})
+
+# series_id -> pre-serialized {"id", "title", "description", "questions"} and its ETag
+SERIES_BODIES: Mapping[str, bytes] = MappingProxyType({
+    series_id: json.dumps({"id": series_id, **series}, ensure_ascii=False).encode("utf-8")
+    for series_id, series in SERIES.items()
+})
+SERIES_ETAGS: Mapping[str, str] = MappingProxyType({
+    series_id: make_etag(body) for series_id, body in SERIES_BODIES.items()
+})
+
+
+def get_series(series_id: str) -> Optional[Dict]:
+    return SERIES.get(series_id)
+
+
+def get_questions(series_id: str) -> List[Dict]:
+    return SERIES[series_id]["questions"]
+
+
+def get_question(series_id: str, question_id: int) -> Optional[Dict]:
+    questions = QUESTION_MAPS.get(series_id)
+    return questions.get(question_id) if questions else None
+
+
+def get_listing(admin: bool) -> Listing:
+    return ADMIN_LISTING if admin else PUBLIC_LISTING
+
+
+# series_id -> version new attempts reference (filled by sync_series_catalog)
+_current_versions: Dict[str, int] = {}
+
+
+def content_hash(series: Dict) -> str:
+    payload = json.dumps(
+        {"title": series["title"], "description": series.get("description"), "questions": series["questions"]},
+        sort_keys=True,
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def sync_series_catalog(db: Session) -> Dict[str, int]:
+    """
+    Store the catalog in the series tables: a series whose content differs
+    from its current stored version gets a new version (attempts keep the
+    version they started on). Then warm the version cache. Commits.
+    """
+    for series_id, series in SERIES.items():
+        digest = content_hash(series)
+        row = db.query(Series).filter(Series.id == series_id).first()
+        if row:
+            current = db.query(SeriesVersion).filter(
+                SeriesVersion.series_id == series_id,
+                SeriesVersion.version == row.current_version
+            ).first()
+            if current and current.content_hash == digest:
+                continue
+
+        latest = db.query(func.max(SeriesVersion.version)).filter(SeriesVersion.series_id == series_id).scalar() or 0
+        if row is None:
+            row = Series(id=series_id)
+            db.add(row)
+        row.current_version = latest + 1
+        db.add(SeriesVersion(
+            series_id=series_id,
+            version=latest + 1,
+            title=series["title"],
+            description=series.get("description"),
+            questions=series["questions"],
+            content_hash=digest
+        ))
+        try:
+            db.commit()
+            print(f"Series {series_id}: stored version {latest + 1}")
+        except IntegrityError:
+            db.rollback()  # another process stored it first
+
+    for version in db.query(SeriesVersion).all():
+        cache_version(version)
+    _current_versions.clear()
+    _current_versions.update({row.id: row.current_version for row in db.query(Series).all()})
+    return dict(_current_versions)
+
+
+def current_version(series_id: str) -> Optional[int]:
+    """Version new attempts of a series should reference (None if the catalog isn't synced)"""
+    return _current_versions.get(series_id)
@@ -0,0 +1,76 @@
+from typing import Dict
+from sqlalchemy.orm import Session
+from ..models.test import TestAttempt
+from ..models.test_summary import TestSummary, TestSummaryEngineScore
+from .analysis_store import load_analyses
+
+
+def engine_scores(db: Session, test: TestAttempt) -> Dict[str, float]:
+    """{engine: overall_score} for engines that produced a score"""
+    if not test.analysis:
+        return {}
+    try:
+        analyses = load_analyses(db, test, include_questions=False)
+    except ValueError:
+        return {}
+    return {
+        engine: analysis["overall_score"]
+        for engine, analysis in analyses.items()
+        if isinstance(analysis, dict) and analysis.get("overall_score") is not None
+    }
+
+
+def _store_engine_scores(db: Session, test_id: int, scores: Dict[str, float]):
+    rows = {
+        row.engine: row
+        for row in db.query(TestSummaryEngineScore).filter(TestSummaryEngineScore.test_id == test_id)
+    }
+    for engine, row in rows.items():
+        if engine not in scores:
+            db.delete(row)
+    for engine, score in scores.items():
+        if engine in rows:
+            rows[engine].score = score
+        else:
+            db.add(TestSummaryEngineScore(test_id=test_id, engine=engine, score=score))
+
+
+def refresh_test_summary(db: Session, test: TestAttempt) -> TestSummary:
+    """Recompute a test's summary row from the attempt (the caller commits)"""
+    db.flush()
+    summary = db.query(TestSummary).filter(TestSummary.test_id == test.id).first()
+    if summary is None:
+        summary = TestSummary(test_id=test.id)
+        db.add(summary)
+
+    answer_lengths = [len(a.get("answer_text") or "") for a in (test.answers or [])]
+
+    summary.user_id = test.user_id
+    summary.user_email = test.user.email if test.user else None
+    summary.user_full_name = test.user.full_name if test.user else None
+    summary.test_name = test.test_name
+    summary.category = test.category
+    summary.level = test.level
+    summary.status = "completed" if test.completed else ("submitted" if answer_lengths else "started")
+    summary.score = test.score
+    summary.engine_scores = engine_scores(db, test)
+    _store_engine_scores(db, test.id, summary.engine_scores)
+    summary.question_count = len(test.questions or [])
+    summary.answer_count = len(answer_lengths)
+    summary.answer_chars_total = sum(answer_lengths)
+    summary.answer_chars_avg = sum(answer_lengths) / len(answer_lengths) if answer_lengths else 0
+    summary.answer_chars_max = max(answer_lengths, default=0)
+    summary.created_at = test.created_at
+    summary.completed_at = test.completed
+    summary.completion_seconds = (
+        (test.completed - test.created_at).total_seconds() if test.completed and test.created_at else None
+    )
+    summary.email_sent = bool(test.email_sent)
+    summary.email_sent_at = test.email_sent_at
+    return summary
+
+
+def refresh_test_summary_by_id(db: Session, test_id: int):
+    test = db.query(TestAttempt).filter(TestAttempt.id == test_id).first()
+    if test:
+        refresh_test_summary(db, test)
@@ -0,0 +1,49 @@
+# backend/batch_scoring.py
+# Offline grading of pending tests through the OpenAI Batch API.
+#   python batch_scoring.py submit [--limit N] [--test-id ID ...]
+#   python batch_scoring.py poll [--wait SECONDS]
+# Set OPENAI_BATCH_BASE_URL=http://localhost:8100/v1 and run
+# batch_stub_server.py to exercise the pipeline without the real API.
+import argparse
+import asyncio
+import app.models.user  # noqa: F401 - registers User for TestAttempt's relationship
+from app.database import AsyncSessionLocal
+from app.utils.batch_scoring import submit_pending, poll_batches
+from app.utils.llm_clients import close_clients
+
+async def submit(args):
+    async with AsyncSessionLocal() as db:
+        batch = await submit_pending(db, args.test_id, args.limit)
+        if batch:
+            print(f"Submitted batch {batch.id} ({batch.provider_batch_id}): {len(batch.test_ids)} tests, {batch.request_count} requests")
+        else:
+            print("No pending tests to score")
+
+async def poll(args):
+    async with AsyncSessionLocal() as db:
+        while True:
+            batches = await poll_batches(db)
+            for batch in batches:
+                print(f"Batch {batch.id} [{batch.stage}] {batch.status.value} (provider: {batch.provider_status})"
+                      + (f" - {batch.error}" if batch.error else ""))
+            if not args.wait or not batches:
+                break
+            await asyncio.sleep(args.wait)
+
+async def main():
+    parser = argparse.ArgumentParser(description="Offline Batch API scoring")
+    commands = parser.add_subparsers(dest="command", required=True)
+    submit_parser = commands.add_parser("submit", help="submit pending tests")
+    submit_parser.add_argument("--limit", type=int, default=None)
+    submit_parser.add_argument("--test-id", type=int, action="append", help="re-analyse a specific test")
+    poll_parser = commands.add_parser("poll", help="poll submitted batches and write results back")
+    poll_parser.add_argument("--wait", type=float, default=0, help="keep polling every N seconds until all batches finish")
+    args = parser.parse_args()
+
+    try:
+        await (submit(args) if args.command == "submit" else poll(args))
+    finally:
+        await close_clients()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,96 @@
+# backend/batch_stub_server.py
+# Local stand-in for the OpenAI files + batches endpoints used by the offline
+# scoring pipeline. Batches complete on the first retrieve with deterministic
+# fake scores, so the pipeline can be tested end to end without API calls:
+#   uvicorn batch_stub_server:app --port 8100
+#   OPENAI_BATCH_BASE_URL=http://localhost:8100/v1 python batch_scoring.py submit
+import hashlib
+import json
+import re
+import time
+import uuid
+from fastapi import FastAPI, File, Form, HTTPException, UploadFile
+from fastapi.responses import PlainTextResponse
+
+app = FastAPI(title="OpenAI Batch API stand-in")
+
+files = {}    # file id -> {"meta": file object, "content": str}
+batches = {}  # batch id -> batch object
+
+
+def fake_completion(body: dict) -> str:
+    """Deterministic reply shaped like the real prompts expect"""
+    prompt = body["messages"][-1]["content"]
+    match = re.search(r'"question_number": (\d+)', prompt)
+    if match:
+        score = int(hashlib.sha256(prompt.encode()).hexdigest(), 16) % 101
+        return json.dumps({"question_number": int(match.group(1)), "score": score, "feedback": "Stub feedback"})
+    return json.dumps({
+        "index": ["Stub index item"] * 7,
+        "analysis": "Stub analysis paragraph.\n\nSecond paragraph.",
+        "operational_projection": "Stub projection."
+    })
+
+
+def store_file(content: str, filename: str, purpose: str) -> dict:
+    file_id = f"file-{uuid.uuid4().hex[:24]}"
+    meta = {
+        "id": file_id, "object": "file", "bytes": len(content.encode()), "created_at": int(time.time()),
+        "filename": filename, "purpose": purpose, "status": "processed"
+    }
+    files[file_id] = {"meta": meta, "content": content}
+    return meta
+
+
+@app.post("/v1/files")
+async def upload_file(file: UploadFile = File(...), purpose: str = Form(...)):
+    content = (await file.read()).decode("utf-8")
+    return store_file(content, file.filename or "upload.jsonl", purpose)
+
+
+@app.get("/v1/files/{file_id}/content", response_class=PlainTextResponse)
+async def file_content(file_id: str):
+    if file_id not in files:
+        raise HTTPException(status_code=404, detail="File not found")
+    return files[file_id]["content"]
+
+
+@app.post("/v1/batches")
+async def create_batch(request: dict):
+    if request.get("input_file_id") not in files:
+        raise HTTPException(status_code=400, detail="Unknown input_file_id")
+    batch_id = f"batch_{uuid.uuid4().hex[:24]}"
+    batches[batch_id] = {
+        "id": batch_id, "object": "batch", "endpoint": request["endpoint"], "errors": None,
+        "input_file_id": request["input_file_id"], "completion_window": request["completion_window"],
+        "status": "validating", "output_file_id": None, "error_file_id": None,
+        "created_at": int(time.time()), "request_counts": {"total": 0, "completed": 0, "failed": 0}
+    }
+    return batches[batch_id]
+
+
+@app.get("/v1/batches/{batch_id}")
+async def retrieve_batch(batch_id: str):
+    batch = batches.get(batch_id)
+    if not batch:
+        raise HTTPException(status_code=404, detail="Batch not found")
+
+    if batch["status"] == "validating":
+        lines = [json.loads(line) for line in files[batch["input_file_id"]]["content"].splitlines() if line.strip()]
+        output = [
+            json.dumps({
+                "id": f"batch_req_{uuid.uuid4().hex[:16]}",
+                "custom_id": line["custom_id"],
+                "response": {
+                    "status_code": 200,
+                    "body": {"choices": [{"index": 0, "message": {"role": "assistant", "content": fake_completion(line["body"])}}]}
+                },
+                "error": None
+            })
+            for line in lines
+        ]
+        batch["output_file_id"] = store_file("\n".join(output), f"{batch_id}_output.jsonl", "batch_output")["id"]
+        batch["status"] = "completed"
+        batch["completed_at"] = int(time.time())
+        batch["request_counts"] = {"total": len(lines), "completed": len(lines), "failed": 0}
+    return batch
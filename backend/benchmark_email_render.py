@@ -0,0 +1,86 @@
+# backend/benchmark_email_render.py
+"""
+Micro-benchmark of result email rendering, as done for every email of a
+bulk dispatch: the Jinja templates (HTML + plain text) and the MIME
+message built by the sender.
+
+    python benchmark_email_render.py [--emails 5000] [--paragraphs 6]
+
+Also times template loading in a fresh process with an empty and with a
+warm bytecode cache (EMAIL_TEMPLATE_CACHE_DIR), i.e. a worker's first email.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from app.utils.email_service import build_message, render_result_email, result_email_subject
+
+COLD_START = """
+import time
+from app.utils.email_service import static_email_parts, templates
+start = time.perf_counter()
+static_email_parts()
+templates.get_template("email/result.html")
+templates.get_template("email/result.txt")
+print(time.perf_counter() - start)
+"""
+
+
+def synthetic_analysis(number: int, paragraphs: int) -> dict:
+    sentence = f"Analyse {number} : lecture des trajectoires cognitives et de leurs points d'appui. "
+    return {
+        "index": [f"Repère {number}.{i}" for i in range(1, 8)],
+        "analysis": "\n\n".join(sentence * 4 for _ in range(paragraphs)),
+        "operational_projection": sentence * 3
+    }
+
+
+def time_cold_start(cache_dir: str) -> float:
+    """Template loading time of a new process sharing the given bytecode cache"""
+    result = subprocess.run(
+        [sys.executable, "-c", COLD_START], env={**os.environ, "EMAIL_TEMPLATE_CACHE_DIR": cache_dir},
+        capture_output=True, text=True, check=True
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure result email render cost")
+    parser.add_argument("--emails", type=int, default=5000)
+    parser.add_argument("--paragraphs", type=int, default=6, help="analysis paragraphs per email")
+    args = parser.parse_args()
+
+    analyses = [synthetic_analysis(i, args.paragraphs) for i in range(args.emails)]
+    completed_at = datetime.utcnow().isoformat()
+
+    render_result_email("Warm Up", "Série", 0, 500, analyses[0], completed_at)
+
+    start = time.perf_counter()
+    bodies = [
+        render_result_email(f"Candidat {i}", "Série de démonstration", i, 400 + i % 600, analysis, completed_at)
+        for i, analysis in enumerate(analyses)
+    ]
+    render_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i, (html_body, text_body) in enumerate(bodies):
+        build_message(f"user{i}@example.com", result_email_subject("Série de démonstration"), html_body, text_body).as_bytes()
+    mime_seconds = time.perf_counter() - start
+
+    html_size = sum(len(html) for html, _ in bodies) / len(bodies)
+    text_size = sum(len(text) for _, text in bodies) / len(bodies)
+    print(f"{args.emails} emails, {html_size / 1024:.1f} KB HTML + {text_size / 1024:.1f} KB text each")
+    print(f"Render (HTML + text):  {render_seconds * 1e6 / args.emails:8.1f} µs/email  {args.emails / render_seconds:10.0f} emails/s")
+    print(f"MIME message:          {mime_seconds * 1e6 / args.emails:8.1f} µs/email  {args.emails / mime_seconds:10.0f} emails/s")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cold = time_cold_start(cache_dir)
+        warm = time_cold_start(cache_dir)
+    print(f"Template load in a new process: {cold * 1000:.1f} ms (empty bytecode cache), {warm * 1000:.1f} ms (warm)")
+
+
+if __name__ == "__main__":
+    main()
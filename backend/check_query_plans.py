@@ -0,0 +1,172 @@
+# backend/check_query_plans.py
+"""
+Query-plan regression check for the hot TestAttempt access paths.
+
+Runs EXPLAIN on the queries behind the dashboard, the per-user dashboard,
+the unsent-email filter, the result/job lookups and the sequence analysis
+lookup, and fails if one of them stops using its index (or falls back to a
+sequential scan of a large table). PostgreSQL only; point it at a scratch
+database, e.g. a local stand-in:
+
+    DATABASE_URL=postgresql://postgres@/plans?host=/tmp/pg python check_query_plans.py --seed 200000
+
+--seed migrates an EMPTY database to head and fills it with synthetic rows
+first, so the planner sees production-sized tables.
+"""
+import argparse
+import json
+import sys
+from datetime import datetime, timedelta
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import and_, or_, select, text
+from app.database import engine
+from app.models.user import User
+from app.models.test import TestAttempt
+from app.models.analysis_job import AnalysisJob, JobStatus
+from app.models.sequence_analysis import SequenceAnalysis
+from app.routes.test import DASHBOARD_PAGE_SIZE
+
+DASHBOARD_PAGE = DASHBOARD_PAGE_SIZE + 1  # one extra row tells routes/test.py there is a next page
+
+# Tables that must never be read with a sequential scan by these queries
+LARGE_TABLES = {"test_attempts", "analysis_jobs", "sequence_analyses"}
+
+SEED_SQL = [
+    """INSERT INTO users (id, email, username, full_name, hashed_password, is_active, created_at)
+       SELECT g, 'plan' || g || '@example.com', 'plan' || g, 'Plan Check ' || g, '!', true, now()
+       FROM generate_series(1, :users) g""",
+    """INSERT INTO test_attempts (id, user_id, category, level, test_name, questions, answers,
+                                  score, completed, created_at, email_sent, email_sent_at)
+       SELECT g, 1 + g % :users,
+              (enum_range(NULL::testcategory))[1 + g % 5],
+              (enum_range(NULL::testlevel))[1 + g % 5],
+              'Plan check series ' || g % 14, '[]', '[{"question_id": 1, "answer": "a"}]',
+              (g * 7919) % 1000, CASE WHEN g % 10 <> 0 THEN now() - make_interval(mins => :rows - g) END,
+              now() - make_interval(mins => :rows - g),
+              g % 500 <> 1, CASE WHEN g % 500 <> 1 THEN now() END  -- most results get emailed
+       FROM generate_series(1, :rows) g""",
+    """INSERT INTO analysis_jobs (id, test_id, kind, status, attempts, created_at, updated_at)
+       SELECT g, g, 'test', CASE WHEN g > :rows - 5 THEN 'QUEUED'::jobstatus ELSE 'COMPLETED'::jobstatus END,
+              1, now() - make_interval(mins => :rows - g), now()
+       FROM generate_series(1, :rows) g""",
+    """INSERT INTO sequence_analyses (test_id, model_name, sequence_number, field_1, created_at)
+       SELECT t, 'gpt-4o', s, 'field', now()
+       FROM generate_series(1, :rows, 5) t, generate_series(1, 5) s""",
+    "SELECT setval('users_id_seq', :users)",
+    "SELECT setval('test_attempts_id_seq', :rows)",
+    "SELECT setval('analysis_jobs_id_seq', :rows)",
+]
+
+
+def plan_checks(rows: int):
+    """(name, query, indexes one of which the plan must use) for each hot access path"""
+    newest_first = (TestAttempt.created_at.desc(), TestAttempt.id.desc())
+    cursor_at = datetime.utcnow() - timedelta(minutes=rows // 2)
+    cursor_id = rows // 2
+    unsent = or_(TestAttempt.email_sent.is_(False), TestAttempt.email_sent.is_(None))
+
+    return [
+        ("dashboard first page",
+         select(TestAttempt).order_by(*newest_first).limit(DASHBOARD_PAGE),
+         {"ix_test_attempts_created_at_id"}),
+        ("dashboard keyset page",
+         select(TestAttempt).where(or_(
+             TestAttempt.created_at < cursor_at,
+             and_(TestAttempt.created_at == cursor_at, TestAttempt.id < cursor_id)
+         )).order_by(*newest_first).limit(DASHBOARD_PAGE),
+         {"ix_test_attempts_created_at_id"}),
+        ("user dashboard",
+         select(TestAttempt).where(TestAttempt.user_id == 42).order_by(*newest_first).limit(DASHBOARD_PAGE),
+         {"ix_test_attempts_user_created_at_id"}),
+        ("unsent result emails",
+         select(TestAttempt).where(unsent, TestAttempt.completed.isnot(None)).order_by(*newest_first).limit(DASHBOARD_PAGE),
+         # Recent unsent results are found fastest walking the dashboard index;
+         # old stragglers through the email_sent index - either is fine
+         {"ix_test_attempts_email_sent_created_at", "ix_test_attempts_created_at_id"}),
+        ("test ownership lookup",
+         select(TestAttempt).where(TestAttempt.id == cursor_id, TestAttempt.user_id == 42),
+         {"test_attempts_pkey", "ix_test_attempts_id"}),
+        ("latest analysis job",
+         select(AnalysisJob).where(AnalysisJob.test_id == cursor_id).order_by(AnalysisJob.id.desc()).limit(1),
+         {"ix_analysis_jobs_test_id_id"}),
+        ("active analysis job",
+         select(AnalysisJob).where(
+             AnalysisJob.test_id == cursor_id,
+             AnalysisJob.status.in_([JobStatus.QUEUED, JobStatus.RUNNING])
+         ).order_by(AnalysisJob.id.desc()).limit(1),
+         {"ix_analysis_jobs_test_id_id"}),
+        ("worker queue poll",
+         select(AnalysisJob.id, AnalysisJob.status).where(
+             AnalysisJob.status == JobStatus.QUEUED
+         ).order_by(AnalysisJob.created_at).limit(10),
+         {"ix_analysis_jobs_status_created_at"}),
+        ("sequence analyses of a test",
+         select(SequenceAnalysis).where(
+             SequenceAnalysis.test_id == 1,
+             SequenceAnalysis.model_name == "gpt-4o"
+         ).order_by(SequenceAnalysis.sequence_number),
+         {"uix_test_model_seq"}),
+    ]
+
+
+def plan_nodes(node: dict):
+    yield node
+    for child in node.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def explain(conn, query) -> dict:
+    compiled = query.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True})
+    result = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}").scalar()
+    return (result if isinstance(result, list) else json.loads(result))[0]["Plan"]
+
+
+def seed(rows: int, users: int):
+    with engine.connect() as conn:
+        existing = conn.execute(text("SELECT count(*) FROM test_attempts")).scalar()
+    if existing:
+        sys.exit(f"❌ Refusing to seed: test_attempts already has {existing} rows")
+
+    print(f"Seeding {rows} test attempts for {users} users...")
+    with engine.begin() as conn:
+        for statement in SEED_SQL:
+            conn.execute(text(statement), {"rows": rows, "users": users})
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("ANALYZE"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that hot queries keep using their indexes")
+    parser.add_argument("--seed", type=int, metavar="ROWS", help="migrate an empty database and seed ROWS synthetic attempts")
+    parser.add_argument("--users", type=int, default=2000, help="synthetic users to spread seeded attempts over")
+    args = parser.parse_args()
+
+    if engine.dialect.name != "postgresql":
+        sys.exit(f"❌ Query plans are checked on PostgreSQL only (DATABASE_URL is {engine.dialect.name})")
+
+    if args.seed:
+        command.upgrade(Config("alembic.ini"), "head")
+        seed(args.seed, args.users)
+
+    with engine.connect() as conn:
+        rows = conn.execute(text("SELECT count(*) FROM test_attempts")).scalar()
+        failures = 0
+        for name, query, expected in plan_checks(rows):
+            nodes = list(plan_nodes(explain(conn, query)))
+            indexes = {n["Index Name"] for n in nodes if "Index Name" in n}
+            seq_scans = {n["Relation Name"] for n in nodes if n["Node Type"] == "Seq Scan"} & LARGE_TABLES
+            summary = ", ".join(f"{n['Node Type']} {n.get('Index Name', n.get('Relation Name', ''))}".strip() for n in nodes)
+            if indexes & expected and not seq_scans:
+                print(f"✅ {name}: {summary}")
+            else:
+                failures += 1
+                print(f"❌ {name}: expected {' or '.join(sorted(expected))}, got {summary}")
+
+    if failures:
+        sys.exit(f"{failures} query plan regression(s) on {rows} test attempts")
+    print(f"All query plans use their indexes ({rows} test attempts)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,54 @@
 # backend/create_tables.py
+"""
+Bring the database schema up to date with the Alembic migrations in
+alembic/versions. Databases created by the old create_all() version of this
+script are stamped at the baseline revision first, then upgraded.
+Run from the backend directory: python create_tables.py
+"""
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
 from app.database import engine, Base
 from app.models.user import User
 from app.models.test import TestAttempt
+from app.models.sequence_analysis import SequenceAnalysis
+from app.models.analysis_job import AnalysisJob
+from app.models.llm_cache import LLMCacheEntry
+from app.models.scoring_batch import ScoringBatch
+from app.models.engine_result import EngineResult, QuestionScore
+from app.models.test_summary import TestSummary, TestSummaryEngineScore
+from app.models.series import Series, SeriesVersion
+from app.models.email_outbox import EmailDispatch, EmailOutbox
 
-print("Creating database tables...")
+BASELINE_REVISION = "0001"
+
+
+def stamp_legacy_database(config: Config):
+    """
+    Mark a pre-migration database as being at the baseline revision, so the
+    upgrade that follows adds everything introduced since
+    """
+    tables = set(inspect(engine).get_table_names())
+    if "alembic_version" in tables or "test_attempts" not in tables:
+        return
+
+    print("Existing database without migration history, stamping baseline...")
+    # The old script only imported User and TestAttempt, so sequence_analyses
+    # (part of the baseline) may be missing
+    if "sequence_analyses" not in tables:
+        SequenceAnalysis.__table__.create(bind=engine)
+    command.stamp(config, BASELINE_REVISION)
+
+
+print("Migrating database schema...")
 
 try:
-    # This will create all tables defined in your models
-    Base.metadata.create_all(bind=engine)
-    print("✅ All tables created successfully!")
-    print("\nTables created:")
-    print("- users")
-    print("- test_attempts")
+    config = Config("alembic.ini")
+    stamp_legacy_database(config)
+    command.upgrade(config, "head")
+    print("✅ Database schema is up to date!")
+    print("\nTables:")
+    for table in sorted(Base.metadata.tables):
+        print(f"- {table}")
 except Exception as e:
-    print(f"❌ Error creating tables: {e}")
\ No newline at end of file
+    print(f"❌ Error migrating database: {e}")
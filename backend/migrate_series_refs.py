@@ -0,0 +1,50 @@
+# backend/migrate_series_refs.py
+# Move demo attempts from copied question JSON to series version references:
+#   1. store the catalog (utils/series_catalog.py) as series versions
+#   2. point existing attempts whose questions match a stored version at it
+#      and drop their copy
+# The series tables and columns come from migration 0002: run create_tables.py first.
+import sys
+from sqlalchemy import inspect
+from app.database import engine, SessionLocal
+from app.models.user import User
+from app.models.test import TestAttempt
+from app.models.series import Series, SeriesVersion
+from app.utils.series_catalog import sync_series_catalog
+
+BATCH_SIZE = 500
+
+existing = {column["name"] for column in inspect(engine).get_columns("test_attempts")}
+if not {"series_id", "series_version"} <= existing:
+    sys.exit("❌ test_attempts has no series reference columns, run create_tables.py first")
+
+db = SessionLocal()
+try:
+    sync_series_catalog(db)
+
+    # title -> stored versions of series with that title
+    versions = {}
+    for version in db.query(SeriesVersion).all():
+        versions.setdefault(version.title, []).append(version)
+
+    last_id, moved = 0, 0
+    while True:
+        tests = db.query(TestAttempt).filter(
+            TestAttempt.id > last_id,
+            TestAttempt.series_id.is_(None)
+        ).order_by(TestAttempt.id).limit(BATCH_SIZE).all()
+        if not tests:
+            break
+        last_id = tests[-1].id
+        for test in tests:
+            match = next((v for v in versions.get(test.test_name, []) if v.questions == test.stored_questions), None)
+            if match:
+                test.series_id = match.series_id
+                test.series_version = match.version
+                test.stored_questions = []
+                moved += 1
+        db.commit()
+        db.expunge_all()
+    print(f"✅ {moved} attempts now reference a series version")
+finally:
+    db.close()
@@ -0,0 +1,26 @@
+# backend/rebuild_test_summaries.py
+# Backfill (or rebuild) the test_summaries table from existing test attempts.
+from app.database import SessionLocal
+from app.models.user import User
+from app.models.test import TestAttempt
+from app.utils.test_summary import refresh_test_summary
+
+BATCH_SIZE = 500
+
+db = SessionLocal()
+try:
+    last_id, count = 0, 0
+    while True:
+        tests = db.query(TestAttempt).filter(TestAttempt.id > last_id).order_by(TestAttempt.id).limit(BATCH_SIZE).all()
+        if not tests:
+            break
+        last_id = tests[-1].id
+        for test in tests:
+            refresh_test_summary(db, test)
+        db.commit()
+        db.expunge_all()
+        count += len(tests)
+        print(f"{count} test summaries rebuilt...")
+    print(f"✅ Done: {count} test summaries")
+finally:
+    db.close()
@@ -0,0 +1,98 @@
+# backend/smtp_stub_server.py
+# Local stand-in for the SMTP provider used by the email sender. Accepts any
+# login, discards messages and logs one line per delivery, so the outbox can
+# be exercised end to end without sending real mail:
+#   python smtp_stub_server.py --port 2525 [--latency 0.05] [--fail-every 10]
+#   SMTP_HOST=localhost SMTP_PORT=2525 SMTP_SECURITY=none uvicorn app.main:app
+# Recipients containing "reject" get a permanent 550; --fail-every N answers
+# every Nth message with a temporary 451 to exercise retries.
+import argparse
+import asyncio
+import itertools
+
+connection_ids = itertools.count(1)
+message_ids = itertools.count(1)
+
+
+async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, args):
+    connection = next(connection_ids)
+    recipients = []
+    sent_in_session = 0
+
+    async def reply(line: str):
+        writer.write(f"{line}\r\n".encode())
+        await writer.drain()
+
+    await reply("220 smtp-stub ESMTP ready")
+    try:
+        while True:
+            raw = await reader.readline()
+            if not raw:
+                break
+            line = raw.decode(errors="replace").rstrip("\r\n")
+            verb = line.split(" ", 1)[0].upper()
+
+            if verb == "EHLO":
+                await reply("250-smtp-stub")
+                await reply("250-AUTH PLAIN LOGIN")
+                await reply("250 8BITMIME")
+            elif verb == "HELO":
+                await reply("250 smtp-stub")
+            elif verb == "AUTH":
+                if line.upper().startswith("AUTH LOGIN"):
+                    await reply("334 VXNlcm5hbWU6")
+                    await reader.readline()
+                    await reply("334 UGFzc3dvcmQ6")
+                    await reader.readline()
+                await reply("235 2.7.0 Authentication successful")
+            elif verb == "MAIL":
+                recipients = []
+                await reply("250 2.1.0 OK")
+            elif verb == "RCPT":
+                address = line.split(":", 1)[1].strip().strip("<>")
+                if "reject" in address:
+                    await reply("550 5.1.1 Recipient address rejected")
+                else:
+                    recipients.append(address)
+                    await reply("250 2.1.5 OK")
+            elif verb == "DATA":
+                await reply("354 End data with <CR><LF>.<CR><LF>")
+                while (await reader.readline()) not in (b".\r\n", b".\n", b""):
+                    pass
+                if args.latency:
+                    await asyncio.sleep(args.latency)
+                number = next(message_ids)
+                sent_in_session += 1
+                if args.fail_every and number % args.fail_every == 0:
+                    await reply("451 4.3.0 Temporary failure, try again later")
+                    print(f"Deferred message {number} for {', '.join(recipients)} (connection {connection})")
+                else:
+                    await reply(f"250 2.0.0 OK queued as stub-{number}")
+                    print(f"Accepted message {number} for {', '.join(recipients)} (connection {connection}, #{sent_in_session})")
+            elif verb in ("RSET", "NOOP"):
+                await reply("250 2.0.0 OK")
+            elif verb == "QUIT":
+                await reply("221 2.0.0 Bye")
+                break
+            else:
+                await reply("502 5.5.2 Command not recognized")
+    finally:
+        writer.close()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="SMTP provider stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=2525)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds spent accepting each message")
+    parser.add_argument("--fail-every", type=int, default=0, help="defer every Nth message with a 451")
+    args = parser.parse_args()
+
+    server = await asyncio.start_server(lambda r, w: handle(r, w, args), args.host, args.port)
+    print(f"SMTP stub listening on {args.host}:{args.port}")
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
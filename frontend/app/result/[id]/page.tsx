@@ -116,6 +116,29 @@ export default function ResultPage() {
     fetchResult();
   }, [testId]);
 
+  // While the analysis is still running, show each engine's result as soon as it arrives
+  const isPending = Boolean(result?.status);
+  useEffect(() => {
+    if (!isPending) return;
+
+    const source = resultAPI.streamResult(parseInt(testId));
+    source.addEventListener('engine', (e) => {
+      const { engine, result: engineResult } = JSON.parse((e as MessageEvent).data);
+      setResult((prev: any) => prev && ({
+        ...prev,
+        analyses: { ...prev.analyses, [engine]: engineResult },
+        ...(engine === 'gpt4o' && engineResult.overall_score !== undefined ? { score: engineResult.overall_score } : {}),
+      }));
+    });
+    source.addEventListener('done', () => {
+      source.close();
+      fetchResult();
+    });
+    source.onerror = () => source.close();
+
+    return () => source.close();
+  }, [testId, isPending]);
+
   const fetchResult = async () => {
     try {
       const response = await resultAPI.getResult(parseInt(testId));
@@ -11,6 +11,8 @@ export default function TestDashboard() {
   const router = useRouter();
   const [tests, setTests] = useState<any[]>([]);
   const [loading, setLoading] = useState(true);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [searchTerm, setSearchTerm] = useState('');
   const [deletingTestId, setDeletingTestId] = useState<number | null>(null);
   const [editingRemarks, setEditingRemarks] = useState<{ [key: number]: string }>({});
@@ -40,16 +42,17 @@ export default function TestDashboard() {
     fetchTests();
   }, []);
 
-  const fetchTests = async () => {
+  const fetchTests = async (cursor?: string) => {
     try {
-      const response = await testAPI.getDashboard();
-      setTests(response.data);
+      const response = await testAPI.getDashboard({ completed: true, limit: 100, cursor });
+      setTests((prev) => (cursor ? [...prev, ...response.data] : response.data));
+      setNextCursor(response.headers['x-next-cursor'] || null);
 
       const remarksMap: { [key: number]: string } = {};
       response.data.forEach((test: any) => {
         remarksMap[test.id] = test.remarks || '';
       });
-      setEditingRemarks(remarksMap);
+      setEditingRemarks((prev) => (cursor ? { ...prev, ...remarksMap } : remarksMap));
 
     } catch (err) {
       console.error('Failed to fetch tests');
@@ -58,6 +61,13 @@ export default function TestDashboard() {
     }
   };
 
+  const handleLoadMore = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    await fetchTests(nextCursor);
+    setLoadingMore(false);
+  };
+
   const handleRemarksChange = (testId: number, value: string) => {
     setEditingRemarks({
       ...editingRemarks,
@@ -446,7 +456,7 @@ export default function TestDashboard() {
                         )}
                       </td>
                       <td className="px-2 py-2">
-                        {test.completed && test.answers && test.answers.length > 0 ? (
+                        {test.completed && test.has_answers ? (
                           <div className="flex justify-center">
                             <button
                               onClick={() => handleDownloadQA(test.id, test.test_name)}
@@ -551,6 +561,19 @@ export default function TestDashboard() {
               </table>
             </div>
 
+            {nextCursor && (
+              <div className="flex justify-center mt-4">
+                <button
+                  onClick={handleLoadMore}
+                  disabled={loadingMore}
+                  className="flex items-center space-x-2 px-4 py-2 text-[#050E3C] border border-gray-300 rounded font-semibold text-sm hover:text-blue-700 disabled:opacity-50"
+                >
+                  {loadingMore && <LoaderCircle size={16} className="animate-spin" />}
+                  <span>Load more</span>
+                </button>
+              </div>
+            )}
+
             {/* Details Modal for Mobile - Full Screen */}
             {showDetailsModal && selectedTest && (
               <div className="fixed top-16 left-0 right-0 bottom-0 bg-white z-40 md:hidden overflow-y-auto">
@@ -698,7 +721,7 @@ export default function TestDashboard() {
                     )}
 
 
-                    {selectedTest.completed && selectedTest.answers && selectedTest.answers.length > 0 ? (
+                    {selectedTest.completed && selectedTest.has_answers ? (
                       <button
                         onClick={() => handleDownloadQA(selectedTest.id, selectedTest.test_name)}
                         disabled={downloadingQA === selectedTest.id}
@@ -79,7 +79,7 @@ export default function TestPlatform() {
 
   const fetchCompletedLevels = async () => {
     try {
-      const response = await testAPI.getDashboard();
+      const response = await testAPI.getDashboard({ completed: true, limit: 200 });
       const completed = new Set<string>();
 
       response.data.forEach((test: any) => {
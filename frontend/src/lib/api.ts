@@ -65,7 +65,19 @@ export const testAPI = {
     api.post('/api/test/start', data),
   submitTest: (data: { test_id: number; answers: Array<{ question_id: number; answer_text: string }> }) =>
     api.post('/api/test/submit', data),
-  getDashboard: () => api.get('/api/test/dashboard'),
+  // Paginated: pass the X-Next-Cursor response header back as `cursor`
+  getDashboard: (params?: {
+    limit?: number;
+    cursor?: string;
+    category?: string;
+    level?: string;
+    date_from?: string;
+    date_to?: string;
+    completed?: boolean;
+    email_sent?: boolean;
+    user_id?: number;
+    include?: string;
+  }) => api.get('/api/test/dashboard', { params }),
   deleteTest: (testId: number) => api.delete(`/api/test/delete/${testId}`),
   updateRemarks: (testId: number, remarks: string) =>  // ADD THIS
     api.patch(`/api/test/remarks/${testId}`, null, {
@@ -98,6 +110,11 @@ export const resultAPI = {
     api.get(`/api/sequence-analysis/${testId}/${modelName}`),
   saveSequenceAnalysis: (data: any) =>
     api.post('/api/sequence-analysis/save', data),
+  // Server-Sent Events: per-engine results as soon as each engine finishes
+  streamResult: (testId: number) => {
+    const token = localStorage.getItem('token') || '';
+    return new EventSource(`${API_URL}/api/result/${testId}/stream?token=${encodeURIComponent(token)}`);
+  },
   
 };
 